@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Compare the output formats of search results
+
+Serializes synthetic ``account.move.line``-like rows wrapped in a tool
+response (``{"success": true, "result": [...]}``) and measures the size and
+serialization time of each output format against today's outputs: indented
+JSON for resources and FastMCP's default JSON for tools. Formats backed by
+orjson are measured with and without it when it is installed.
+
+Usage:
+    python benchmarks/bench_formats.py --rows 100 1000 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_protocols import best_time, make_rows  # noqa: E402
+
+from odoo_mcp import formats  # noqa: E402
+
+
+def without_orjson(func):
+    """Run a serializer with the stdlib json fallback"""
+
+    def run(data):
+        saved, formats.orjson = formats.orjson, None
+        try:
+            return func(data)
+        finally:
+            formats.orjson = saved
+
+    return run
+
+
+def candidates():
+    """Return (label, serializer) pairs, today's outputs first"""
+    items = [
+        ("resource (indent=2)", lambda data: json.dumps(data, indent=2)),
+        ("tool (FastMCP)", json.dumps),
+        ("compact", without_orjson(formats.SERIALIZERS["compact"])),
+        ("columnar", without_orjson(formats.SERIALIZERS["columnar"])),
+    ]
+    if formats.orjson is not None:
+        items += [
+            ("compact + orjson", formats.SERIALIZERS["compact"]),
+            ("columnar + orjson", formats.SERIALIZERS["columnar"]),
+        ]
+    return items
+
+
+def run(row_counts, repeat):
+    """Run the benchmark and print one line per format and row count"""
+    header = (
+        f"{'rows':>8} {'format':>20} {'bytes':>12} {'vs indent':>10} "
+        f"{'ms':>9} {'rows/s':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for count in row_counts:
+        response = {"success": True, "result": make_rows(count)}
+        baseline = None
+        for label, serializer in candidates():
+            size = len(serializer(response).encode())
+            baseline = baseline or size
+            elapsed = best_time(serializer, response, repeat)
+            print(
+                f"{count:>8} {label:>20} {size:>12,} {size / baseline:>10.0%} "
+                f"{elapsed * 1000:>9.1f} {count / elapsed:>12,.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        help="Result set sizes to benchmark",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per measurement (best is kept)"
+    )
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Compare the XML-RPC and JSON-RPC backends on large search_read results
+
+Builds synthetic ``account.move.line``-like rows, encodes them the way Odoo
+answers each protocol and measures bytes on the wire (raw and gzip) and the
+time the client spends parsing the response.
+
+Usage:
+    python benchmarks/bench_protocols.py --rows 1000 10000 50000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import xmlrpc.client
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from odoo_mcp.backends import JsonRpcBackend, XmlRpcBackend  # noqa: E402
+
+
+def make_rows(count):
+    """Build synthetic search_read rows with a realistic mix of field types"""
+    return [
+        {
+            "id": i,
+            "name": f"INV/2025/{i:05d}",
+            "ref": f"Reference line {i}",
+            "date": "2025-03-%02d" % (i % 28 + 1),
+            "debit": round(i * 1.37, 2),
+            "credit": 0.0,
+            "balance": round(i * 1.37, 2),
+            "quantity": float(i % 17),
+            "partner_id": [i % 500 + 1, f"Partner {i % 500 + 1}"],
+            "account_id": [i % 40 + 1, f"4{i % 40:05d} Receivable"],
+            "move_id": [i // 3 + 1, f"INV/2025/{i // 3:05d}"],
+            "reconciled": bool(i % 2),
+            "parent_state": "posted",
+            "tax_ids": [1, 2],
+        }
+        for i in range(count)
+    ]
+
+
+def encode_xmlrpc(rows):
+    """Encode rows as an Odoo XML-RPC method response"""
+    return xmlrpc.client.dumps((rows,), methodresponse=True).encode()
+
+
+def encode_jsonrpc(rows):
+    """Encode rows as an Odoo JSON-RPC response"""
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": rows}).encode()
+
+
+def best_time(func, body, repeat):
+    """Return the best wall-clock time of func(body) over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(row_counts, repeat):
+    """Run the benchmark and print one line per backend and row count"""
+    header = (
+        f"{'rows':>8} {'backend':>8} {'bytes':>12} {'gzip bytes':>12} "
+        f"{'parse ms':>10} {'rows/s':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    backends = (
+        (XmlRpcBackend, encode_xmlrpc),
+        (JsonRpcBackend, encode_jsonrpc),
+    )
+    for count in row_counts:
+        rows = make_rows(count)
+        for backend, encode in backends:
+            body = encode(rows)
+            assert backend.decode_response(body) == rows
+            elapsed = best_time(backend.decode_response, body, repeat)
+            print(
+                f"{count:>8} {backend.name:>8} {len(body):>12,} "
+                f"{len(gzip.compress(body)):>12,} {elapsed * 1000:>10.1f} "
+                f"{count / elapsed:>12,.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000],
+        help="Result set sizes to benchmark",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per measurement (best is kept)"
+    )
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+"""
+Measure the cold start of the stdio MCP server
+
+Spawns ``python -m odoo_mcp`` as an MCP client would, and measures for
+every run:
+
+* time to the ``initialize`` response (the handshake the client waits on)
+* time to the response of the first tool call, which needs Odoo
+* import time of ``odoo_mcp.server`` alone, in a fresh interpreter
+
+Two scenarios are run: Odoo reachable (the fake server of
+benchmarks/fake_odoo.py, with ``--latency`` added to every request, the
+authentication included) and Odoo unreachable (a closed port), where the
+handshake must still succeed and the tool call report the error.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5 --latency 0.5
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+from fake_odoo import FakeOdoo  # noqa: E402
+
+SCENARIOS = ("reachable", "unreachable")
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench_startup", "version": "1"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+FIRST_CALL = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/call",
+    "params": {
+        "name": "execute_method",
+        "arguments": {
+            "model": "res.partner",
+            "method": "search_count",
+            "args": [[]],
+        },
+    },
+}
+
+
+def closed_port_url():
+    """URL of a local port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def server_env(url, db):
+    """Environment of the spawned server"""
+    env = dict(os.environ)
+    env.update(
+        PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")])),
+        ODOO_URL=url,
+        ODOO_DB=db,
+        ODOO_USERNAME="admin",
+        ODOO_PASSWORD="admin",
+        ODOO_LOG_LEVEL="WARNING",
+    )
+    env.pop("ODOO_TARGETS", None)
+    return env
+
+
+class ServerExited(Exception):
+    """The server stopped before answering (e.g. it could not reach Odoo)"""
+
+
+def read_response(process, request_id):
+    """Read stdout until the response to a request"""
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise ServerExited()
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def send(process, message):
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+def measure_run(env):
+    """
+    Spawn the server once
+
+    Returns:
+        tuple: (initialize ms, first call ms, tool call succeeded), None if
+        the server exited before completing the handshake
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "odoo_mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    try:
+        send(process, INITIALIZE)
+        try:
+            read_response(process, 1)
+        except ServerExited:
+            return None
+        initialize_ms = (time.perf_counter() - start) * 1000
+        send(process, INITIALIZED)
+        send(process, FIRST_CALL)
+        response = read_response(process, 2)
+        first_call_ms = (time.perf_counter() - start) * 1000
+        content = response["result"]["content"][0]["text"]
+        return initialize_ms, first_call_ms, json.loads(content)["success"]
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def measure_import(env):
+    """Milliseconds to import odoo_mcp.server, interpreter start excluded"""
+
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        return time.perf_counter() - start
+
+    return (run("import odoo_mcp.server") - run("pass")) * 1000
+
+
+def summarize(values):
+    if not values:
+        return None
+    return {
+        "median_ms": round(statistics.median(values), 1),
+        "best_ms": round(min(values), 1),
+        "worst_ms": round(max(values), 1),
+    }
+
+
+def run(args):
+    """Run every scenario, return the results document"""
+    results = {}
+    with FakeOdoo(records=args.records, latency=args.latency) as fake:
+        targets = {
+            "reachable": (fake.url, fake.db),
+            "unreachable": (closed_port_url(), fake.db),
+        }
+        for scenario in args.scenarios:
+            env = server_env(*targets[scenario])
+            initialize, first_call, succeeded, failed = [], [], 0, 0
+            for _ in range(args.runs):
+                outcome = measure_run(env)
+                if outcome is None:
+                    failed += 1
+                    continue
+                initialize.append(outcome[0])
+                first_call.append(outcome[1])
+                succeeded += bool(outcome[2])
+            results[scenario] = {
+                "initialize": summarize(initialize),
+                "first_call": summarize(first_call),
+                "successful_calls": succeeded,
+                "failed_starts": failed,
+            }
+        env = server_env(fake.url, fake.db)
+        results["import"] = summarize([measure_import(env) for _ in range(args.runs)])
+    return {"runs": args.runs, "latency": args.latency, "results": results}
+
+
+def print_results(document):
+    results = document["results"]
+    print(
+        f"{'measure':>24} {'median ms':>10} {'best ms':>10} {'worst ms':>10}"
+        f"   ({document['runs']} runs, {document['latency']}s Odoo latency)"
+    )
+    rows = [("import odoo_mcp.server", results["import"])]
+    for scenario in SCENARIOS:
+        if scenario in results:
+            rows.append((f"{scenario} initialize", results[scenario]["initialize"]))
+            rows.append((f"{scenario} first call", results[scenario]["first_call"]))
+    for label, figures in rows:
+        if figures is None:
+            print(f"{label:>24} {'server failed to start':>32}")
+            continue
+        print(
+            f"{label:>24} {figures['median_ms']:>10,.1f} "
+            f"{figures['best_ms']:>10,.1f} {figures['worst_ms']:>10,.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Server starts per scenario"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.5,
+        help="Seconds added to every request of the fake Odoo server",
+    )
+    parser.add_argument(
+        "--records", type=int, default=100, help="Rows of each synthetic model"
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", help="Save the results as JSON")
+    args = parser.parse_args()
+
+    document = run(args)
+    print_results(document)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
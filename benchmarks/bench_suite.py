@@ -0,0 +1,512 @@
+#!/usr/bin/env python
+"""
+Benchmark the client and the MCP tools against a fake Odoo server
+
+Starts benchmarks/fake_odoo.py (in a child process by default, so the
+server neither competes for the GIL nor shows up in the memory figures) and
+measures, for each protocol and scenario:
+
+* latency percentiles of sequential calls
+* throughput with several concurrent callers
+* HTTP round trips and body bytes sent and received per call
+* peak Python memory allocated by the client during a call
+
+Client scenarios call ``OdooClient`` directly (concurrent callers are
+threads); tool scenarios go through an in-memory MCP session (concurrent
+callers are tasks). Cache, pool and projection options come from the usual
+``ODOO_*`` environment variables, e.g. ``ODOO_SCHEMA_CACHE_TTL=0`` to
+measure uncached ``fields_get`` calls.
+
+Results are saved as JSON; pass an earlier file to ``--compare`` to print
+the change of every metric and flag regressions.
+
+Usage:
+    python benchmarks/bench_suite.py --records 10000 --latency 0.002
+    python benchmarks/bench_suite.py --compare benchmarks/results/before.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from fake_odoo import FakeOdoo  # noqa: E402
+
+from odoo_mcp.odoo_client import get_odoo_client  # noqa: E402
+
+PROTOCOLS = ("xmlrpc", "jsonrpc")
+
+CLIENT_SCENARIOS = ("search_read", "read_records", "get_models", "fields_get")
+TOOL_SCENARIOS = ("search_employee", "search_holidays")
+SCENARIOS = CLIENT_SCENARIOS + TOOL_SCENARIOS
+
+# Metrics compared by --compare, and whether higher is better
+COMPARED_METRICS = {
+    "p50_ms": False,
+    "p90_ms": False,
+    "p99_ms": False,
+    "requests_per_call": False,
+    "bytes_out_per_call": False,
+    "peak_memory_bytes": False,
+    "throughput": True,
+}
+
+
+# ----- Fake server -----
+
+
+@contextlib.contextmanager
+def fake_server(args):
+    """Run the fake Odoo server, yielding its URL and database name"""
+    options = [
+        "--records",
+        str(args.records),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+    ]
+    if args.in_process:
+        with FakeOdoo(
+            records=args.records, latency=args.latency, jitter=args.jitter
+        ) as fake:
+            yield fake.url, fake.db
+        return
+
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "fake_odoo.py"), "--port", "0"]
+        + options,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        line = process.stdout.readline()
+        match = re.search(r"(http://\S+) \(database (\S+)\)", line)
+        if not match:
+            raise RuntimeError(f"Fake Odoo server did not start: {line!r}")
+        yield match.group(1), match.group(2)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def server_stats(url, reset=False):
+    """Read (and optionally reset) the request counters of the fake server"""
+    with urllib.request.urlopen(f"{url}/__stats__?reset={int(reset)}") as response:
+        return json.load(response)
+
+
+@contextlib.contextmanager
+def quiet(enabled):
+    """Silence the client's diagnostics and the MCP / httpx request logs"""
+    if not enabled:
+        yield
+        return
+    logging.disable(logging.INFO)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+# ----- Measurements -----
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(latencies, stats, calls):
+    """Build the latency and traffic figures of a sequential run"""
+    return {
+        "calls": calls,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+        "requests_per_call": round(stats["requests"] / calls, 3),
+        "bytes_in_per_call": round(stats["bytes_in"] / calls),
+        "bytes_out_per_call": round(stats["bytes_out"] / calls),
+    }
+
+
+def measure_sync(call, url, args):
+    """Measure a blocking scenario"""
+    for _ in range(args.warmup):
+        call()
+
+    server_stats(url, reset=True)
+    latencies = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    result = summarize(latencies, server_stats(url), args.iterations)
+
+    result["throughput"] = {}
+    for workers in args.concurrency:
+        total = max(args.iterations, workers * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda _: call(), range(total)))
+            elapsed = time.perf_counter() - start
+        result["throughput"][str(workers)] = round(total / elapsed, 1)
+
+    tracemalloc.start()
+    try:
+        for _ in range(args.memory_iterations):
+            call()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+async def measure_async(call, url, args):
+    """Measure a coroutine scenario"""
+    for _ in range(args.warmup):
+        await call()
+
+    server_stats(url, reset=True)
+    latencies = []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - start)
+    result = summarize(latencies, server_stats(url), args.iterations)
+
+    result["throughput"] = {}
+    for workers in args.concurrency:
+        total = max(args.iterations, workers * 4)
+        remaining = iter(range(total))
+
+        async def worker():
+            for _ in remaining:
+                await call()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        elapsed = time.perf_counter() - start
+        result["throughput"][str(workers)] = round(total / elapsed, 1)
+
+    tracemalloc.start()
+    try:
+        for _ in range(args.memory_iterations):
+            await call()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+# ----- Scenarios -----
+
+
+def client_scenarios(client, args):
+    """Build the OdooClient scenarios as {name: callable}"""
+    ids = list(range(1, min(args.rows, args.records) + 1))
+
+    def search_read():
+        rows = client.search_read(
+            "account.move.line", [["parent_state", "=", "posted"]], limit=args.rows
+        )
+        if not rows:
+            raise RuntimeError("search_read returned no rows")
+
+    def read_records():
+        if len(client.read_records("res.partner", ids)) != len(ids):
+            raise RuntimeError("read_records returned too few rows")
+
+    def get_models():
+        if "error" in client.get_models():
+            raise RuntimeError("get_models failed")
+
+    def fields_get():
+        if "error" in client.get_model_fields("res.partner"):
+            raise RuntimeError("get_model_fields failed")
+
+    return {
+        "search_read": search_read,
+        "read_records": read_records,
+        "get_models": get_models,
+        "fields_get": fields_get,
+    }
+
+
+def tool_scenarios(session):
+    """Build the MCP tool scenarios as {name: coroutine function}"""
+
+    async def call_tool(name, arguments):
+        result = await session.call_tool(name, arguments)
+        text = result.content[0].text if result.content else ""
+        if result.isError or not json.loads(text).get("success"):
+            raise RuntimeError(f"{name} failed: {text[:200]}")
+
+    return {
+        "search_employee": lambda: call_tool(
+            "search_employee", {"name": "anna", "limit": 20}
+        ),
+        "search_holidays": lambda: call_tool(
+            "search_holidays", {"start_date": "2025-03-01", "end_date": "2025-03-31"}
+        ),
+    }
+
+
+def run_client(protocol, url, db, args, scenarios):
+    """Run the OdooClient scenarios of one protocol"""
+    os.environ["ODOO_PROTOCOL"] = protocol
+    client = get_odoo_client(
+        {"url": url, "db": db, "username": "admin", "password": "admin"}
+    )
+    try:
+        calls = client_scenarios(client, args)
+        return {name: measure_sync(calls[name], url, args) for name in scenarios}
+    finally:
+        client.close()
+
+
+async def run_tools(protocol, url, db, args, scenarios):
+    """Run the MCP tool scenarios of one protocol in an in-memory session"""
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from odoo_mcp.registry import get_registry
+    from odoo_mcp.server import mcp
+
+    os.environ.update(
+        ODOO_URL=url,
+        ODOO_DB=db,
+        ODOO_USERNAME="admin",
+        ODOO_PASSWORD="admin",
+        ODOO_PROTOCOL=protocol,
+    )
+    get_registry().reset()
+    async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+        calls = tool_scenarios(session)
+        return {name: await measure_async(calls[name], url, args) for name in scenarios}
+
+
+def run(args):
+    """Run every selected scenario, returning the results document"""
+    client_names = [name for name in args.scenarios if name in CLIENT_SCENARIOS]
+    tool_names = [name for name in args.scenarios if name in TOOL_SCENARIOS]
+
+    results = {}
+    with fake_server(args) as (url, db), quiet(not args.verbose):
+        for protocol in args.protocols:
+            measured = {}
+            if client_names:
+                measured.update(run_client(protocol, url, db, args, client_names))
+            if tool_names:
+                measured.update(
+                    asyncio.run(run_tools(protocol, url, db, args, tool_names))
+                )
+            for name in args.scenarios:
+                results[f"{protocol}/{name}"] = measured[name]
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "server": "in-process" if args.in_process else "subprocess",
+            "options": {
+                key: getattr(args, key)
+                for key in (
+                    "records",
+                    "rows",
+                    "latency",
+                    "jitter",
+                    "iterations",
+                    "concurrency",
+                )
+            },
+        },
+        "results": results,
+    }
+
+
+def git_commit():
+    """Short hash of the checked out commit, if any"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ----- Reports -----
+
+
+def print_results(document):
+    """Print one line per protocol and scenario"""
+    concurrency = document["meta"]["options"]["concurrency"]
+    header = (
+        f"{'scenario':>26} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+        f"{'req/call':>8} {'KB out':>9} {'peak KB':>9}"
+        + "".join(f" {f'ops/s x{c}':>11}" for c in concurrency)
+    )
+    print(header)
+    print("-" * len(header))
+    for key, result in document["results"].items():
+        print(
+            f"{key:>26} {result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} "
+            f"{result['p99_ms']:>9.2f} {result['requests_per_call']:>8.2f} "
+            f"{result['bytes_out_per_call'] / 1024:>9.1f} "
+            f"{result['peak_memory_bytes'] / 1024:>9.0f}"
+            + "".join(f" {result['throughput'][str(c)]:>11,.0f}" for c in concurrency)
+        )
+
+
+def compare(document, baseline, threshold):
+    """
+    Print the change of every metric against a baseline
+
+    Returns:
+        int: Number of metrics worse than the baseline by more than threshold
+    """
+    regressions = 0
+    print(f"\nComparison with {baseline['meta'].get('commit') or 'baseline'}:")
+    if baseline["meta"].get("options") != document["meta"]["options"]:
+        print(f"Warning: the baseline ran with {baseline['meta'].get('options')}")
+    for key, result in document["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric == "throughput":
+                pairs = [
+                    (f"ops/s x{c}", value, previous["throughput"].get(c))
+                    for c, value in result["throughput"].items()
+                ]
+            else:
+                pairs = [(metric, result.get(metric), previous.get(metric))]
+            for label, value, old in pairs:
+                if not old or value is None:
+                    continue
+                change = (value - old) / old
+                worse = -change if higher_is_better else change
+                flag = ""
+                if worse > threshold:
+                    flag = "  REGRESSION"
+                    regressions += 1
+                elif worse < -threshold:
+                    flag = "  improved"
+                print(
+                    f"{key:>26} {label:>20} {old:>12,.2f} -> {value:>12,.2f} "
+                    f"{change:>+8.1%}{flag}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--records", type=int, default=5000, help="Rows of each synthetic model"
+    )
+    parser.add_argument(
+        "--rows", type=int, default=500, help="Rows per search_read / read_records"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every request"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra latency (seconds)"
+    )
+    parser.add_argument(
+        "--protocols", nargs="+", choices=PROTOCOLS, default=list(PROTOCOLS)
+    )
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=50, help="Sequential calls per scenario"
+    )
+    parser.add_argument("--warmup", type=int, default=3, help="Calls not measured")
+    parser.add_argument(
+        "--memory-iterations",
+        type=int,
+        default=5,
+        help="Calls traced to measure peak memory",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Concurrent callers for the throughput runs",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run the fake server in a thread of the benchmark process",
+    )
+    parser.add_argument(
+        "--output",
+        help="Where to save the results "
+        "(default: benchmarks/results/<UTC timestamp>.json)",
+    )
+    parser.add_argument("--compare", help="Results file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative change flagged as a regression (default 0.10)",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when a regression is flagged",
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Keep the client output on stderr"
+    )
+    args = parser.parse_args()
+
+    document = run(args)
+    print_results(document)
+
+    output = args.output or os.path.join(
+        BENCH_DIR,
+        "results",
+        datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S") + ".json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(document, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,859 @@
+#!/usr/bin/env python
+"""
+In-process stand-in for an Odoo server, for benchmarks
+
+Answers ``authenticate`` and ``execute_kw`` over XML-RPC (``/xmlrpc/2/common``
+and ``/xmlrpc/2/object``, with ``system.multicall``) and JSON-RPC
+(``/jsonrpc``) from synthetic models held in memory: ``res.partner``,
+``account.move.line``, ``hr.employee``, ``hr.leave.report.calendar`` and the
+``ir.model`` / ``ir.model.fields`` catalog. Connections are HTTP/1.1
+keep-alive and responses are gzipped when the client accepts it, like Odoo
+behind a usual reverse proxy.
+
+Every request can be delayed (``latency`` seconds plus up to ``jitter``) to
+simulate a remote server. Request and response body bytes are counted and
+served as JSON on ``GET /__stats__`` (``?reset=1`` to clear them).
+
+Usage:
+    with FakeOdoo(records=10000, latency=0.005) as odoo:
+        client = OdooClient(odoo.url, odoo.db, "admin", "admin")
+
+    python benchmarks/fake_odoo.py --port 8069 --records 10000
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import xmlrpc.client
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WRITE_DATE = "2025-01-01 00:00:00"
+
+
+class OdooFault(Exception):
+    """Error returned to the client as an Odoo server error"""
+
+    def __init__(self, message, name="odoo.exceptions.UserError", code=2):
+        super().__init__(message)
+        self.name = name
+        self.code = code
+
+
+def _field(field_type, string, store=True, **extra):
+    """Build a fields_get() entry"""
+    return dict(type=field_type, string=string, store=store, **extra)
+
+
+def _m2o(record_id, name):
+    """Value of a many2one field as read() returns it"""
+    return [record_id, name]
+
+
+def build_models(records=1000, model_count=200, binary_size=2048, seed=0):
+    """
+    Build the synthetic database
+
+    Args:
+        records: Rows of the business models (hr.employee gets a tenth)
+        model_count: Total number of models listed in ir.model
+        binary_size: Bytes of each partner image
+        seed: Random seed, the same seed builds the same data
+
+    Returns:
+        dict: Model name to {"fields": fields_get() result, "records": rows}
+    """
+    rng = random.Random(seed)
+    image = base64.b64encode(bytes(rng.getrandbits(8) for _ in range(binary_size)))
+    image = image.decode()
+
+    partners = [
+        {
+            "id": i,
+            "name": f"Partner {i}",
+            "display_name": f"Partner {i}",
+            "email": f"partner{i}@example.com",
+            "phone": f"+32 470 {i:06d}",
+            "is_company": i % 5 == 0,
+            "country_id": _m2o(i % 20 + 1, f"Country {i % 20 + 1}"),
+            "comment": f"<p>Customer since {2000 + i % 25}</p>",
+            "credit_limit": float(i % 100 * 100),
+            "image_1920": image,
+            "category_id": [i % 7 + 1, i % 11 + 1],
+            "write_date": WRITE_DATE,
+        }
+        for i in range(1, records + 1)
+    ]
+
+    lines = [
+        {
+            "id": i,
+            "name": f"INV/2025/{i:05d}",
+            "display_name": f"INV/2025/{i:05d}",
+            "ref": f"Reference line {i}",
+            "date": "2025-%02d-%02d" % (i % 12 + 1, i % 28 + 1),
+            "debit": round(i * 1.37, 2),
+            "credit": 0.0,
+            "balance": round(i * 1.37, 2),
+            "quantity": float(i % 17),
+            "partner_id": _m2o(i % records + 1, f"Partner {i % records + 1}"),
+            "account_id": _m2o(i % 40 + 1, f"4{i % 40:05d} Receivable"),
+            "move_id": _m2o(i // 3 + 1, f"INV/2025/{i // 3:05d}"),
+            "reconciled": bool(i % 2),
+            "parent_state": "posted",
+            "tax_ids": [1, 2],
+            "write_date": WRITE_DATE,
+        }
+        for i in range(1, records + 1)
+    ]
+
+    employee_count = max(records // 10, 10)
+    first_names = ("Anna", "Bruno", "Chloé", "Dmitri", "Élise", "Farid", "Greta")
+    last_names = ("Martin", "Dubois", "Nguyen", "Peeters", "Müller", "Rossi")
+    employees = [
+        {
+            "id": i,
+            "name": f"{first_names[i % 7]} {last_names[i % 6]} {i}",
+            "display_name": f"{first_names[i % 7]} {last_names[i % 6]} {i}",
+            "work_email": f"employee{i}@example.com",
+            "job_title": f"Job {i % 15}",
+            "department_id": _m2o(i % 12 + 1, f"Department {i % 12 + 1}"),
+            "active": True,
+            "write_date": WRITE_DATE,
+        }
+        for i in range(1, employee_count + 1)
+    ]
+
+    start = datetime(2025, 1, 1, 8, 0, 0)
+    leaves = []
+    for i in range(1, records + 1):
+        employee = employees[i % employee_count]
+        begin = start + timedelta(days=rng.randrange(365))
+        end = begin + timedelta(days=rng.randrange(5), hours=9)
+        leaves.append(
+            {
+                "id": i,
+                "name": f"{employee['name']} on Time Off",
+                "display_name": f"{employee['name']} on Time Off",
+                "start_datetime": begin.strftime("%Y-%m-%d %H:%M:%S"),
+                "stop_datetime": end.strftime("%Y-%m-%d %H:%M:%S"),
+                "employee_id": _m2o(employee["id"], employee["name"]),
+                "state": ("validate", "confirm", "refuse")[i % 3],
+                "duration_display": f"{(end - begin).days + 1} days",
+                "write_date": WRITE_DATE,
+            }
+        )
+
+    models = {
+        "res.partner": {
+            "fields": {
+                "id": _field("integer", "ID"),
+                "name": _field("char", "Name"),
+                "display_name": _field("char", "Display Name", store=False),
+                "email": _field("char", "Email"),
+                "phone": _field("char", "Phone"),
+                "is_company": _field("boolean", "Is a Company"),
+                "country_id": _field("many2one", "Country", relation="res.country"),
+                "comment": _field("html", "Notes"),
+                "credit_limit": _field("float", "Credit Limit"),
+                "image_1920": _field("binary", "Image"),
+                "category_id": _field(
+                    "many2many", "Tags", relation="res.partner.category"
+                ),
+                "write_date": _field("datetime", "Last Updated on"),
+            },
+            "records": partners,
+        },
+        "account.move.line": {
+            "fields": {
+                "id": _field("integer", "ID"),
+                "name": _field("char", "Label"),
+                "display_name": _field("char", "Display Name", store=False),
+                "ref": _field("char", "Reference"),
+                "date": _field("date", "Date"),
+                "debit": _field("monetary", "Debit"),
+                "credit": _field("monetary", "Credit"),
+                "balance": _field("monetary", "Balance"),
+                "quantity": _field("float", "Quantity"),
+                "partner_id": _field("many2one", "Partner", relation="res.partner"),
+                "account_id": _field("many2one", "Account", relation="account.account"),
+                "move_id": _field("many2one", "Journal Entry", relation="account.move"),
+                "reconciled": _field("boolean", "Reconciled"),
+                "parent_state": _field("selection", "Status"),
+                "tax_ids": _field("many2many", "Taxes", relation="account.tax"),
+                "write_date": _field("datetime", "Last Updated on"),
+            },
+            "records": lines,
+        },
+        "hr.employee": {
+            "fields": {
+                "id": _field("integer", "ID"),
+                "name": _field("char", "Employee Name"),
+                "display_name": _field("char", "Display Name", store=False),
+                "work_email": _field("char", "Work Email"),
+                "job_title": _field("char", "Job Title"),
+                "department_id": _field(
+                    "many2one", "Department", relation="hr.department"
+                ),
+                "active": _field("boolean", "Active"),
+                "write_date": _field("datetime", "Last Updated on"),
+            },
+            "records": employees,
+        },
+        "hr.leave.report.calendar": {
+            "fields": {
+                "id": _field("integer", "ID"),
+                "name": _field("char", "Name"),
+                "display_name": _field("char", "Display Name", store=False),
+                "start_datetime": _field("datetime", "From"),
+                "stop_datetime": _field("datetime", "To"),
+                "employee_id": _field("many2one", "Employee", relation="hr.employee"),
+                "state": _field("selection", "Status"),
+                "duration_display": _field("char", "Duration", store=False),
+                "write_date": _field("datetime", "Last Updated on"),
+            },
+            "records": leaves,
+        },
+    }
+
+    catalog = list(models) + ["ir.model", "ir.model.fields"]
+    catalog += [f"x_model_{i}" for i in range(model_count - len(catalog))]
+    models["ir.model"] = {
+        "fields": {
+            "id": _field("integer", "ID"),
+            "name": _field("char", "Model Description"),
+            "model": _field("char", "Model"),
+            "write_date": _field("datetime", "Last Updated on"),
+        },
+        "records": [
+            {
+                "id": i,
+                "name": name.replace(".", " ").title(),
+                "model": name,
+                "write_date": WRITE_DATE,
+            }
+            for i, name in enumerate(catalog, 1)
+        ],
+    }
+    model_fields = []
+    for name, model in list(models.items()):
+        for field_name, info in model["fields"].items():
+            model_fields.append(
+                {
+                    "id": len(model_fields) + 1,
+                    "name": field_name,
+                    "model": name,
+                    "ttype": info["type"],
+                    "write_date": WRITE_DATE,
+                }
+            )
+    models["ir.model.fields"] = {
+        "fields": {
+            "id": _field("integer", "ID"),
+            "name": _field("char", "Field Name"),
+            "model": _field("char", "Model Name"),
+            "ttype": _field("selection", "Field Type"),
+            "write_date": _field("datetime", "Last Updated on"),
+        },
+        "records": model_fields,
+    }
+    for model in models.values():
+        model["fields"].setdefault("id", _field("integer", "ID"))
+    return models
+
+
+# ----- Domains -----
+
+
+def _compare(value, operator, operand):
+    """Evaluate one condition on a field value"""
+    if operator in ("=", "=="):
+        return value == operand or (operand is False and value in (None, False))
+    if operator in ("!=", "<>"):
+        return value != operand
+    if operator in ("in", "not in"):
+        values = value if isinstance(value, list) else [value]
+        found = any(item in operand for item in values)
+        return found if operator == "in" else not found
+    if operator in ("like", "ilike", "not like", "not ilike", "=like", "=ilike"):
+        text, pattern = str(value or ""), str(operand)
+        if "ilike" in operator:
+            text, pattern = text.lower(), pattern.lower()
+        if operator.startswith("="):
+            regex = re.escape(pattern).replace("%", ".*").replace("_", ".")
+            return re.fullmatch(regex, text) is not None
+        found = pattern in text
+        return not found if operator.startswith("not") else found
+    if value in (None, False):
+        return False
+    if operator == "<":
+        return value < operand
+    if operator == "<=":
+        return value <= operand
+    if operator == ">":
+        return value > operand
+    if operator == ">=":
+        return value >= operand
+    raise OdooFault(f"Invalid domain operator {operator!r}")
+
+
+def compile_filter(domain, fields):
+    """
+    Turn a domain into a predicate on records
+
+    Supports the prefix operators and the usual comparison operators on
+    direct fields of the model.
+
+    Raises:
+        OdooFault: On unknown fields or operators
+    """
+    terms = list(domain or [])
+
+    def parse():
+        if not terms:
+            return lambda record: True
+        term = terms.pop(0)
+        if term == "!":
+            operand = parse()
+            return lambda record: not operand(record)
+        if term in ("&", "|"):
+            left, right = parse(), parse()
+            if term == "&":
+                return lambda record: left(record) and right(record)
+            return lambda record: left(record) or right(record)
+        name, operator, operand = term
+        if name in (1, 0):
+            return lambda record: bool(name)
+        if name not in fields:
+            raise OdooFault(f"Invalid field {name!r} in leaf {term!r}")
+        operator = operator.lower()
+        if fields[name]["type"] != "many2one":
+            return lambda record: _compare(record.get(name), operator, operand)
+        # many2one: compare the ID, or the name for like operators on text
+        index = 1 if "like" in operator and isinstance(operand, str) else 0
+        return lambda record: _compare(
+            (record.get(name) or [False, False])[index], operator, operand
+        )
+
+    predicates = []
+    while terms:
+        predicates.append(parse())
+    return lambda record: all(predicate(record) for predicate in predicates)
+
+
+def _sort_key(value):
+    """Sort key of a field value: empty values first, numbers, then text"""
+    if isinstance(value, list):
+        # many2one sorts on the name, x2many on the number of records
+        value = (
+            value[1] if len(value) == 2 and isinstance(value[1], str) else len(value)
+        )
+    if value is None or value is False:
+        return (0, 0, "")
+    if isinstance(value, (int, float)):
+        return (1, value, "")
+    return (2, 0, str(value))
+
+
+def _sort(rows, order):
+    """Sort rows by an Odoo order clause ('name desc, id')"""
+    for part in reversed([p.strip() for p in (order or "id").split(",")]):
+        name, _, direction = part.partition(" ")
+        reverse = direction.strip().lower() == "desc"
+        rows.sort(key=lambda row: _sort_key(row.get(name)), reverse=reverse)
+    return rows
+
+
+def _bucket(value, granularity):
+    """Date bucket of a date or datetime string for read_group"""
+    if not value:
+        return False
+    day = date.fromisoformat(value[:10])
+    if granularity == "year":
+        return str(day.year)
+    if granularity == "quarter":
+        return f"Q{(day.month - 1) // 3 + 1} {day.year}"
+    if granularity == "week":
+        return f"W{day.isocalendar()[1]} {day.isocalendar()[0]}"
+    if granularity in ("day", "hour"):
+        return day.strftime("%d %b %Y")
+    return day.strftime("%B %Y")
+
+
+# ----- Model methods -----
+
+
+class FakeDatabase:
+    """Synthetic models and the ORM methods the MCP server calls"""
+
+    def __init__(self, models, db="fake", uid=2):
+        """
+        Initialize the database
+
+        Args:
+            models: Result of build_models()
+            db: Database name accepted by authenticate
+            uid: User ID returned by authenticate
+        """
+        self.models = models
+        self.db = db
+        self.uid = uid
+        self._lock = threading.Lock()
+
+    def authenticate(self, db, username, password, context=None):
+        """common.authenticate: any login is accepted on the right database"""
+        if db != self.db:
+            raise OdooFault(f"database {db!r} does not exist", code=1)
+        return self.uid
+
+    def _model(self, name):
+        """Get a model by name"""
+        model = self.models.get(name)
+        if model is None:
+            raise OdooFault(f"Object {name} doesn't exist", code=1)
+        return model
+
+    def _search(self, model, domain, offset=0, limit=None, order=None):
+        """Get the sorted rows of a model matching a domain"""
+        predicate = compile_filter(domain, model["fields"])
+        rows = _sort([r for r in model["records"] if predicate(r)], order)
+        rows = rows[offset or 0 :]
+        return rows[:limit] if limit else rows
+
+    @staticmethod
+    def _project(rows, fields):
+        """Copy rows keeping only some fields (and the ID)"""
+        if not fields:
+            return [dict(row) for row in rows]
+        names = ["id"] + [name for name in fields if name != "id"]
+        return [{name: row.get(name, False) for name in names} for row in rows]
+
+    def execute_kw(self, db, uid, password, model_name, method, args, kwargs=None):
+        """object.execute_kw: dispatch to the _method_<name> implementation"""
+        if uid != self.uid:
+            raise OdooFault(
+                "Access Denied", name="odoo.exceptions.AccessDenied", code=3
+            )
+        model = self._model(model_name)
+        handler = getattr(self, f"_method_{method}", None)
+        if handler is None:
+            raise OdooFault(
+                f"The method '{method}' does not exist on the model '{model_name}'"
+            )
+        return handler(model, *args, **(kwargs or {}))
+
+    def _method_fields_get(self, model, allfields=None, attributes=None):
+        """Schema of the model"""
+        fields = model["fields"]
+        if allfields:
+            fields = {name: fields[name] for name in allfields if name in fields}
+        if attributes:
+            fields = {
+                name: {key: info[key] for key in attributes if key in info}
+                for name, info in fields.items()
+            }
+        return fields
+
+    def _method_search(self, model, domain, offset=0, limit=None, order=None):
+        """IDs of the matching records"""
+        return [row["id"] for row in self._search(model, domain, offset, limit, order)]
+
+    def _method_search_count(self, model, domain, limit=None):
+        """Number of matching records"""
+        return len(self._search(model, domain, limit=limit))
+
+    def _method_search_read(
+        self, model, domain=None, fields=None, offset=0, limit=None, order=None
+    ):
+        """Matching records"""
+        return self._project(self._search(model, domain, offset, limit, order), fields)
+
+    def _method_read(self, model, ids, fields=None, load=None):
+        """Records by ID, in the order of ids"""
+        by_id = {row["id"]: row for row in model["records"]}
+        return self._project([by_id[i] for i in ids if i in by_id], fields)
+
+    def _method_name_get(self, model, ids):
+        """(id, display name) pairs"""
+        return [
+            [row["id"], row["display_name"]] for row in self._method_read(model, ids)
+        ]
+
+    def _method_name_search(
+        self, model, name="", args=None, operator="ilike", limit=100
+    ):
+        """(id, display name) pairs of records whose name matches"""
+        domain = list(args or [])
+        if name:
+            domain.append(["name", operator, name])
+        return [
+            [row["id"], row.get("display_name", row.get("name"))]
+            for row in self._search(model, domain, limit=limit)
+        ]
+
+    def _method_read_group(
+        self,
+        model,
+        domain,
+        fields,
+        groupby,
+        offset=0,
+        limit=None,
+        orderby=False,
+        lazy=True,
+    ):
+        """Groups with their count and summed numeric fields"""
+        groupby = [groupby] if isinstance(groupby, str) else list(groupby)
+        if lazy:
+            groupby = groupby[:1]
+        keys = []
+        for spec in groupby:
+            name, _, granularity = spec.partition(":")
+            keys.append((spec, name, granularity or None))
+        aggregates = []
+        for spec in fields:
+            name, _, function = spec.partition(":")
+            if name in [key[1] for key in keys] or name not in model["fields"]:
+                continue
+            if model["fields"][name]["type"] in ("integer", "float", "monetary"):
+                aggregates.append((name, function or "sum"))
+
+        groups = {}
+        for row in self._search(model, domain):
+            values = []
+            for _, name, granularity in keys:
+                value = row.get(name)
+                if model["fields"][name]["type"] in ("date", "datetime"):
+                    value = _bucket(value, granularity or "month")
+                values.append(tuple(value) if isinstance(value, list) else value)
+            groups.setdefault(tuple(values), []).append(row)
+
+        count_key = f"{groupby[0].split(':')[0]}_count" if lazy else "__count"
+        result = []
+        for values, rows in groups.items():
+            group = {count_key: len(rows)}
+            for (spec, _, _), value in zip(keys, values):
+                group[spec] = list(value) if isinstance(value, tuple) else value
+            for name, function in aggregates:
+                numbers = [row.get(name) or 0 for row in rows]
+                group[name] = {
+                    "avg": sum(numbers) / len(numbers),
+                    "max": max(numbers),
+                    "min": min(numbers),
+                    "count": len(numbers),
+                }.get(function, sum(numbers))
+            group["__domain"] = [
+                [spec.split(":")[0], "=", group[spec]] for spec, _, _ in keys
+            ] + list(domain or [])
+            result.append(group)
+        result = _sort(result, orderby or None) if orderby else result
+        result = result[offset or 0 :]
+        return result[:limit] if limit else result
+
+    def _method_create(self, model, values):
+        """Add records"""
+        with self._lock:
+            records = values if isinstance(values, list) else [values]
+            ids = []
+            for record in records:
+                next_id = max((row["id"] for row in model["records"]), default=0) + 1
+                model["records"].append(dict(record, id=next_id))
+                ids.append(next_id)
+        return ids if isinstance(values, list) else ids[0]
+
+    def _method_write(self, model, ids, values):
+        """Update records"""
+        with self._lock:
+            for row in model["records"]:
+                if row["id"] in ids:
+                    row.update(values)
+        return True
+
+    def _method_unlink(self, model, ids):
+        """Delete records"""
+        with self._lock:
+            model["records"][:] = [r for r in model["records"] if r["id"] not in ids]
+        return True
+
+
+# ----- HTTP server -----
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """XML-RPC and JSON-RPC endpoints of the fake server"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeOdoo/1.0"
+    # Headers and body are written separately: without TCP_NODELAY every
+    # response would wait for the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        """Keep the benchmark output clean"""
+
+    def do_GET(self):
+        """Serve the request counters"""
+        url = urlsplit(self.path)
+        if url.path != "/__stats__":
+            self._send(404, b"", "text/plain")
+            return
+        reset = parse_qs(url.query).get("reset") == ["1"]
+        body = json.dumps(self.server.fake.stats(reset=reset)).encode()
+        self._send(200, body, "application/json", counted=False)
+
+    def do_POST(self):
+        """Serve an RPC call"""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        fake = self.server.fake
+        fake.delay()
+        if self.path == "/jsonrpc":
+            method, response = self._jsonrpc(body)
+            content_type = "application/json"
+        elif self.path in ("/xmlrpc/2/common", "/xmlrpc/2/object"):
+            method, response = self._xmlrpc(body)
+            content_type = "text/xml"
+        else:
+            self._send(404, b"", "text/plain")
+            return
+        fake.count(method, len(body))
+        self._send(200, response, content_type)
+
+    def _call(self, service, method, args):
+        """Dispatch a call, returning (label for the stats, result)"""
+        database = self.server.fake.database
+        try:
+            if service == "common" and method == "authenticate":
+                return "authenticate", database.authenticate(*args)
+            if service == "common" and method == "version":
+                return "version", {"server_version": "17.0", "protocol_version": 1}
+            if service == "object" and method == "execute_kw":
+                return f"{args[3]}.{args[4]}", database.execute_kw(*args)
+        except OdooFault:
+            raise
+        except Exception as e:
+            # Bad arguments: Odoo answers with a server error, not a dropped socket
+            raise OdooFault(f"{type(e).__name__}: {e}", code=1) from e
+        raise OdooFault(f"Unknown method {service}.{method}")
+
+    def _xmlrpc(self, body):
+        """Answer an XML-RPC request"""
+        params, method = xmlrpc.client.loads(body, use_builtin_types=True)
+        service = self.path.rsplit("/", 1)[-1]
+        try:
+            if method == "system.listMethods":
+                label, result = method, ["execute_kw", "system.multicall"]
+            elif method == "system.multicall":
+                result = []
+                for call in params[0]:
+                    try:
+                        _, value = self._call(
+                            service, call["methodName"], call["params"]
+                        )
+                        result.append([value])
+                    except OdooFault as e:
+                        result.append({"faultCode": e.code, "faultString": str(e)})
+                label = "system.multicall"
+            else:
+                label, result = self._call(service, method, params)
+            payload = xmlrpc.client.dumps(
+                (result,), methodresponse=True, allow_none=True
+            )
+        except OdooFault as e:
+            label = method
+            payload = xmlrpc.client.dumps(xmlrpc.client.Fault(e.code, str(e)))
+        return label, payload.encode()
+
+    def _jsonrpc(self, body):
+        """Answer a JSON-RPC request"""
+        request = json.loads(body)
+        params = request.get("params", {})
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            label, response["result"] = self._call(
+                params.get("service"), params.get("method"), params.get("args", [])
+            )
+        except OdooFault as e:
+            label = params.get("method")
+            response["error"] = {
+                "code": 200,
+                "message": "Odoo Server Error",
+                "data": {"name": e.name, "message": str(e), "debug": ""},
+            }
+        return label, json.dumps(response).encode()
+
+    def _send(self, status, body, content_type, counted=True):
+        """Send a response, gzipped when it is worth it and accepted"""
+        headers = {"Content-Type": content_type}
+        if len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if counted:
+            self.server.fake.count_response(len(body))
+
+
+class FakeOdoo:
+    """
+    Fake Odoo server running in a background thread
+
+    Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        records=1000,
+        model_count=200,
+        binary_size=2048,
+        latency=0.0,
+        jitter=0.0,
+        host="127.0.0.1",
+        port=0,
+        db="fake",
+        seed=0,
+    ):
+        """
+        Build the synthetic database
+
+        Args:
+            records: Rows of the business models
+            model_count: Number of models listed in ir.model
+            binary_size: Bytes of each partner image
+            latency: Seconds added to every request
+            jitter: Extra random delay of up to this many seconds
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            db: Database name accepted by authenticate
+            seed: Random seed of the data and the jitter
+        """
+        self.database = FakeDatabase(
+            build_models(records, model_count, binary_size, seed), db=db
+        )
+        self.db = db
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._address = (host, port)
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    @property
+    def url(self):
+        """Base URL of the running server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a daemon thread"""
+        self._server = ThreadingHTTPServer(self._address, _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        """Start the server"""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop the server"""
+        self.stop()
+
+    def delay(self):
+        """Sleep for the configured latency"""
+        seconds = self.latency
+        if self.jitter:
+            with self._lock:
+                seconds += self._random.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def _reset_stats(self):
+        """Clear the counters (lock held)"""
+        self._stats = {"requests": 0, "bytes_in": 0, "bytes_out": 0}
+        self._methods = Counter()
+
+    def count(self, method, bytes_in):
+        """Account for a request"""
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes_in"] += bytes_in
+            self._methods[method] += 1
+
+    def count_response(self, bytes_out):
+        """Account for a response body"""
+        with self._lock:
+            self._stats["bytes_out"] += bytes_out
+
+    def stats(self, reset=False):
+        """
+        Get request counters
+
+        Args:
+            reset: Clear the counters after reading them
+
+        Returns:
+            dict: Requests, body bytes in and out, and requests per method
+        """
+        with self._lock:
+            snapshot = dict(self._stats, methods=dict(self._methods))
+            if reset:
+                self._reset_stats()
+        return snapshot
+
+
+def main():
+    """Run a fake server until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--db", default="fake", help="Database name")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--models", type=int, default=200, help="Models in ir.model")
+    parser.add_argument("--binary-size", type=int, default=2048)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Seconds")
+    args = parser.parse_args()
+
+    fake = FakeOdoo(
+        records=args.records,
+        model_count=args.models,
+        binary_size=args.binary_size,
+        latency=args.latency,
+        jitter=args.jitter,
+        host=args.host,
+        port=args.port,
+        db=args.db,
+    )
+    with fake:
+        print(f"Fake Odoo listening on {fake.url} (database {fake.db})", flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,14 @@
 Odoo MCP Server - MCP Server for Odoo Integration
 """
 
-from .server import mcp
-
 __all__ = ["mcp"]
+
+
+def __getattr__(name):
+    # The server, and with it the MCP SDK, is only imported when used, so
+    # that importing a submodule such as odoo_mcp.odoo_client stays cheap
+    if name == "mcp":
+        from .server import mcp
+
+        return mcp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,52 +1,63 @@
 """
 Command line entry point for the Odoo MCP Server
 """
+
 import sys
-import asyncio
-import traceback
+import argparse
+import logging
 import os
 
+from .log import configure_logging
 from .server import mcp
 
+logger = logging.getLogger("odoo_mcp")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse the command line, defaults come from the environment
+    """
+    parser = argparse.ArgumentParser(prog="odoo-mcp", description="Odoo MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse"],
+        default=os.environ.get("ODOO_MCP_TRANSPORT", "stdio"),
+        help="stdio for one client, sse to serve many clients over HTTP",
+    )
+    parser.add_argument("--host", help="Listening address of the sse transport")
+    parser.add_argument("--port", type=int, help="Listening port of the sse transport")
+    return parser.parse_args(argv)
+
 
 def main() -> int:
     """
     Run the MCP server
     """
+    args = parse_args()
+    configure_logging()
     try:
-        print("=== ODOO MCP SERVER STARTING ===", file=sys.stderr)
-        print(f"Python version: {sys.version}", file=sys.stderr)
-        print("Environment variables:", file=sys.stderr)
-        for key, value in os.environ.items():
-            if key.startswith("ODOO_"):
-                if key == "ODOO_PASSWORD":
-                    print(f"  {key}: ***hidden***", file=sys.stderr)
-                else:
-                    print(f"  {key}: {value}", file=sys.stderr)
-        
-        # Check if server instance has the run_stdio method
-        methods = [method for method in dir(mcp) if not method.startswith('_')]
-        print(f"Available methods on mcp object: {methods}", file=sys.stderr)
-        
-        print("Starting MCP server with run() method...", file=sys.stderr)
-        sys.stderr.flush()  # Ensure log information is written immediately
-        
-        # Use the run() method directly
-        mcp.run()
-        
+        logger.info("=== ODOO MCP SERVER STARTING ===")
+        logger.debug("Python version: %s", sys.version)
+
+        if args.transport == "sse":
+            # Many clients share one process, its Odoo connections and caches
+            from .http_server import serve
+
+            serve(host=args.host, port=args.port)
+        else:
+            logger.info("Starting MCP server with run() method...")
+
+            # Use the run() method directly
+            mcp.run()
+
         # If execution reaches here, the server exited normally
-        print("MCP server stopped normally", file=sys.stderr)
+        logger.info("MCP server stopped normally")
         return 0
     except KeyboardInterrupt:
-        print("MCP server stopped by user", file=sys.stderr)
+        logger.info("MCP server stopped by user")
         return 0
     except Exception as e:
-        print(f"Error starting server: {e}", file=sys.stderr)
-        print("Exception details:", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        print("\nServer object information:", file=sys.stderr)
-        print(f"MCP object type: {type(mcp)}", file=sys.stderr)
-        print(f"MCP object dir: {dir(mcp)}", file=sys.stderr)
+        logger.exception("Error starting server: %s", e)
         return 1
 
 
@@ -0,0 +1,425 @@
+"""
+Asyncio Odoo RPC client for MCP server integration
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import urllib.parse
+import xmlrpc.client
+
+import httpx
+
+from .backends import get_backend_class, multicall_payload
+from .client_base import (
+    CALL,
+    MULTICALL,
+    PARALLEL,
+    SUPPORTS_MULTICALL,
+    BaseOdooClient,
+    is_session_error,
+)
+from .metrics import count_traffic
+from .odoo_client import odoo_client_options
+from .resilience import LOCAL_ERRORS, TRANSIENT_ERRORS, UNSENT_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOdooClient(BaseOdooClient):
+    """
+    Client for interacting with Odoo via XML-RPC or JSON-RPC from asyncio code
+
+    Exposes the same API as OdooClient, but every call is a coroutine that
+    runs on a pooled ``httpx.AsyncClient``, so slow Odoo calls do not block the
+    event loop and concurrent calls overlap their network waits. The client
+    authenticates on its first call (or connect()).
+    """
+
+    transient_errors = (httpx.TransportError,) + TRANSIENT_ERRORS
+    unsent_errors = (httpx.ConnectError, httpx.ConnectTimeout) + UNSENT_ERRORS
+    local_errors = (httpx.PoolTimeout,) + LOCAL_ERRORS
+
+    def __init__(self, *args, max_redirects=5, proxy=None, uid=None, **kwargs):
+        """
+        Initialize the async Odoo client
+
+        Nothing is sent to the server until the first call (or connect()).
+        Takes the arguments of BaseOdooClient.__init__(), and:
+
+        Args:
+            max_redirects: Maximum number of redirects followed per request
+            proxy: HTTP proxy URL (defaults to the HTTP_PROXY variable)
+            uid: User ID of an already authenticated session, if any
+        """
+        super().__init__(*args, **kwargs)
+        self.uid = uid
+        self._auth_lock = asyncio.Lock()
+        self.max_redirects = max_redirects
+        self.proxy = proxy or os.environ.get("HTTP_PROXY")
+        self._backend = get_backend_class(self.protocol)
+        self._http = None
+        # Event loop the connections were used on, and the task closing
+        # them after release()
+        self._loop = None
+        self._closing = None
+
+    @classmethod
+    def from_client(cls, client):
+        """
+        Build an async client sharing the session and caches of a synchronous
+        OdooClient
+
+        Args:
+            client: An authenticated OdooClient
+
+        Returns:
+            AsyncOdooClient: Client reusing the same credentials and ``uid``
+        """
+        return cls(uid=client.uid, **client.options())
+
+    def _get_http(self):
+        """Get the pooled HTTP client, creating it on first use"""
+        if self._http is None:
+            timeout = self.timeout
+            if self.pool_timeout is not None:
+                timeout = httpx.Timeout(self.timeout, pool=self.pool_timeout)
+            self._http = httpx.AsyncClient(
+                timeout=timeout,
+                verify=self.verify_ssl,
+                proxy=self.proxy,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=self.pool_idle_timeout,
+                ),
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the pooled connections to the Odoo server"""
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
+
+    async def arelease(self):
+        """Close the client once the operations in flight complete"""
+        if self._release():
+            await self.aclose()
+
+    def release(self):
+        """
+        Close the client once the operations in flight complete
+
+        Callable from any thread: when the client is idle, aclose() is
+        scheduled on the event loop its connections were used on. A
+        released client stays usable: a late call reconnects, and its
+        connections are closed again when it completes.
+        """
+        if not self._release():
+            return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # No connection was ever opened on a live loop
+            self._http = None
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._closing = loop.create_task(self.aclose())
+        else:
+            self._closing = asyncio.run_coroutine_threadsafe(self.aclose(), loop)
+
+    async def _call(self, service, method, *args):
+        """
+        Call a method of an Odoo service, following redirects
+
+        Args:
+            service: Service name ('common' or 'object')
+            method: Remote method name
+            *args: Positional arguments of the remote method
+
+        Returns:
+            The unmarshalled result of the call
+        """
+        url = self.url + self._backend.endpoint(service)
+        body = self._backend.encode_request(service, method, args)
+        headers = {"Content-Type": self._backend.content_type}
+
+        for _ in range(self.max_redirects):
+            response = await self._get_http().post(url, content=body, headers=headers)
+            count_traffic(len(body), response.num_bytes_downloaded)
+            location = response.headers.get("location")
+            if response.status_code in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if response.status_code != 200:
+                raise xmlrpc.client.ProtocolError(
+                    url,
+                    response.status_code,
+                    response.reason_phrase,
+                    dict(response.headers),
+                )
+            # Raises xmlrpc.client.Fault for server side errors
+            return self._backend.decode_response(response.content)
+
+        raise xmlrpc.client.ProtocolError(url, 310, "Too many redirects", {})
+
+    async def connect(self):
+        """Authenticate if the client has no session yet"""
+        if self.uid is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._begin()
+        try:
+            async with self._auth_lock:
+                if self.uid is None:
+                    await self._authenticate()
+        finally:
+            if self._end():
+                await self.aclose()
+
+    async def _authenticate(self):
+        """Authenticate against the common endpoint and store the user ID"""
+        logger.info(
+            "Authenticating with database: %s, username: %s", self.db, self.username
+        )
+        try:
+            self.auth_count += 1
+            uid = await self._call(
+                "common", "authenticate", self.db, self.username, self.password, {}
+            )
+            if not uid:
+                raise ValueError("Authentication failed: Invalid username or password")
+            self.uid = uid
+        except (httpx.TransportError, OSError) as e:
+            logger.error("Connection error: %s", e)
+            raise ConnectionError(f"Failed to connect to Odoo server: {str(e)}")
+        except Exception as e:
+            logger.error("Authentication error: %s", e)
+            raise ValueError(f"Failed to authenticate with Odoo: {str(e)}")
+
+    async def _run(self, plan):
+        """Run a plan of BaseOdooClient as one operation in flight"""
+        self._loop = asyncio.get_running_loop()
+        self._begin()
+        try:
+            return await self._drive(plan)
+        finally:
+            if self._end():
+                await self.aclose()
+
+    async def _drive(self, plan):
+        """Run a plan of BaseOdooClient, awaiting its requests"""
+        result, error = None, None
+        while True:
+            try:
+                if error is None:
+                    request = plan.send(result)
+                else:
+                    request = plan.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            try:
+                result = await self._dispatch(request)
+            except Exception as e:
+                error = e
+
+    async def _dispatch(self, request):
+        """Send one request yielded by a plan"""
+        kind = request[0]
+        if kind == CALL:
+            return await self._execute(*request[1:])
+        if kind == PARALLEL:
+            return await self._gather(request[1])
+        if kind == MULTICALL:
+            return await self._multicall(request[1])
+        if kind == SUPPORTS_MULTICALL:
+            return await self.supports_multicall()
+        raise ValueError(f"Unknown request {kind!r}")
+
+    async def _gather(self, plans):
+        """Run plans concurrently, at most pool_size at a time"""
+        if len(plans) <= 1:
+            return [await self._drive(plan) for plan in plans]
+        semaphore = asyncio.Semaphore(self.pool_size)
+
+        async def run(plan):
+            async with semaphore:
+                return await self._drive(plan)
+
+        return await asyncio.gather(*map(run, plans))
+
+    async def _execute(self, model, method, args, kwargs):
+        """
+        Send a call to Odoo
+
+        With a coalescer, concurrent identical read-only calls share one
+        request.
+        """
+        key = self._coalesce_key(model, method, args, kwargs)
+        if key is None:
+            return await self._send(model, method, args, kwargs)
+        return await self.coalescer.arun(
+            key, lambda: self._send(model, method, args, kwargs)
+        )
+
+    def _slot(self, method):
+        """Hold a concurrency slot for a call, if calls are limited"""
+        if self.limiter is None:
+            return contextlib.nullcontext()
+        return self.limiter.aslot(method, self.retry_policy.is_transient)
+
+    async def _send(self, model, method, args, kwargs):
+        """
+        Send one call to Odoo
+
+        Read-only methods failing with a transient error are retried with
+        jittered backoff, and calls fail fast while the circuit is open.
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            try:
+                async with self._slot(method):
+                    with self.metrics.measure_call(model, method):
+                        result = await self._execute_kw(model, method, args, kwargs)
+            except Exception as e:
+                delay = self._retry_delay(model, method, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.circuit_breaker.record_success()
+            return result
+
+    async def _execute_kw(self, model, method, args, kwargs):
+        """Send an execute_kw call, re-authenticating once if needed"""
+        await self.connect()
+        auth_count = self.auth_count
+        try:
+            return await self._call(
+                "object",
+                "execute_kw",
+                self.db,
+                self.uid,
+                self.password,
+                model,
+                method,
+                args,
+                kwargs,
+            )
+        except xmlrpc.client.Fault as e:
+            if not is_session_error(e):
+                raise
+            # Odoo rejected the session: authenticate again and retry once
+            async with self._auth_lock:
+                if self.auth_count == auth_count:
+                    logger.warning(
+                        "Session rejected by Odoo, re-authenticating: %s",
+                        e.faultString,
+                    )
+                    await self._authenticate()
+            return await self._call(
+                "object",
+                "execute_kw",
+                self.db,
+                self.uid,
+                self.password,
+                model,
+                method,
+                args,
+                kwargs,
+            )
+
+    async def supports_multicall(self):
+        """
+        Check (once) whether the server accepts system.multicall
+
+        Returns:
+            bool: True if batches can be sent as a single multicall request
+        """
+        if self._multicall_supported is None:
+            supported = False
+            if self.protocol == "xmlrpc":
+                try:
+                    methods = await self._call("object", "system.listMethods")
+                    supported = "system.multicall" in methods
+                except Exception:
+                    supported = False
+            self._multicall_supported = supported
+        return self._multicall_supported
+
+    async def _multicall(self, operations):
+        """Send operations in one system.multicall request"""
+        async with self._slot("multicall"):
+            with self.metrics.measure_call("system", "multicall"):
+                return await self._call(
+                    "object",
+                    "system.multicall",
+                    multicall_payload(self.db, self.uid, self.password, operations),
+                )
+
+    async def iter_search_read(
+        self,
+        model_name,
+        domain,
+        fields=None,
+        batch_size=1000,
+        after_id=0,
+        include_binary=False,
+    ):
+        """
+        Iterate over matching records in batches using keyset pagination
+
+        Args:
+            model_name: Name of the model (e.g., 'account.move.line')
+            domain: Search domain (e.g., [('parent_state', '=', 'posted')])
+            fields: List of field names to return (None for the lean default
+                projection: stored scalar and many2one fields)
+            batch_size: Number of records per batch
+            after_id: Only return records with an ID greater than this
+            include_binary: Add binary fields to the default projection
+
+        Yields:
+            Lists of at most batch_size record dictionaries, in ID order
+        """
+        self._loop = asyncio.get_running_loop()
+        # The whole iteration is one operation in flight
+        self._begin()
+        try:
+            fields, fields_skipped = await self._drive(
+                self._plan_default_fields(model_name, fields, include_binary)
+            )
+            last_id = after_id
+            while last_id is not None:
+                batch, last_id = await self._drive(
+                    self._plan_keyset_page(
+                        model_name, domain, fields, fields_skipped, batch_size, last_id
+                    )
+                )
+                if batch:
+                    yield batch
+        finally:
+            if self._end():
+                await self.aclose()
+
+
+def get_async_odoo_client(config=None):
+    """
+    Get a configured asyncio Odoo client instance
+
+    The client authenticates on its first call: building it sends nothing.
+
+    Args:
+        config: Configuration dictionary, see odoo_client_options()
+
+    Returns:
+        AsyncOdooClient: A configured Odoo client instance
+    """
+    return AsyncOdooClient(**odoo_client_options(config))
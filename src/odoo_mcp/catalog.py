@@ -0,0 +1,164 @@
+"""
+In-memory catalog of the models installed in an Odoo database
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+CATALOG_FIELDS = ["model", "name", "write_date"]
+
+
+def _pretty_json(data):
+    """Default catalog serializer"""
+    return json.dumps(data, indent=2)
+
+
+class ModelCatalog:
+    """
+    Cached list of ``ir.model`` records with incremental refresh
+
+    The first sync reads the whole catalog with a single ``search_read``.
+    Later syncs, at most every ``refresh_interval`` seconds, only read models
+    created or changed since the newest ``write_date`` already seen, plus a
+    ``search_count`` to detect uninstalled models (which triggers a full
+    reload). Every change produces a new ETag, and the JSON rendering is
+    computed once per ETag.
+    """
+
+    def __init__(self, refresh_interval=300):
+        """
+        Initialize an empty catalog
+
+        Args:
+            refresh_interval: Minimum seconds between two syncs with Odoo
+        """
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        # model -> {"name": ...}
+        self._models = {}
+        self._high_water = None
+        self._synced_at = None
+        self._force_full = False
+
+        self.etag = None
+        self._rendered = {}
+
+        self.stats = {"full_syncs": 0, "incremental_syncs": 0, "changes": 0}
+
+    def needs_sync(self):
+        """Whether the catalog should be synced with Odoo"""
+        with self._lock:
+            return (
+                self._synced_at is None
+                or self._force_full
+                or time.monotonic() - self._synced_at >= self.refresh_interval
+            )
+
+    def invalidate(self):
+        """Force a full reload on the next sync"""
+        with self._lock:
+            self._force_full = True
+
+    def sync_requests(self):
+        """
+        Get the Odoo calls needed for the next sync
+
+        Returns:
+            list: (model, method, args, kwargs) tuples to execute in order
+        """
+        with self._lock:
+            if self._high_water is None or self._force_full:
+                domain = []
+            else:
+                # >= so records written during the same second are not missed
+                domain = [("write_date", ">=", self._high_water)]
+        return [
+            ("ir.model", "search_read", (domain,), {"fields": CATALOG_FIELDS}),
+            ("ir.model", "search_count", ([],), {}),
+        ]
+
+    def apply(self, requests, results):
+        """
+        Merge the results of sync_requests() into the catalog
+
+        Args:
+            requests: The list returned by sync_requests()
+            results: The results of those calls, in order
+
+        Returns:
+            bool: True if the catalog needs another (full) sync because models
+            were removed
+        """
+        rows, count = results
+        full = not requests[0][2][0]
+
+        with self._lock:
+            models = {} if full else dict(self._models)
+            for row in rows:
+                models[row["model"]] = {"name": row.get("name", "")}
+                write_date = row.get("write_date")
+                if write_date and (
+                    self._high_water is None or write_date > self._high_water
+                ):
+                    self._high_water = write_date
+
+            if not full and len(models) != count:
+                # Models were uninstalled: only a full read can tell which
+                self._force_full = True
+                return True
+
+            self._synced_at = time.monotonic()
+            self._force_full = False
+            self.stats["full_syncs" if full else "incremental_syncs"] += 1
+            if full or models != self._models:
+                self._models = models
+                self._update_etag()
+            return False
+
+    def _update_etag(self):
+        """Compute the ETag of the current catalog (lock held)"""
+        digest = hashlib.sha1(
+            json.dumps(self._models, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        if digest != self.etag:
+            self.etag = digest
+            self._rendered = {}
+            self.stats["changes"] += 1
+
+    def as_dict(self):
+        """
+        Get the catalog in the format of OdooClient.get_models()
+
+        Returns:
+            dict: Sorted model names, per-model details and the ETag
+        """
+        with self._lock:
+            return {
+                "model_names": sorted(self._models),
+                "models_details": {
+                    model: dict(details) for model, details in self._models.items()
+                },
+                "etag": self.etag,
+            }
+
+    def render(self, serializer=None):
+        """
+        Get the catalog serialized as JSON, computed once per ETag
+
+        Args:
+            serializer: Callable turning the catalog dict into a string
+                (defaults to indented JSON)
+
+        Returns:
+            str: The serialized catalog
+        """
+        serializer = serializer or _pretty_json
+        with self._lock:
+            rendered = self._rendered.get(serializer)
+            if rendered is None:
+                rendered = serializer(self.as_dict())
+                self._rendered[serializer] = rendered
+            return rendered
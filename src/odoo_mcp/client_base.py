@@ -0,0 +1,1033 @@
+"""
+Transport-independent part of the synchronous and asyncio Odoo clients
+"""
+
+import logging
+import re
+import threading
+import urllib.parse
+
+from .backends import (
+    get_backend_class,
+    multicall_reruns,
+    parse_multicall,
+    unknown_outcome,
+)
+from .catalog import ModelCatalog
+from .directory import EMPLOYEE_MODEL
+from .grouping import parse_aggregates, parse_groupby, read_group_fields
+from .leave_cache import LEAVE_FIELDS, LEAVE_MODEL, format_datetime
+from .metrics import Metrics
+from .projection import ProjectionStats, lean_fields
+from .resilience import (
+    LOCAL_ERRORS,
+    TRANSIENT_ERRORS,
+    UNSENT_ERRORS,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from .result_cache import READ_ONLY_METHODS, ResultCache
+from .schema_cache import STAMP_QUERIES, SchemaCache, stamp_from_results
+
+logger = logging.getLogger(__name__)
+
+# Requests yielded by the plans of BaseOdooClient, tuples starting with:
+# CALL: (CALL, model, method, args, kwargs), one execute_kw call
+CALL = "call"
+# PARALLEL: (PARALLEL, plans), run the plans concurrently, list of results
+PARALLEL = "parallel"
+# MULTICALL: (MULTICALL, operations), one system.multicall request
+MULTICALL = "multicall"
+# SUPPORTS_MULTICALL: (SUPPORTS_MULTICALL,), whether multicall is available
+SUPPORTS_MULTICALL = "supports_multicall"
+
+
+def chunked(items, size):
+    """
+    Split a list into consecutive chunks
+
+    Args:
+        items: List to split
+        size: Maximum length of a chunk
+
+    Returns:
+        list: The chunks, in order
+    """
+    size = max(int(size), 1)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def is_session_error(fault):
+    """
+    Check whether an XML-RPC fault means Odoo rejected the credentials
+
+    Args:
+        fault: xmlrpc.client.Fault raised by the server
+
+    Returns:
+        bool: True for AccessDenied / expired session faults, False for
+        ordinary errors such as access rights on a model
+    """
+    # RPC_FAULT_CODE_ACCESS_DENIED in odoo/service/wsgi_server.py
+    if fault.faultCode == 3:
+        return True
+    message = str(fault.faultString)
+    return "AccessDenied" in message or "Session expired" in message
+
+
+class BaseOdooClient:
+    """
+    Configuration, caches and operations shared by the Odoo clients
+
+    Every operation is written once here as a plan: a generator yielding
+    the requests it needs (see CALL, PARALLEL, MULTICALL) and receiving
+    their results, holding all the caching, invalidation, batching and
+    projection logic. Subclasses only provide the transport and _run(),
+    which drives a plan: OdooClient sends its requests from the calling
+    thread and returns the result, AsyncOdooClient awaits them, so its
+    public methods return coroutines.
+
+    _run() also counts the operations in flight, so that release() can
+    close a client dropped by its owner once the last of them completes.
+    """
+
+    # Exception types of the transport, see RetryPolicy
+    transient_errors = TRANSIENT_ERRORS
+    unsent_errors = UNSENT_ERRORS
+    local_errors = LOCAL_ERRORS
+
+    def __init__(
+        self,
+        url,
+        db,
+        username,
+        password,
+        timeout=10,
+        verify_ssl=True,
+        pool_size=10,
+        pool_idle_timeout=60,
+        pool_timeout=None,
+        protocol="xmlrpc",
+        schema_cache=None,
+        model_catalog=None,
+        read_batch_size=1000,
+        read_retries=2,
+        retry_backoff=0.1,
+        lean_projection=True,
+        projection_stats=None,
+        result_cache=None,
+        metrics=None,
+        circuit_breaker=None,
+        coalescer=None,
+        limiter=None,
+        leave_cache=None,
+        employee_directory=None,
+    ):
+        """
+        Initialize the client with connection parameters
+
+        Args:
+            url: Odoo server URL (with or without protocol)
+            db: Database name
+            username: Login username
+            password: Login password
+            timeout: Connection timeout in seconds
+            verify_ssl: Whether to verify SSL certificates
+            pool_size: Maximum number of keep-alive connections to the server
+            pool_idle_timeout: Seconds an idle connection is kept open
+            pool_timeout: Seconds to wait for a free connection (None waits
+                until one is released)
+            protocol: Wire protocol, 'xmlrpc' (default) or 'jsonrpc'
+            schema_cache: SchemaCache for fields_get / ir.model lookups
+                (defaults to a private in-memory cache)
+            model_catalog: ModelCatalog backing get_models() (defaults to a
+                private catalog)
+            read_batch_size: Maximum number of IDs per ``read`` call;
+                read_records() splits larger lists into concurrent chunks
+            read_retries: How many times a read-only call failing with a
+                network error is retried
+            retry_backoff: Base delay in seconds between retries, doubled on
+                every attempt and jittered
+            circuit_breaker: CircuitBreaker failing calls fast while Odoo is
+                unreachable (defaults to a private breaker)
+            coalescer: CallCoalescer sharing one request between concurrent
+                identical read-only calls (None disables coalescing)
+            limiter: ConcurrencyLimiter bounding the calls in flight (None
+                leaves them unbounded)
+            lean_projection: Whether reads without a field list only return
+                stored scalar and many2one fields instead of every field
+            projection_stats: ProjectionStats collecting the bytes saved by
+                the lean projection (defaults to private statistics)
+            result_cache: ResultCache for search/read results (None disables
+                result caching)
+            leave_cache: LeaveCalendarCache serving search_leave_calendar()
+                (None disables it)
+            employee_directory: EmployeeDirectory serving search_employees()
+                (None sends every search to Odoo)
+            metrics: Metrics recording each Odoo call (defaults to private
+                metrics)
+        """
+        # Ensure URL has a protocol
+        if not re.match(r"^https?://", url):
+            url = f"http://{url}"
+
+        # Remove trailing slash from URL if present
+        url = url.rstrip("/")
+
+        self.url = url
+        self.db = db
+        self.username = username
+        self.password = password
+        self.uid = None
+
+        # Number of authentication round trips performed by this client
+        self.auth_count = 0
+
+        # Set timeout and SSL verification
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+
+        # Connection pool limits
+        self.pool_size = pool_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self.pool_timeout = pool_timeout
+
+        self.protocol = get_backend_class(protocol).name
+        self._multicall_supported = None
+
+        # Chunking of large read_records() calls
+        self.read_batch_size = max(int(read_batch_size), 1)
+        self.read_retries = max(int(read_retries), 0)
+
+        # Retries of transient failures and fail-fast while Odoo is down
+        self.retry_backoff = retry_backoff
+        self.retry_policy = RetryPolicy(
+            retries=read_retries,
+            backoff=retry_backoff,
+            transient_errors=self.transient_errors,
+            unsent_errors=self.unsent_errors,
+            local_errors=self.local_errors,
+        )
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+
+        # Optional single flight of concurrent identical reads
+        self.coalescer = coalescer
+
+        # Optional bound on the calls in flight, shared with other clients
+        self.limiter = limiter
+
+        # Default field list of reads without explicit fields
+        self.lean_projection = lean_projection
+        self.projection_stats = (
+            projection_stats if projection_stats is not None else ProjectionStats()
+        )
+
+        # Optional cache of read-only query results
+        self.result_cache = result_cache
+
+        # Optional date-range cache of the leave calendar
+        self.leave_cache = leave_cache
+
+        # Optional local index of the employee names
+        self.employee_directory = employee_directory
+
+        # Latency, payload and error metrics of the Odoo calls
+        self.metrics = metrics if metrics is not None else Metrics()
+
+        # Cache of fields_get and ir.model lookups
+        self.schema_cache = schema_cache if schema_cache is not None else SchemaCache()
+
+        # Cached ir.model catalog, refreshed incrementally
+        self.model_catalog = (
+            model_catalog if model_catalog is not None else ModelCatalog()
+        )
+
+        # Parse hostname for logging
+        parsed_url = urllib.parse.urlparse(self.url)
+        self.hostname = parsed_url.netloc
+
+        # Operations in flight, and whether the owner released the client
+        self._active = 0
+        self._released = False
+        self._active_lock = threading.Lock()
+
+    def options(self):
+        """
+        Get the settings and shared components of this client
+
+        Returns:
+            dict: Keyword arguments building another client (of either
+            class) for the same session, sharing its caches and limits
+        """
+        return {
+            "url": self.url,
+            "db": self.db,
+            "username": self.username,
+            "password": self.password,
+            "timeout": self.timeout,
+            "verify_ssl": self.verify_ssl,
+            "pool_size": self.pool_size,
+            "pool_idle_timeout": self.pool_idle_timeout,
+            "pool_timeout": self.pool_timeout,
+            "protocol": self.protocol,
+            "schema_cache": self.schema_cache,
+            "model_catalog": self.model_catalog,
+            "read_batch_size": self.read_batch_size,
+            "read_retries": self.read_retries,
+            "retry_backoff": self.retry_backoff,
+            "lean_projection": self.lean_projection,
+            "projection_stats": self.projection_stats,
+            "result_cache": self.result_cache,
+            "metrics": self.metrics,
+            "circuit_breaker": self.circuit_breaker,
+            "coalescer": self.coalescer,
+            "limiter": self.limiter,
+            "leave_cache": self.leave_cache,
+            "employee_directory": self.employee_directory,
+        }
+
+    def _run(self, plan):
+        """Run a plan over the transport of the client"""
+        raise NotImplementedError
+
+    def _begin(self):
+        """Count an operation in flight"""
+        with self._active_lock:
+            self._active += 1
+
+    def _end(self):
+        """
+        Count the end of an operation
+
+        Returns:
+            bool: True if the client was released and is now idle, the
+            caller closes it
+        """
+        with self._active_lock:
+            self._active -= 1
+            return self._released and not self._active
+
+    def _release(self):
+        """
+        Mark the client released
+
+        Returns:
+            bool: True if no operation is in flight, the caller closes it
+        """
+        with self._active_lock:
+            self._released = True
+            return not self._active
+
+    @property
+    def in_flight(self):
+        """Number of operations in flight"""
+        return self._active
+
+    # ----- Decisions shared by the transports -----
+
+    def _coalesce_key(self, model, method, args, kwargs):
+        """Key of a call for the coalescer, None if it is not coalesced"""
+        if self.coalescer is None or method not in READ_ONLY_METHODS:
+            return None
+        return ResultCache.make_key(self.db, model, method, args, kwargs)
+
+    def _retry_delay(self, model, method, error, attempt):
+        """
+        Record a failed attempt and decide whether to send the call again
+
+        Args:
+            model: Model called
+            method: Method called
+            error: Exception raised by the attempt
+            attempt: Number of retries already done
+
+        Returns:
+            float: Seconds to wait before the next attempt, None to raise
+            the error
+        """
+        if self.retry_policy.is_local(error):
+            # No connection was free here: Odoo was not even called
+            return None
+        if not self.retry_policy.is_transient(error):
+            # Odoo answered: it is up, the error is the caller's
+            self.circuit_breaker.record_success()
+            return None
+        self.circuit_breaker.record_failure()
+        if (
+            not self.retry_policy.should_retry(method, error, attempt)
+            or self.circuit_breaker.state != "closed"
+        ):
+            return None
+        delay = self.retry_policy.delay(attempt)
+        logger.warning(
+            "Retrying %s.%s in %.2fs after error: %s", model, method, delay, error
+        )
+        return delay
+
+    def _forget(self, model):
+        """Drop what a call that may have modified a model made stale"""
+        if self.coalescer is not None:
+            self.coalescer.forget(self.db, model)
+        if self.leave_cache is not None:
+            self.leave_cache.invalidate(model)
+        if self.employee_directory is not None:
+            self.employee_directory.mark_stale(model)
+
+    def _invalidate_results(self, operations):
+        """Drop cached results of the models changed by a batch"""
+        for model, method, _, _ in operations:
+            if method not in READ_ONLY_METHODS:
+                if self.result_cache is not None:
+                    self.result_cache.invalidate(self.db, model)
+                if self.leave_cache is not None:
+                    self.leave_cache.invalidate(model)
+                if self.employee_directory is not None:
+                    self.employee_directory.mark_stale(model)
+
+    # ----- Plans -----
+
+    def _plan_execute(self, model, method, args, kwargs):
+        """Execute a method on an Odoo model, bypassing the result cache"""
+        if method in READ_ONLY_METHODS:
+            return (yield (CALL, model, method, args, kwargs))
+        try:
+            return (yield (CALL, model, method, args, kwargs))
+        finally:
+            # Reads starting from now must see the changes
+            self._forget(model)
+
+    def _plan_sequence(self, requests):
+        """Execute (model, method, args, kwargs) requests one after another"""
+        results = []
+        for model, method, args, kwargs in requests:
+            results.append((yield from self._plan_execute(model, method, args, kwargs)))
+        return results
+
+    def _plan_method(self, model, method, args, kwargs):
+        """Execute a method, through the result cache if there is one"""
+        cache = self.result_cache
+        if cache is not None and cache.is_cacheable(model, method):
+            key = cache.make_key(self.db, model, method, args, kwargs)
+            hit, result = cache.get(key)
+            if hit:
+                return result
+            generation = cache.generation(self.db, model)
+            result = yield from self._plan_execute(model, method, args, kwargs)
+            cache.put(key, result, generation)
+            return result
+
+        if cache is None or method in READ_ONLY_METHODS:
+            return (yield from self._plan_execute(model, method, args, kwargs))
+        try:
+            return (yield from self._plan_execute(model, method, args, kwargs))
+        finally:
+            # Even a failed call may have changed data (e.g. a timeout)
+            cache.invalidate(self.db, model)
+
+    def _plan_outcome(self, operation, rerun, error):
+        """Execute one operation of a batch, reporting its outcome"""
+        if not rerun:
+            return unknown_outcome(error)
+        model, method, args, kwargs = operation
+        try:
+            result = yield from self._plan_method(model, method, tuple(args), kwargs)
+            return {"success": True, "result": result}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def _plan_batch(self, operations):
+        """Execute many methods, in one multicall request if possible"""
+        if not operations:
+            return []
+
+        reruns = [True] * len(operations)
+        error = None
+        if len(operations) > 1 and (yield (SUPPORTS_MULTICALL,)):
+            try:
+                results = yield (MULTICALL, operations)
+            except Exception as e:
+                # Writes may have been applied even if the request failed
+                self._invalidate_results(operations)
+                reruns = multicall_reruns(
+                    e,
+                    operations,
+                    self.retry_policy.unsent_errors + self.retry_policy.local_errors,
+                )
+                logger.warning(
+                    "Multicall failed, running %d of %d operations one by one: %s",
+                    sum(reruns),
+                    len(operations),
+                    e,
+                )
+                error = e
+            else:
+                self._invalidate_results(operations)
+                return parse_multicall(results)
+
+        return (
+            yield (
+                PARALLEL,
+                [
+                    self._plan_outcome(operation, rerun, error)
+                    for operation, rerun in zip(operations, reruns)
+                ],
+            )
+        )
+
+    def _plan_refresh_schema_stamp(self):
+        """Invalidate cached schemas when the database schema changed"""
+        if not self.schema_cache.needs_check(self.db):
+            return
+        try:
+            results = yield from self._plan_sequence(STAMP_QUERIES)
+        except Exception as e:
+            # Keep serving cached schemas until the TTL expires
+            logger.warning("Error checking schema changes: %s", e)
+            self.schema_cache.mark_checked(self.db)
+            return
+        self.schema_cache.check_stamp(self.db, stamp_from_results(results))
+
+    def _plan_cached_schema(self, kind, model_name, fetch):
+        """
+        Get a schema from the cache, fetching and storing it on a miss
+
+        Args:
+            kind: Kind of schema ('fields' or 'model')
+            model_name: Name of the model
+            fetch: Plan returning the schema from Odoo, only run on a miss
+
+        Returns:
+            The cached or freshly fetched schema
+        """
+        yield from self._plan_refresh_schema_stamp()
+        value = self.schema_cache.get(self.db, kind, model_name)
+        if value is None:
+            value = yield from fetch
+            self.schema_cache.put(self.db, kind, model_name, value)
+        return value
+
+    def _plan_fields_get(self, model_name):
+        """Get the cached field definitions of a model"""
+        return (
+            yield from self._plan_cached_schema(
+                "fields",
+                model_name,
+                self._plan_execute(model_name, "fields_get", (), {}),
+            )
+        )
+
+    def _plan_default_fields(self, model_name, fields, include_binary=False):
+        """
+        Get the field list of a read, the lean one when it has no fields
+
+        Args:
+            model_name: Name of the model
+            fields: Field names requested, None for the default
+            include_binary: Also return stored binary fields
+
+        Returns:
+            tuple: (list of field names or None for every field, number of
+            fields left out)
+        """
+        if fields is not None or not self.lean_projection:
+            return fields, 0
+        try:
+            fields_info = yield from self._plan_fields_get(model_name)
+        except Exception as e:
+            logger.warning(
+                "Reading every field of %s, fields_get failed: %s", model_name, e
+            )
+            return None, 0
+        return lean_fields(fields_info, include_binary)
+
+    def _plan_sync_model_catalog(self):
+        """Bring the model catalog up to date if its refresh interval elapsed"""
+        catalog = self.model_catalog
+        # A second, full sync is needed when models were uninstalled
+        for _ in range(2):
+            if not catalog.needs_sync():
+                return
+            requests = catalog.sync_requests()
+            results = yield from self._plan_sequence(requests)
+            if not catalog.apply(requests, results):
+                return
+
+    def _plan_get_models(self):
+        """List the models from the catalog"""
+        try:
+            # One search_read on ir.model, then only incremental refreshes
+            yield from self._plan_sync_model_catalog()
+            models_info = self.model_catalog.as_dict()
+
+            if not models_info["model_names"]:
+                models_info["error"] = "No models found"
+
+            return models_info
+        except Exception as e:
+            logger.error("Error retrieving models: %s", e)
+            return {"model_names": [], "models_details": {}, "error": str(e)}
+
+    def _plan_get_model_info(self, model_name):
+        """Describe a model"""
+        try:
+            result = yield from self._plan_cached_schema(
+                "model",
+                model_name,
+                self._plan_execute(
+                    "ir.model",
+                    "search_read",
+                    ([("model", "=", model_name)],),
+                    {"fields": ["name", "model"]},
+                ),
+            )
+
+            if not result:
+                return {"error": f"Model {model_name} not found"}
+
+            return dict(result[0])
+        except Exception as e:
+            logger.error("Error retrieving model info: %s", e)
+            return {"error": str(e)}
+
+    def _plan_get_model_fields(self, model_name):
+        """Get the field definitions of a model"""
+        try:
+            return (yield from self._plan_fields_get(model_name))
+        except Exception as e:
+            logger.error("Error retrieving fields: %s", e)
+            return {"error": str(e)}
+
+    def _plan_search_read(
+        self, model_name, domain, fields, offset, limit, order, include_binary
+    ):
+        """Search for records and read them"""
+        try:
+            kwargs = {}
+            if offset:
+                kwargs["offset"] = offset
+            fields, fields_skipped = yield from self._plan_default_fields(
+                model_name, fields, include_binary
+            )
+            if fields is not None:
+                kwargs["fields"] = fields
+            if limit is not None:
+                kwargs["limit"] = limit
+            if order is not None:
+                kwargs["order"] = order
+
+            result = yield from self._plan_method(
+                model_name, "search_read", (domain,), kwargs
+            )
+            if fields_skipped:
+                self.projection_stats.record(model_name, result, fields_skipped)
+            return result
+        except Exception as e:
+            logger.error("Error in search_read: %s", e)
+            return []
+
+    def _plan_read_group(
+        self, model_name, domain, groupby, aggregates, offset, limit, orderby, lazy
+    ):
+        """Aggregate records with read_group"""
+        groupby = parse_groupby(groupby)
+        aggregates = parse_aggregates(aggregates)
+        kwargs = {"lazy": lazy}
+        if offset:
+            kwargs["offset"] = offset
+        if limit is not None:
+            kwargs["limit"] = limit
+        if orderby:
+            kwargs["orderby"] = orderby
+        return (
+            yield from self._plan_method(
+                model_name,
+                "read_group",
+                (domain, read_group_fields(groupby, aggregates), groupby),
+                kwargs,
+            )
+        )
+
+    def _plan_keyset_page(
+        self, model_name, domain, fields, fields_skipped, batch_size, last_id
+    ):
+        """
+        Read the page of records following an ID
+
+        Returns:
+            tuple: (records, ID to continue after or None after the last
+            page)
+        """
+        kwargs = {"limit": batch_size, "order": "id asc"}
+        if fields is not None:
+            kwargs["fields"] = fields
+        batch = yield from self._plan_execute(
+            model_name, "search_read", ([("id", ">", last_id)] + list(domain),), kwargs
+        )
+        if fields_skipped and batch:
+            self.projection_stats.record(model_name, batch, fields_skipped)
+        if len(batch) < batch_size:
+            return batch, None
+        return batch, batch[-1]["id"]
+
+    def _plan_read_records(self, model_name, ids, fields, include_binary):
+        """Read records by ID, long lists in concurrent chunks"""
+        try:
+            kwargs = {}
+            fields, fields_skipped = yield from self._plan_default_fields(
+                model_name, fields, include_binary
+            )
+            if fields is not None:
+                kwargs["fields"] = fields
+
+            chunks = chunked(list(ids), self.read_batch_size)
+            if len(chunks) <= 1:
+                result = yield from self._plan_method(
+                    model_name, "read", (ids,), kwargs
+                )
+            else:
+                # Chunks skip the result cache, each is retried on its own
+                pages = yield (
+                    PARALLEL,
+                    [
+                        self._plan_execute(model_name, "read", (chunk,), kwargs)
+                        for chunk in chunks
+                    ],
+                )
+                result = [record for page in pages for record in page]
+            if fields_skipped:
+                self.projection_stats.record(model_name, result, fields_skipped)
+            return result
+        except Exception as e:
+            logger.error("Error reading records: %s", e)
+            return []
+
+    def _plan_sync_employee_directory(self):
+        """Bring the employee directory up to date if it is stale"""
+        directory = self.employee_directory
+        # A second, full sync is needed when employees were deleted
+        for _ in range(2):
+            if not directory.needs_sync():
+                return
+            requests = directory.sync_requests()
+            results = yield from self._plan_sequence(requests)
+            if not directory.apply(requests, results):
+                return
+
+    def _plan_search_employees(self, name, limit):
+        """Find employees by name, locally when there is a directory"""
+        directory = self.employee_directory
+        if directory is not None:
+            try:
+                yield from self._plan_sync_employee_directory()
+            except Exception as e:
+                logger.warning("Employee directory sync failed: %s", e)
+            else:
+                matches = directory.search(name, limit)
+                if matches:
+                    return matches
+            directory.record_fallback()
+        return (
+            yield from self._plan_method(
+                EMPLOYEE_MODEL, "name_search", (), {"name": name, "limit": limit}
+            )
+        )
+
+    def _plan_read_leaves(self, start, stop, employee_ids):
+        """Read the leaves overlapping a period from Odoo"""
+        domain = [
+            ["start_datetime", "<=", format_datetime(stop)],
+            ["stop_datetime", ">=", format_datetime(start)],
+        ]
+        if employee_ids is not None:
+            domain.append(["employee_id", "in", list(employee_ids)])
+        return (
+            yield from self._plan_method(
+                LEAVE_MODEL,
+                "search_read",
+                (domain,),
+                {"fields": list(LEAVE_FIELDS), "order": "start_datetime, id"},
+            )
+        )
+
+    def _plan_search_leave_calendar(self, start, stop, employee_ids):
+        """Read the leaves of a period, only the uncached ranges from Odoo"""
+        cache = self.leave_cache
+        if cache is None:
+            return (yield from self._plan_read_leaves(start, stop, employee_ids))
+        ranges, generation = cache.plan(start, stop, employee_ids)
+        results = yield (
+            PARALLEL,
+            [self._plan_read_leaves(low, high, ids) for low, high, ids in ranges],
+        )
+        for (low, high, ids), rows in zip(ranges, results):
+            cache.store(low, high, ids, rows, generation)
+        return cache.lookup(start, stop, employee_ids)
+
+    # ----- Public API, run over the transport of the subclass -----
+
+    def execute_method(self, model, method, *args, **kwargs):
+        """
+        Execute an arbitrary method on a model
+
+        When a result cache is configured, read-only queries are served from
+        it and any other method invalidates the cached results of the model.
+
+        Args:
+            model: The model name (e.g., 'res.partner')
+            method: Method name to execute
+            *args: Positional arguments to pass to the method
+            **kwargs: Keyword arguments to pass to the method
+
+        Returns:
+            Result of the method execution
+        """
+        return self._run(self._plan_method(model, method, args, kwargs))
+
+    def execute_batch(self, operations):
+        """
+        Execute many methods and return their outcomes in order
+
+        The operations are sent in one system.multicall request when the
+        server supports it, and otherwise run concurrently, at most
+        ``pool_size`` at a time. A failing operation does not affect the
+        others. If the multicall fails after it was sent, only its read-only
+        operations are run again, the others report an error.
+
+        Args:
+            operations: List of (model, method, args, kwargs) tuples
+
+        Returns:
+            List of dictionaries with ``success`` and either ``result`` or
+            ``error``, in the order of the operations
+
+        Examples:
+            >>> client = OdooClient(url, db, username, password)
+            >>> client.execute_batch([
+            ...     ('res.partner', 'search_count', [[]], {}),
+            ...     ('res.users', 'read', [[2]], {'fields': ['name']}),
+            ... ])
+            [{'success': True, 'result': 42}, {'success': True, 'result': [...]}]
+        """
+        return self._run(self._plan_batch(operations))
+
+    def get_models(self):
+        """
+        Get a list of all available models in the system
+
+        The list comes from the cached model catalog, which is refreshed with
+        Odoo at most every ``model_catalog.refresh_interval`` seconds.
+
+        Returns:
+            Dictionary with sorted model names, their details and an ETag
+
+        Examples:
+            >>> client = OdooClient(url, db, username, password)
+            >>> models = client.get_models()
+            >>> print(len(models))
+            125
+            >>> print(models[:5])
+            ['res.partner', 'res.users', 'res.company', 'res.groups', 'ir.model']
+        """
+        return self._run(self._plan_get_models())
+
+    def get_model_info(self, model_name):
+        """
+        Get information about a specific model
+
+        Args:
+            model_name: Name of the model (e.g., 'res.partner')
+
+        Returns:
+            Dictionary with model information
+
+        Examples:
+            >>> client = OdooClient(url, db, username, password)
+            >>> info = client.get_model_info('res.partner')
+            >>> print(info['name'])
+            'Contact'
+        """
+        return self._run(self._plan_get_model_info(model_name))
+
+    def get_model_fields(self, model_name):
+        """
+        Get field definitions for a specific model
+
+        Args:
+            model_name: Name of the model (e.g., 'res.partner')
+
+        Returns:
+            Dictionary mapping field names to their definitions
+
+        Examples:
+            >>> client = OdooClient(url, db, username, password)
+            >>> fields = client.get_model_fields('res.partner')
+            >>> print(fields['name']['type'])
+            'char'
+        """
+        return self._run(self._plan_get_model_fields(model_name))
+
+    def search_read(
+        self,
+        model_name,
+        domain,
+        fields=None,
+        offset=None,
+        limit=None,
+        order=None,
+        include_binary=False,
+    ):
+        """
+        Search for records and read their data in a single call
+
+        Args:
+            model_name: Name of the model (e.g., 'res.partner')
+            domain: Search domain (e.g., [('is_company', '=', True)])
+            fields: List of field names to return (None for the lean default
+                projection: stored scalar and many2one fields)
+            offset: Number of records to skip
+            limit: Maximum number of records to return
+            order: Sorting criteria (e.g., 'name ASC, id DESC')
+            include_binary: Add binary fields to the default projection
+
+        Returns:
+            List of dictionaries with the matching records
+
+        Examples:
+            >>> client = OdooClient(url, db, username, password)
+            >>> records = client.search_read('res.partner', [('is_company', '=', True)], limit=5)
+            >>> print(len(records))
+            5
+        """
+        return self._run(
+            self._plan_search_read(
+                model_name, domain, fields, offset, limit, order, include_binary
+            )
+        )
+
+    def read_group(
+        self,
+        model_name,
+        domain,
+        groupby,
+        aggregates=None,
+        offset=None,
+        limit=None,
+        orderby=None,
+        lazy=True,
+    ):
+        """
+        Aggregate matching records server-side with read_group
+
+        Args:
+            model_name: Name of the model (e.g., 'sale.order')
+            domain: Search domain (e.g., [('state', '=', 'sale')])
+            groupby: Field names to group by, optionally with a date
+                granularity (e.g., ['partner_id', 'date_order:month'])
+            aggregates: Fields to aggregate, optionally with a function
+                (e.g., ['amount_total:sum']); None only counts records
+            offset: Number of groups to skip
+            limit: Maximum number of groups to return
+            orderby: Sorting of the groups (e.g., 'amount_total desc')
+            lazy: Group by the first field only, with a count of the
+                sub-groups, instead of every combination of the fields
+
+        Returns:
+            List of dictionaries, one per group
+
+        Raises:
+            ValueError: If a group-by or aggregate specification is malformed
+        """
+        return self._run(
+            self._plan_read_group(
+                model_name, domain, groupby, aggregates, offset, limit, orderby, lazy
+            )
+        )
+
+    def read_records(self, model_name, ids, fields=None, include_binary=False):
+        """
+        Read data of records by IDs
+
+        Lists longer than ``read_batch_size`` are split into chunks read
+        concurrently (at most ``pool_size`` at a time) and merged back in
+        input order. Chunks failing with a network error are retried on
+        their own (see ``read_retries``).
+
+        Args:
+            model_name: Name of the model (e.g., 'res.partner')
+            ids: List of record IDs to read
+            fields: List of field names to return (None for the lean default
+                projection: stored scalar and many2one fields)
+            include_binary: Add binary fields to the default projection
+
+        Returns:
+            List of dictionaries with the requested records
+
+        Examples:
+            >>> client = OdooClient(url, db, username, password)
+            >>> records = client.read_records('res.partner', [1])
+            >>> print(records[0]['name'])
+            'YourCompany'
+        """
+        return self._run(
+            self._plan_read_records(model_name, ids, fields, include_binary)
+        )
+
+    def search_employees(self, name, limit=20):
+        """
+        Find employees by name
+
+        With an employee directory, names are matched locally like
+        name_search does (names containing the query, accents and case
+        ignored, best matches first) and Odoo is only called to bring
+        a stale directory up to date. Odoo's name_search answers when there
+        is no directory, its sync fails or nothing matches locally.
+
+        Args:
+            name: Name or part of a name
+            limit: Maximum number of results
+
+        Returns:
+            List of [id, name] pairs, like name_search
+        """
+        return self._run(self._plan_search_employees(name, limit))
+
+    def suggest_employees(self, name, limit=20):
+        """
+        Find close spellings of an employee name in the employee directory
+
+        Meant for a search_employees() that found nothing: these are not
+        name_search results, only names sharing most letter trigrams with
+        the query. Odoo is not called, so this is a plain method for both
+        clients.
+
+        Args:
+            name: Name or part of a name
+            limit: Maximum number of results
+
+        Returns:
+            List of [id, name] pairs, closest first (empty without a
+            directory)
+        """
+        if self.employee_directory is None:
+            return []
+        return self.employee_directory.suggest(name, limit)
+
+    def search_leave_calendar(self, start, stop, employee_ids=None):
+        """
+        Read the leaves of the calendar overlapping a period
+
+        Only the fields of LEAVE_FIELDS are read. With a leave cache, the
+        parts of the period already cached are answered from memory and one
+        search_read is sent per missing range, concurrently.
+
+        Args:
+            start: Start of the period (datetime, inclusive)
+            stop: End of the period (datetime, inclusive)
+            employee_ids: Employee ids to restrict to (None for everyone)
+
+        Returns:
+            List of leave rows sorted by start, then id
+        """
+        return self._run(self._plan_search_leave_calendar(start, stop, employee_ids))
@@ -0,0 +1,161 @@
+"""
+Coalescing of concurrent identical read-only calls (single flight)
+"""
+
+import asyncio
+import pickle
+import threading
+
+
+class _Flight:
+    """A call in progress and the callers waiting for it"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _copy(value):
+    """Private copy of a shared result, callers may modify what they get"""
+    return pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class CallCoalescer:
+    """
+    Share one in-flight request between concurrent identical calls
+
+    The first caller of a key (the leader) sends the request; callers
+    arriving with the same key before it completes wait for it and get a
+    copy of its result, or its exception. Nothing is kept once the request
+    completes: this is not a cache, it only folds overlapping calls.
+
+    Threads use run(), asyncio tasks use arun(); both share the counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._tasks = {}
+        self.stats = {"requests": 0, "coalesced": 0}
+
+    def run(self, key, call):
+        """
+        Run a call, or wait for the identical one already in flight
+
+        Args:
+            key: Hashable key, equal for interchangeable calls
+            call: Callable sending the request
+
+        Returns:
+            The result of the call (a copy for the callers that waited)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.stats["requests"] += 1
+                leader = True
+            else:
+                self.stats["coalesced"] += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.result)
+
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    async def arun(self, key, call):
+        """
+        Await a call, or the identical one already in flight
+
+        Args:
+            key: Hashable key, equal for interchangeable calls
+            call: Coroutine function sending the request
+
+        Returns:
+            The result of the call (a copy for the callers that waited)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            # forget() edits the map from worker threads
+            with self._lock:
+                future = self._tasks.get(key)
+                if future is None or future.get_loop() is not loop:
+                    future = self._tasks[key] = loop.create_future()
+                    self.stats["requests"] += 1
+                    break
+            # A cancelled leader does not cancel its followers
+            await asyncio.wait([future])
+            if not future.cancelled():
+                with self._lock:
+                    self.stats["coalesced"] += 1
+                return _copy(future.result())
+
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here, the followers (if any) get it from result()
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._tasks.get(key) is future:
+                    del self._tasks[key]
+
+    def forget(self, db, model):
+        """
+        Stop new callers from joining the reads of a model in flight
+
+        Called after a call that may have modified the model, so later
+        reads see its changes. Keys must start with (db, model).
+
+        Args:
+            db: Database name
+            model: Model name
+        """
+        with self._lock:
+            for flights in (self._flights, self._tasks):
+                for key in [k for k in flights if k[:2] == (db, model)]:
+                    del flights[key]
+
+    def snapshot(self):
+        """
+        Get the coalescing counters
+
+        Returns:
+            dict: Requests sent, calls saved and calls currently in flight
+        """
+        with self._lock:
+            requests = self.stats["requests"]
+            coalesced = self.stats["coalesced"]
+            in_flight = len(self._flights) + len(self._tasks)
+        total = requests + coalesced
+        return {
+            "requests": requests,
+            "coalesced": coalesced,
+            "in_flight": in_flight,
+            "saved_ratio": round(coalesced / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,313 @@
+"""
+In-memory employee directory with an accent-insensitive name index
+"""
+
+import re
+import threading
+import time
+import unicodedata
+
+EMPLOYEE_MODEL = "hr.employee"
+DIRECTORY_FIELDS = ["name", "active", "write_date"]
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Ranks of a match, best first
+EXACT, NAME_PREFIX, WORD_PREFIX, SUBSTRING = range(4)
+
+
+def normalize(text):
+    """
+    Fold a name for matching: no accents, no case, single spaces
+
+    Args:
+        text: Name or query
+
+    Returns:
+        str: Normalized text, e.g. 'Élodie  O'Brien' -> 'elodie o brien'
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_SEPARATORS.sub(" ", stripped.casefold()).split())
+
+
+def trigrams(text):
+    """Trigrams of a normalized text, words padded with spaces"""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class EmployeeDirectory:
+    """
+    Local copy of the employee names, searchable without Odoo
+
+    The first sync reads every active employee with a single
+    ``search_read``. Later syncs, at most every ``refresh_interval``
+    seconds, only read employees written since the newest ``write_date``
+    already seen (archived ones included, to drop them), plus a
+    ``search_count`` to detect deleted employees, which triggers a full
+    reload.
+
+    The sync runs as the client's user without a context, like the
+    ``name_search`` it replaces, so the directory holds the employees that
+    user may read in their allowed companies. A search returns the names
+    containing the query, as ``name_search`` (``ilike``) does, but ignoring
+    accents: exact names first, then names starting with the query, names
+    with a word starting with it and the other ones. Close spellings are
+    never mixed in: ``suggest()`` returns them separately.
+
+    Names are indexed by trigram.
+    """
+
+    def __init__(self, refresh_interval=60, fuzzy_threshold=0.5):
+        """
+        Initialize an empty directory
+
+        Args:
+            refresh_interval: Minimum seconds between two syncs with Odoo
+            fuzzy_threshold: Share of the query trigrams a name must contain
+                to be suggested as a close spelling (0 disables suggestions)
+        """
+        self.refresh_interval = refresh_interval
+        self.fuzzy_threshold = fuzzy_threshold
+
+        self._lock = threading.RLock()
+        # id -> (name, normalized name)
+        self._employees = {}
+        # trigram -> ids of the names containing it
+        self._trigrams = {}
+        self._high_water = None
+        self._synced_at = None
+        self._force_full = False
+
+        self.stats = {
+            "full_syncs": 0,
+            "incremental_syncs": 0,
+            "changes": 0,
+            "searches": 0,
+            "suggestions": 0,
+            "fallbacks": 0,
+        }
+
+    def needs_sync(self):
+        """Whether the directory should be synced with Odoo"""
+        with self._lock:
+            return (
+                self._synced_at is None
+                or self._force_full
+                or time.monotonic() - self._synced_at >= self.refresh_interval
+            )
+
+    def mark_stale(self, model=None):
+        """
+        Sync on the next search, after a change to the employees
+
+        Args:
+            model: Model changed, unrelated models are ignored (None: always)
+        """
+        if model is not None and model != EMPLOYEE_MODEL:
+            return
+        with self._lock:
+            self._synced_at = None
+
+    def invalidate(self):
+        """Force a full reload on the next sync"""
+        with self._lock:
+            self._force_full = True
+
+    def sync_requests(self):
+        """
+        Get the Odoo calls needed for the next sync
+
+        Returns:
+            list: (model, method, args, kwargs) tuples to execute in order
+        """
+        with self._lock:
+            if self._high_water is None or self._force_full:
+                domain = []
+            else:
+                # >= so records written during the same second are not missed
+                domain = [
+                    ("write_date", ">=", self._high_water),
+                    ("active", "in", [True, False]),
+                ]
+        return [
+            (EMPLOYEE_MODEL, "search_read", (domain,), {"fields": DIRECTORY_FIELDS}),
+            (EMPLOYEE_MODEL, "search_count", ([],), {}),
+        ]
+
+    def apply(self, requests, results):
+        """
+        Merge the results of sync_requests() into the directory
+
+        Args:
+            requests: The list returned by sync_requests()
+            results: The results of those calls, in order
+
+        Returns:
+            bool: True if the directory needs another (full) sync because
+            employees were deleted
+        """
+        rows, count = results
+        full = not requests[0][2][0]
+
+        with self._lock:
+            if full:
+                self._employees = {}
+                self._trigrams = {}
+            changes = 0
+            for row in rows:
+                name = row.get("name") or ""
+                current = self._employees.get(row["id"])
+                if row.get("active", True):
+                    if current is None or current[0] != name:
+                        self._remove(row["id"])
+                        self._add(row["id"], name)
+                        changes += 1
+                elif current is not None:
+                    self._remove(row["id"])
+                    changes += 1
+                write_date = row.get("write_date")
+                if write_date and (
+                    self._high_water is None or write_date > self._high_water
+                ):
+                    self._high_water = write_date
+
+            if not full and len(self._employees) != count:
+                # Employees were deleted: only a full read can tell which
+                self._force_full = True
+                return True
+
+            self._synced_at = time.monotonic()
+            self._force_full = False
+            self.stats["full_syncs" if full else "incremental_syncs"] += 1
+            self.stats["changes"] += changes
+            return False
+
+    def _add(self, employee_id, name):
+        """Index an employee (lock held)"""
+        normalized = normalize(name)
+        self._employees[employee_id] = (name, normalized)
+        for trigram in trigrams(normalized):
+            self._trigrams.setdefault(trigram, set()).add(employee_id)
+
+    def _remove(self, employee_id):
+        """Drop an employee from the index (lock held)"""
+        current = self._employees.pop(employee_id, None)
+        if current is None:
+            return
+        for trigram in trigrams(current[1]):
+            ids = self._trigrams.get(trigram)
+            if ids is not None:
+                ids.discard(employee_id)
+                if not ids:
+                    del self._trigrams[trigram]
+
+    def _rank(self, query, normalized):
+        """Rank of a name for a query, None if it does not contain it"""
+        if normalized == query:
+            return EXACT
+        if normalized.startswith(query):
+            return NAME_PREFIX
+        if f" {query}" in normalized:
+            return WORD_PREFIX
+        if query in normalized:
+            return SUBSTRING
+        return None
+
+    def search(self, name, limit=20):
+        """
+        Find employees by name
+
+        Args:
+            name: Name or part of a name, accents and case are ignored
+            limit: Maximum number of results
+
+        Returns:
+            list: [id, name] pairs of the names containing the query, best
+            matches first (like name_search)
+        """
+        query = normalize(name)
+        with self._lock:
+            self.stats["searches"] += 1
+            if not query:
+                ranked = sorted(
+                    (normalized, employee_id)
+                    for employee_id, (_, normalized) in self._employees.items()
+                )
+                return [[i, self._employees[i][0]] for _, i in ranked[:limit]]
+
+            # Candidates: the names containing every trigram of the query
+            inner = {query[i : i + 3] for i in range(len(query) - 2)}
+            if inner:
+                postings = sorted((self._trigrams.get(t, ()) for t in inner), key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+            else:
+                # Too short for trigrams: scan every name
+                candidates = self._employees
+
+            ranked = []
+            for employee_id in candidates:
+                employee_name, normalized = self._employees[employee_id]
+                rank = self._rank(query, normalized)
+                if rank is not None:
+                    ranked.append((rank, employee_name, employee_id))
+            ranked.sort()
+            return [[i, n] for _, n, i in ranked[:limit]]
+
+    def suggest(self, name, limit=20):
+        """
+        Find close spellings of a name, for a search that found nothing
+
+        Args:
+            name: Name or part of a name, accents and case are ignored
+            limit: Maximum number of results
+
+        Returns:
+            list: [id, name] pairs of the names sharing enough trigrams with
+            the query but not containing it, closest first
+        """
+        query = normalize(name)
+        if len(query) < 3 or not self.fuzzy_threshold:
+            return []
+        query_trigrams = trigrams(query)
+        with self._lock:
+            counts = {}
+            for trigram in query_trigrams:
+                for employee_id in self._trigrams.get(trigram, ()):
+                    counts[employee_id] = counts.get(employee_id, 0) + 1
+            matches = []
+            for employee_id, count in counts.items():
+                share = count / len(query_trigrams)
+                employee_name, normalized = self._employees[employee_id]
+                if share >= self.fuzzy_threshold and query not in normalized:
+                    matches.append((-share, employee_name, employee_id))
+            matches.sort()
+            if matches:
+                self.stats["suggestions"] += 1
+            return [[i, n] for _, n, i in matches[:limit]]
+
+    def record_fallback(self):
+        """Count a search sent to Odoo instead"""
+        with self._lock:
+            self.stats["fallbacks"] += 1
+
+    def snapshot(self):
+        """
+        Get the directory size, freshness and counters
+
+        Returns:
+            dict: Employees, indexed words and trigrams, sync age, counters
+        """
+        with self._lock:
+            return {
+                "employees": len(self._employees),
+                "trigrams": len(self._trigrams),
+                "synced_seconds_ago": (
+                    round(time.monotonic() - self._synced_at, 1)
+                    if self._synced_at is not None
+                    else None
+                ),
+                "high_water": self._high_water,
+                **self.stats,
+            }
@@ -0,0 +1,254 @@
+"""
+Compiler of search domains: normalization, memoization and validation
+"""
+
+import ast
+import copy
+import json
+from functools import lru_cache
+
+# Comparison operators accepted by Odoo in a domain condition
+OPERATORS = frozenset(
+    {
+        "=",
+        "!=",
+        "<>",
+        ">",
+        ">=",
+        "<",
+        "<=",
+        "=?",
+        "=like",
+        "=ilike",
+        "like",
+        "not like",
+        "ilike",
+        "not ilike",
+        "in",
+        "not in",
+        "child_of",
+        "parent_of",
+        "any",
+        "not any",
+    }
+)
+
+# Prefix operators and the number of operands they take
+LOGICAL_OPERATORS = {"&": 2, "|": 2, "!": 1}
+
+RELATIONAL_TYPES = frozenset({"many2one", "one2many", "many2many"})
+
+# Operators that only make sense on relational fields
+RELATIONAL_OPERATORS = frozenset({"child_of", "parent_of", "any", "not any"})
+
+# Constant conditions used by Odoo itself: (1, '=', 1) and (0, '=', 1)
+CONSTANT_LEAVES = ([1, "=", 1], [0, "=", 1])
+
+
+class DomainError(ValueError):
+    """Raised when a domain cannot be understood or does not match the model"""
+
+
+def _parse_string(text):
+    """Parse a domain given as a JSON or Python literal string"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError) as e:
+        raise DomainError(f"Domain is neither JSON nor a Python literal: {e}")
+
+
+def _from_conditions(conditions):
+    """Convert the {"conditions": [...]} object format to a domain"""
+    if not isinstance(conditions, list):
+        raise DomainError("'conditions' must be a list")
+    domain = []
+    for condition in conditions:
+        if not isinstance(condition, dict) or not all(
+            key in condition for key in ("field", "operator", "value")
+        ):
+            raise DomainError(
+                f"Invalid condition {condition!r}: expected an object with "
+                "field, operator and value"
+            )
+        domain.append([condition["field"], condition["operator"], condition["value"]])
+    return domain
+
+
+def _is_leaf(term):
+    """Whether a term looks like a [field, operator, value] condition"""
+    return (
+        isinstance(term, (list, tuple)) and len(term) == 3 and isinstance(term[1], str)
+    )
+
+
+def _normalize(domain):
+    """Turn any accepted input shape into a list of terms"""
+    if domain is None:
+        return []
+    if isinstance(domain, str):
+        domain = _parse_string(domain)
+    if isinstance(domain, dict):
+        if "conditions" not in domain:
+            raise DomainError("Domain object must have a 'conditions' list")
+        return _from_conditions(domain["conditions"])
+    if not isinstance(domain, (list, tuple)):
+        raise DomainError(f"Domain must be a list, got {type(domain).__name__}")
+
+    domain = list(domain)
+    # [[domain]] -> [domain]
+    if len(domain) == 1 and isinstance(domain[0], (list, tuple)):
+        inner = domain[0]
+        if (
+            not inner
+            or isinstance(inner[0], (list, tuple))
+            or (isinstance(inner[0], str) and inner[0] in LOGICAL_OPERATORS)
+        ):
+            domain = list(inner)
+    # A single condition [field, operator, value]
+    if _is_leaf(domain) and not isinstance(domain[0], (list, tuple)):
+        if domain[0] not in LOGICAL_OPERATORS:
+            domain = [domain]
+    return domain
+
+
+def _check_terms(domain):
+    """
+    Validate the structure of a normalized domain
+
+    Returns:
+        list: The terms, with conditions as lists and lowercase operators
+    """
+    terms = []
+    for term in domain:
+        if isinstance(term, str):
+            if term not in LOGICAL_OPERATORS:
+                raise DomainError(f"Unknown domain operator {term!r}")
+            terms.append(term)
+            continue
+        if not _is_leaf(term):
+            raise DomainError(
+                f"Invalid domain condition {term!r}: expected [field, operator, value]"
+            )
+        field, operator, value = term
+        operator = operator.lower()
+        if list(term) in CONSTANT_LEAVES:
+            terms.append(list(term))
+            continue
+        if not isinstance(field, str) or not field:
+            raise DomainError(f"Invalid field name {field!r} in {term!r}")
+        if operator not in OPERATORS:
+            raise DomainError(f"Unknown operator {term[1]!r} in {term!r}")
+        if isinstance(value, tuple):
+            value = list(value)
+        terms.append([field, operator, value])
+
+    # Prefix notation: every logical operator needs its operands, and
+    # consecutive top-level terms are implicitly combined with '&'
+    operands = 0
+    for term in reversed(terms):
+        if isinstance(term, str):
+            arity = LOGICAL_OPERATORS[term]
+            if operands < arity:
+                raise DomainError(f"Operator {term!r} is missing operands")
+            operands -= arity - 1
+        else:
+            operands += 1
+    if terms and operands < 1:
+        raise DomainError("Domain has no condition")
+    return terms
+
+
+@lru_cache(maxsize=1024)
+def _compile_key(kind, key):
+    """Compile a domain from its cache key (memoized)"""
+    domain = key if kind == "str" else json.loads(key)
+    return _check_terms(_normalize(domain))
+
+
+def compile_domain(domain):
+    """
+    Normalize a search domain
+
+    Accepts a list of conditions (or a single condition), an object with a
+    ``conditions`` list of {field, operator, value}, or a JSON / Python
+    literal string of either. Results are memoized by input.
+
+    Args:
+        domain: The domain in any accepted shape (None for no filter)
+
+    Returns:
+        list: The domain in Odoo's list format
+
+    Raises:
+        DomainError: If the domain or one of its conditions is invalid
+    """
+    if isinstance(domain, str):
+        kind, key = "str", domain.strip()
+    else:
+        try:
+            kind, key = "json", json.dumps(domain, sort_keys=True)
+        except (TypeError, ValueError):
+            # Not JSON serializable: compile without memoization
+            return _check_terms(_normalize(domain))
+    # Callers may modify the returned list
+    return copy.deepcopy(_compile_key(kind, key))
+
+
+def validate_domain(domain, fields_info):
+    """
+    Check the fields and operators of a compiled domain against a schema
+
+    Only the first segment of dotted paths (``partner_id.country_id``) is
+    checked, and it must be a relational field.
+
+    Args:
+        domain: Domain returned by compile_domain()
+        fields_info: Result of fields_get() for the model
+
+    Raises:
+        DomainError: Listing every invalid condition
+    """
+    errors = []
+    for term in domain:
+        if isinstance(term, str) or term in CONSTANT_LEAVES:
+            continue
+        field, operator, _ = term
+        name, _, path = field.partition(".")
+        info = fields_info.get(name)
+        if info is None:
+            errors.append(f"unknown field {name!r}")
+            continue
+        field_type = info.get("type")
+        if path and field_type not in RELATIONAL_TYPES:
+            errors.append(f"{name!r} is a {field_type} field, it has no {path!r}")
+        elif (
+            operator in RELATIONAL_OPERATORS
+            and not path
+            and field_type not in RELATIONAL_TYPES
+            and name != "id"
+        ):
+            errors.append(
+                f"operator {operator!r} needs a relational field, not {name!r}"
+            )
+    if errors:
+        raise DomainError("Invalid domain: " + "; ".join(errors))
+
+
+def compiler_stats():
+    """
+    Get memoization counters of compile_domain()
+
+    Returns:
+        dict: Hits, misses and size of the compiled domain cache
+    """
+    info = _compile_key.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+    }
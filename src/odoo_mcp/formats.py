@@ -0,0 +1,126 @@
+"""
+Output formats of tool and resource responses
+"""
+
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional dependency, see the "fast" extra
+    orjson = None
+
+FORMATS = ("json", "compact", "columnar")
+
+
+def get_format(output_format=None):
+    """
+    Resolve the output format of a response
+
+    Args:
+        output_format: Format requested by the caller; falls back to
+            ODOO_OUTPUT_FORMAT, then 'json'
+
+    Returns:
+        str: One of FORMATS
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    name = (output_format or os.environ.get("ODOO_OUTPUT_FORMAT") or "json").lower()
+    if name not in FORMATS:
+        raise ValueError(
+            f"Unknown output format: {name}. Use one of: {', '.join(FORMATS)}"
+        )
+    return name
+
+
+def to_columnar(value):
+    """
+    Replace lists of records by ``{"columns": [...], "rows": [[...]]}``
+
+    Column names are listed once instead of in every row. Records missing a
+    column get null in that cell. Dictionaries are converted recursively, so
+    ``{"success": true, "result": [...]}`` keeps its envelope.
+
+    Args:
+        value: Any JSON-serializable value
+
+    Returns:
+        The value with every list of dictionaries in columnar layout
+    """
+    if isinstance(value, dict):
+        return {key: to_columnar(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(r, dict) for r in value):
+        columns = list(value[0])
+        known = set(columns)
+        for record in value:
+            for key in record:
+                if key not in known:
+                    known.add(key)
+                    columns.append(key)
+        return {
+            "columns": columns,
+            "rows": [[record.get(column) for column in columns] for record in value],
+        }
+    return value
+
+
+def _pretty_json(data):
+    """Indented JSON, the historical output of the resources"""
+    return json.dumps(data, indent=2)
+
+
+def _compact_json(data):
+    """JSON without whitespace, through orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # Integers beyond 64 bits and other values orjson rejects
+            pass
+    return json.dumps(data, default=str, separators=(",", ":"), ensure_ascii=False)
+
+
+def _columnar_json(data):
+    """Compact JSON with lists of records in columnar layout"""
+    return _compact_json(to_columnar(data))
+
+
+SERIALIZERS = {
+    "json": _pretty_json,
+    "compact": _compact_json,
+    "columnar": _columnar_json,
+}
+
+
+def get_serializer(output_format=None):
+    """
+    Get the function serializing responses in a format
+
+    The same function is returned for a format on every call, so it can be
+    used as a cache key (see ModelCatalog.render()).
+
+    Args:
+        output_format: Format name (None for the configured default)
+
+    Returns:
+        Callable turning a JSON-serializable value into a string
+    """
+    return SERIALIZERS[get_format(output_format)]
+
+
+def dumps(data, output_format=None):
+    """
+    Serialize a response
+
+    Args:
+        data: JSON-serializable value
+        output_format: Format name (None for the configured default)
+
+    Returns:
+        str: The serialized response
+    """
+    return get_serializer(output_format)(data)
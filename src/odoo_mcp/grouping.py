@@ -0,0 +1,150 @@
+"""
+Group-by and aggregate specifications of read_group calls
+"""
+
+# Date granularities accepted after a colon in a group-by ('date:month')
+GRANULARITIES = ("hour", "day", "week", "month", "quarter", "year")
+
+DATE_TYPES = frozenset({"date", "datetime"})
+
+# Aggregate functions accepted after a colon in an aggregate ('amount:sum')
+AGGREGATE_FUNCTIONS = frozenset(
+    {
+        "array_agg",
+        "avg",
+        "bool_and",
+        "bool_or",
+        "count",
+        "count_distinct",
+        "max",
+        "min",
+        "sum",
+    }
+)
+
+# Keys of read_group rows that only matter to the web client
+GROUP_CONTEXT_KEYS = ("__context", "__fold")
+
+
+def _split(spec, kind):
+    """Split 'name:suffix' into (name, suffix or None)"""
+    if not isinstance(spec, str) or not spec.strip():
+        raise ValueError(f"Invalid {kind} {spec!r}: expected a field name")
+    name, _, suffix = spec.strip().partition(":")
+    return name.strip(), suffix.strip().lower() or None
+
+
+def parse_groupby(groupby):
+    """
+    Normalize group-by specifications
+
+    Args:
+        groupby: A field name or a list of them, each optionally followed
+            by a date granularity ('partner_id', 'date:month')
+
+    Returns:
+        list: Specifications as 'field' or 'field:granularity'
+
+    Raises:
+        ValueError: If a specification is malformed
+    """
+    if isinstance(groupby, str):
+        groupby = [groupby]
+    if not groupby:
+        raise ValueError("At least one group-by field is required")
+    specs = []
+    for spec in groupby:
+        name, granularity = _split(spec, "group-by")
+        if granularity is not None and granularity not in GRANULARITIES:
+            raise ValueError(
+                f"Unknown granularity {granularity!r} in {spec!r}. "
+                f"Use one of: {', '.join(GRANULARITIES)}"
+            )
+        specs.append(f"{name}:{granularity}" if granularity else name)
+    return specs
+
+
+def parse_aggregates(aggregates):
+    """
+    Normalize aggregate specifications
+
+    Args:
+        aggregates: Field names optionally followed by a function
+            ('amount_total:sum'); a bare name uses the field's default
+            aggregator. None or [] only counts records.
+
+    Returns:
+        list: Specifications as 'field' or 'field:function'
+
+    Raises:
+        ValueError: If a specification is malformed
+    """
+    if isinstance(aggregates, str):
+        aggregates = [aggregates]
+    specs = []
+    for spec in aggregates or []:
+        name, function = _split(spec, "aggregate")
+        if function is not None and function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(
+                f"Unknown aggregate function {function!r} in {spec!r}. "
+                f"Use one of: {', '.join(sorted(AGGREGATE_FUNCTIONS))}"
+            )
+        specs.append(f"{name}:{function}" if function else name)
+    return specs
+
+
+def validate_grouping(groupby, aggregates, fields_info):
+    """
+    Check parsed group-by and aggregate specifications against a schema
+
+    Args:
+        groupby: Result of parse_groupby()
+        aggregates: Result of parse_aggregates()
+        fields_info: Result of fields_get() for the model
+
+    Raises:
+        ValueError: Listing every invalid specification
+    """
+    errors = []
+    for spec in groupby:
+        name, _, granularity = spec.partition(":")
+        info = fields_info.get(name)
+        if info is None:
+            errors.append(f"unknown group-by field {name!r}")
+        elif granularity and info.get("type") not in DATE_TYPES:
+            errors.append(
+                f"{name!r} is a {info.get('type')} field, it has no {granularity!r}"
+            )
+        elif not info.get("store", True):
+            errors.append(f"cannot group by non-stored field {name!r}")
+    for spec in aggregates:
+        name, _, function = spec.partition(":")
+        info = fields_info.get(name)
+        if info is None:
+            errors.append(f"unknown aggregate field {name!r}")
+        elif not info.get("store", True):
+            errors.append(f"cannot aggregate non-stored field {name!r}")
+    if errors:
+        raise ValueError("Invalid aggregation: " + "; ".join(errors))
+
+
+def read_group_fields(groupby, aggregates):
+    """
+    Build the ``fields`` argument of read_group
+
+    The group-by fields are always listed: an empty list would make older
+    Odoo versions aggregate every stored field.
+
+    Args:
+        groupby: Result of parse_groupby()
+        aggregates: Result of parse_aggregates()
+
+    Returns:
+        list: Field specifications, without duplicates
+    """
+    fields = list(aggregates)
+    for spec in groupby:
+        name = spec.partition(":")[0]
+        if name not in fields:
+            fields.append(name)
+    return fields
@@ -0,0 +1,315 @@
+"""
+Long-running HTTP serving mode (MCP over SSE)
+
+One process serves many MCP clients: every session shares the registry's
+authenticated Odoo clients, connection pools and caches, instead of each
+agent spawning a stdio server with its own.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import anyio
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from .log import configure_logging, is_configured
+from .metrics import get_metrics
+from .registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+# Header naming the client in the accounting, else its address is used
+CLIENT_HEADER = b"x-client-id"
+
+
+def client_id(scope):
+    """
+    Identify the client of an HTTP request
+
+    Args:
+        scope: ASGI connection scope
+
+    Returns:
+        str: The X-Client-Id header, else the client address
+    """
+    for name, value in scope.get("headers") or ():
+        if name == CLIENT_HEADER and value:
+            return value.decode("latin-1")[:128]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class ClientAccounting:
+    """Sessions, messages and bytes of every HTTP client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = {}
+        self.started_at = time.time()
+
+    def _entry(self, client):
+        """Get the counters of a client (lock held)"""
+        entry = self._clients.get(client)
+        if entry is None:
+            entry = self._clients[client] = {
+                "active_sessions": 0,
+                "sessions": 0,
+                "rejected_sessions": 0,
+                "messages": 0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "session_seconds": 0.0,
+                "last_seen": None,
+            }
+        entry["last_seen"] = round(time.time(), 3)
+        return entry
+
+    def active_sessions(self, client=None):
+        """Number of open sessions, of one client or overall"""
+        with self._lock:
+            if client is not None:
+                entry = self._clients.get(client)
+                return entry["active_sessions"] if entry else 0
+            return sum(e["active_sessions"] for e in self._clients.values())
+
+    def session_started(self, client):
+        with self._lock:
+            entry = self._entry(client)
+            entry["active_sessions"] += 1
+            entry["sessions"] += 1
+
+    def session_ended(self, client, seconds):
+        with self._lock:
+            entry = self._entry(client)
+            entry["active_sessions"] -= 1
+            entry["session_seconds"] += seconds
+
+    def session_rejected(self, client):
+        with self._lock:
+            self._entry(client)["rejected_sessions"] += 1
+
+    def count(self, client, bytes_in=0, bytes_out=0, messages=0):
+        with self._lock:
+            entry = self._entry(client)
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            entry["messages"] += messages
+
+    def snapshot(self):
+        """
+        Get the counters of every client
+
+        Returns:
+            dict: Uptime, open sessions and per-client counters
+        """
+        with self._lock:
+            clients = {
+                client: dict(entry, session_seconds=round(entry["session_seconds"], 3))
+                for client, entry in self._clients.items()
+            }
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "active_sessions": sum(e["active_sessions"] for e in clients.values()),
+            "clients": clients,
+        }
+
+
+class SessionLimitMiddleware:
+    """
+    ASGI middleware bounding the open SSE sessions and accounting traffic
+
+    A new SSE stream beyond ``max_sessions`` overall, or beyond
+    ``max_sessions_per_client`` for its client, is refused with 503.
+    Message posts and stream bytes are counted per client.
+    """
+
+    def __init__(
+        self,
+        app,
+        accounting,
+        sse_path="/sse",
+        message_path="/messages/",
+        max_sessions=100,
+        max_sessions_per_client=0,
+    ):
+        self.app = app
+        self.accounting = accounting
+        self.sse_path = sse_path
+        self.message_path = message_path
+        self.max_sessions = max_sessions
+        self.max_sessions_per_client = max_sessions_per_client
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        client = client_id(scope)
+        path = scope["path"]
+        if path == self.sse_path:
+            return await self._session(client, scope, receive, send)
+        if path.startswith(self.message_path):
+            return await self._message(client, scope, receive, send)
+        return await self.app(scope, receive, send)
+
+    def _refusal(self, client):
+        """Reason to refuse a new session of a client, None to accept it"""
+        if self.max_sessions and self.accounting.active_sessions() >= self.max_sessions:
+            return "Too many open sessions"
+        if (
+            self.max_sessions_per_client
+            and self.accounting.active_sessions(client) >= self.max_sessions_per_client
+        ):
+            return "Too many open sessions for this client"
+        return None
+
+    async def _session(self, client, scope, receive, send):
+        reason = self._refusal(client)
+        if reason is not None:
+            self.accounting.session_rejected(client)
+            logger.warning("Refused SSE session of %s: %s", client, reason)
+            response = PlainTextResponse(
+                reason, status_code=503, headers={"Retry-After": "5"}
+            )
+            return await response(scope, receive, send)
+
+        async def counting_send(message):
+            if message["type"] == "http.response.body":
+                self.accounting.count(client, bytes_out=len(message.get("body", b"")))
+            await send(message)
+
+        async def watching_receive():
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                # The MCP session would otherwise wait for input forever
+                cancel_scope.cancel()
+            return message
+
+        self.accounting.session_started(client)
+        start = time.monotonic()
+        logger.info("SSE session opened by %s", client)
+        try:
+            with anyio.CancelScope() as cancel_scope:
+                await self.app(scope, watching_receive, counting_send)
+        finally:
+            self.accounting.session_ended(client, time.monotonic() - start)
+            logger.info("SSE session of %s closed", client)
+
+    async def _message(self, client, scope, receive, send):
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                self.accounting.count(client, bytes_in=len(message.get("body", b"")))
+            return message
+
+        self.accounting.count(client, messages=1)
+        await self.app(scope, counting_receive, send)
+
+
+def create_app(
+    server=None, max_sessions=100, max_sessions_per_client=0, accounting=None
+):
+    """
+    Build the ASGI application of the HTTP mode
+
+    Besides the MCP SSE endpoints (``/sse`` and ``/messages/``), it serves
+    Prometheus metrics on ``/metrics`` and a JSON status on ``/status``.
+    The registry is held open for the lifetime of the application, so the
+    Odoo clients survive between sessions.
+
+    Args:
+        server: FastMCP server (defaults to the odoo_mcp server)
+        max_sessions: Maximum number of open SSE sessions (0: no limit)
+        max_sessions_per_client: Maximum number of open sessions of one
+            client (0: no limit)
+        accounting: ClientAccounting collecting per-client counters
+
+    Returns:
+        The ASGI application
+    """
+    if server is None:
+        from .server import mcp as server
+    accounting = accounting if accounting is not None else ClientAccounting()
+    registry = get_registry()
+
+    async def metrics_endpoint(request):
+        return PlainTextResponse(
+            get_metrics().render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    async def status_endpoint(request):
+        return JSONResponse(
+            {"http": accounting.snapshot(), "registry": registry.stats()}
+        )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        if not is_configured():
+            configure_logging()
+        registry.open()
+        try:
+            yield
+        finally:
+            logger.info("Shutting down, closing the Odoo connections")
+            await registry.aclose()
+
+    sse = server.sse_app()
+    app = Starlette(
+        debug=server.settings.debug,
+        routes=[
+            Route("/metrics", endpoint=metrics_endpoint),
+            Route("/status", endpoint=status_endpoint),
+            *sse.routes,
+        ],
+        lifespan=lifespan,
+    )
+    app.state.accounting = accounting
+    return SessionLimitMiddleware(
+        app,
+        accounting,
+        sse_path=server.settings.sse_path,
+        message_path=server.settings.message_path,
+        max_sessions=max_sessions,
+        max_sessions_per_client=max_sessions_per_client,
+    )
+
+
+def serve(host=None, port=None):
+    """
+    Run the HTTP mode until interrupted
+
+    Settings left to None are read from the environment. On SIGINT or
+    SIGTERM new connections are refused, open sessions get
+    ODOO_HTTP_SHUTDOWN_TIMEOUT seconds to finish, then the Odoo connections
+    are closed and the schema cache saved.
+
+    Args:
+        host: Listening address (ODOO_HTTP_HOST, default 127.0.0.1)
+        port: Listening port (ODOO_HTTP_PORT, default 8000)
+    """
+    host = host or os.environ.get("ODOO_HTTP_HOST", "127.0.0.1")
+    port = int(port or os.environ.get("ODOO_HTTP_PORT", "8000"))
+    app = create_app(
+        max_sessions=int(os.environ.get("ODOO_HTTP_MAX_SESSIONS", "100")),
+        max_sessions_per_client=int(
+            os.environ.get("ODOO_HTTP_MAX_SESSIONS_PER_CLIENT", "0")
+        ),
+    )
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        # Per-client accounting replaces access logs, which go to stdout
+        access_log=False,
+        timeout_graceful_shutdown=float(
+            os.environ.get("ODOO_HTTP_SHUTDOWN_TIMEOUT", "10")
+        ),
+        log_level="warning",
+    )
+    logger.info("Serving MCP over SSE on http://%s:%s/sse", host, port)
+    uvicorn.Server(config).run()
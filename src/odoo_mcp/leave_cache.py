@@ -0,0 +1,333 @@
+"""
+Date-range cache of the leave calendar (hr.leave.report.calendar)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+# Model read by search_holidays, and the models whose changes it reflects
+LEAVE_MODEL = "hr.leave.report.calendar"
+LEAVE_MODELS = frozenset({LEAVE_MODEL, "hr.leave", "hr.leave.type"})
+
+# Fields read from the calendar, those of the search_holidays results
+LEAVE_FIELDS = (
+    "display_name",
+    "start_datetime",
+    "stop_datetime",
+    "employee_id",
+    "name",
+    "state",
+)
+
+# Odoo datetime format, whose strings sort like the datetimes they encode
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SECOND = timedelta(seconds=1)
+
+# Scope of the windows fetched for every employee at once
+ALL_EMPLOYEES = None
+
+
+def parse_datetime(value):
+    """Parse an Odoo datetime string"""
+    return datetime.strptime(value, DATETIME_FORMAT)
+
+
+def format_datetime(value):
+    """Format a datetime as Odoo does"""
+    return value.strftime(DATETIME_FORMAT)
+
+
+def subtract_intervals(low, high, intervals):
+    """
+    Get the parts of [low, high] not covered by intervals
+
+    Args:
+        low: Start of the window (datetime, inclusive)
+        high: End of the window (datetime, inclusive)
+        intervals: (low, high) pairs sorted by low, may overlap
+
+    Returns:
+        list: Uncovered (low, high) pairs, in order
+    """
+    gaps = []
+    cursor = low
+    for start, stop in intervals:
+        if stop < cursor:
+            continue
+        if start > high:
+            break
+        if start > cursor:
+            gaps.append((cursor, start - _SECOND))
+        cursor = max(cursor, stop + _SECOND)
+        if cursor > high:
+            return gaps
+    if cursor <= high:
+        gaps.append((cursor, high))
+    return gaps
+
+
+def _overlaps(row, low, high):
+    """Whether a leave row overlaps the [low, high] datetime strings"""
+    return row["start_datetime"] <= high and row["stop_datetime"] >= low
+
+
+def _employee(row):
+    """Employee id of a leave row, None if it has none"""
+    employee = row.get("employee_id")
+    return employee[0] if employee else None
+
+
+class _Scope:
+    """Windows fetched for one employee (or all of them) and their leaves"""
+
+    __slots__ = ("intervals", "rows")
+
+    def __init__(self):
+        # (low, high, fetched_at), sorted and disjoint
+        self.intervals = []
+        # Leave id to row
+        self.rows = {}
+
+    def expire(self, deadline):
+        """Forget the windows fetched before deadline and their leaves"""
+        kept = [i for i in self.intervals if i[2] >= deadline]
+        if len(kept) == len(self.intervals):
+            return
+        self.intervals = kept
+        if not kept:
+            self.rows.clear()
+            return
+        bounds = [
+            (format_datetime(low), format_datetime(high)) for low, high, _ in kept
+        ]
+        self.rows = {
+            key: row
+            for key, row in self.rows.items()
+            if any(_overlaps(row, low, high) for low, high in bounds)
+        }
+
+    def add(self, low, high, fetched_at):
+        """Mark [low, high] as fetched, merging touching windows"""
+        merged_low, merged_high, merged_at = low, high, fetched_at
+        kept = []
+        for start, stop, at in self.intervals:
+            if stop + _SECOND < merged_low or start - _SECOND > merged_high:
+                kept.append((start, stop, at))
+            else:
+                # The merged window is as old as its oldest part
+                merged_low = min(merged_low, start)
+                merged_high = max(merged_high, stop)
+                merged_at = min(merged_at, at)
+        kept.append((merged_low, merged_high, merged_at))
+        kept.sort()
+        self.intervals = kept
+
+
+class LeaveCalendarCache:
+    """
+    Leaves of the calendar, indexed by employee and date range
+
+    Every employee (and the "all employees" scope) keeps the windows already
+    fetched and the leaves overlapping them. A requested window is split
+    into the parts already covered, answered from memory, and the gaps,
+    the only ranges sent to Odoo. A window fetched for all employees also
+    covers every single employee, and every fetch refreshes its range in
+    all the scopes holding it, so the newest fetch always wins.
+
+    Windows expire after ``ttl`` seconds. Any change to the leave models
+    (hr.leave, hr.leave.type) empties the cache.
+    """
+
+    def __init__(self, ttl=300.0, max_employees=2000):
+        """
+        Initialize an empty cache
+
+        Args:
+            ttl: Seconds a fetched window stays valid
+            max_employees: Maximum number of employees kept, the least
+                recently used are dropped first
+        """
+        self.ttl = float(ttl)
+        self.max_employees = max(int(max_employees), 1)
+        self._scopes = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.stats = {
+            "hits": 0,
+            "partial_hits": 0,
+            "misses": 0,
+            "gaps_fetched": 0,
+            "invalidations": 0,
+        }
+
+    def _scope(self, employee_id, create=False):
+        """Get the scope of an employee (lock held)"""
+        scope = self._scopes.get(employee_id)
+        if scope is None and create:
+            scope = self._scopes[employee_id] = _Scope()
+            while len(self._scopes) > self.max_employees:
+                self._scopes.popitem(last=False)
+        if scope is not None:
+            self._scopes.move_to_end(employee_id)
+            scope.expire(time.monotonic() - self.ttl)
+        return scope
+
+    def _coverage(self, employee_id):
+        """Windows known for an employee, including the all-employee ones"""
+        intervals = []
+        for key in {employee_id, ALL_EMPLOYEES}:
+            scope = self._scope(key)
+            if scope is not None:
+                intervals.extend((low, high) for low, high, _ in scope.intervals)
+        intervals.sort()
+        return intervals
+
+    def plan(self, low, high, employee_ids=None):
+        """
+        Split a window into the ranges missing from the cache
+
+        Employees missing the same range share one fetch.
+
+        Args:
+            low: Start of the window (datetime, inclusive)
+            high: End of the window (datetime, inclusive)
+            employee_ids: Employee ids, None for all employees
+
+        Returns:
+            tuple: (list of (low, high, employee ids or None) ranges to
+            fetch, generation to pass to store())
+        """
+        keys = [ALL_EMPLOYEES] if employee_ids is None else list(employee_ids)
+        missing = OrderedDict()
+        with self._lock:
+            uncovered = 0
+            for key in keys:
+                gaps = subtract_intervals(low, high, self._coverage(key))
+                if gaps == [(low, high)]:
+                    uncovered += 1
+                for gap in gaps:
+                    missing.setdefault(gap, []).append(key)
+            if not missing:
+                self.stats["hits"] += 1
+            elif uncovered == len(keys):
+                self.stats["misses"] += 1
+            else:
+                self.stats["partial_hits"] += 1
+            self.stats["gaps_fetched"] += len(missing)
+            generation = self._generation
+        ranges = [
+            (gap_low, gap_high, None if employee_ids is None else ids)
+            for (gap_low, gap_high), ids in missing.items()
+        ]
+        return ranges, generation
+
+    def store(self, low, high, employee_ids, rows, generation):
+        """
+        Record the leaves fetched for a range
+
+        Leaves cached in the range but no longer returned by Odoo are
+        dropped. Nothing is stored if the cache was invalidated since
+        plan().
+
+        Args:
+            low: Start of the range (datetime, inclusive)
+            high: End of the range (datetime, inclusive)
+            employee_ids: Employee ids the range was fetched for, None for
+                all employees
+            rows: Leave rows overlapping the range
+            generation: Value returned by plan()
+        """
+        keys = [ALL_EMPLOYEES] if employee_ids is None else list(employee_ids)
+        fetched = None if employee_ids is None else set(employee_ids)
+        low_text, high_text = format_datetime(low), format_datetime(high)
+        by_employee = {}
+        for row in rows:
+            by_employee.setdefault(_employee(row), []).append(row)
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return
+            for key in keys:
+                self._scope(key, create=True).add(low, high, now)
+            # The fetch replaces its range in every scope holding it, the
+            # all-employee one included: a lookup reading both scopes then
+            # always gets the rows of the newest fetch
+            for key, scope in self._scopes.items():
+                if key is ALL_EMPLOYEES:
+                    fresh = rows
+                elif fetched is None or key in fetched:
+                    fresh = by_employee.get(key, ())
+                else:
+                    continue
+                scope.rows = {
+                    row_id: row
+                    for row_id, row in scope.rows.items()
+                    if not (
+                        _overlaps(row, low_text, high_text)
+                        and (fetched is None or _employee(row) in fetched)
+                    )
+                }
+                for row in fresh:
+                    scope.rows[row["id"]] = row
+
+    def lookup(self, low, high, employee_ids=None):
+        """
+        Get the cached leaves overlapping a window
+
+        Args:
+            low: Start of the window (datetime, inclusive)
+            high: End of the window (datetime, inclusive)
+            employee_ids: Employee ids, None for all employees
+
+        Returns:
+            list: Copies of the leave rows, sorted by start, then id
+        """
+        low_text, high_text = format_datetime(low), format_datetime(high)
+        wanted = None if employee_ids is None else set(employee_ids)
+        found = {}
+        with self._lock:
+            keys = [ALL_EMPLOYEES] + ([] if wanted is None else sorted(wanted))
+            for key in keys:
+                scope = self._scopes.get(key)
+                if scope is None:
+                    continue
+                for row_id, row in scope.rows.items():
+                    if (wanted is None or _employee(row) in wanted) and _overlaps(
+                        row, low_text, high_text
+                    ):
+                        found[row_id] = dict(row)
+        return sorted(found.values(), key=lambda r: (r["start_datetime"], r["id"]))
+
+    def invalidate(self, model=None):
+        """
+        Empty the cache after a change to a leave model
+
+        Args:
+            model: Model changed, the cache is kept for unrelated models
+                (None: always empty it)
+        """
+        if model is not None and model not in LEAVE_MODELS:
+            return
+        with self._lock:
+            self._scopes.clear()
+            self._generation += 1
+            self.stats["invalidations"] += 1
+
+    def snapshot(self):
+        """
+        Get the cache size and counters
+
+        Returns:
+            dict: Employees, windows and leaves cached, hit counters
+        """
+        with self._lock:
+            return {
+                "employees": sum(1 for key in self._scopes if key is not None),
+                "windows": sum(len(s.intervals) for s in self._scopes.values()),
+                "leaves": sum(len(s.rows) for s in self._scopes.values()),
+                "ttl": self.ttl,
+                **self.stats,
+            }
@@ -0,0 +1,319 @@
+"""
+Concurrency limit of the calls sent to Odoo, with priorities and AIMD
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, served in this order when calls are queued
+PRIORITIES = ("high", "normal", "low")
+
+# Default class of the methods that are not normal: cheap lookups go first,
+# exports (possibly millions of cells) last
+METHOD_PRIORITIES = {
+    "check_access_rights": "high",
+    "check_access_rule": "high",
+    "default_get": "high",
+    "fields_get": "high",
+    "fields_view_get": "high",
+    "get_views": "high",
+    "name_get": "high",
+    "name_search": "high",
+    "search_count": "high",
+    "export_data": "low",
+}
+
+
+def parse_priorities(value):
+    """
+    Parse per-method priorities from ``method=class`` pairs
+
+    Args:
+        value: Comma separated pairs, e.g. 'read_group=low,search=high'
+
+    Returns:
+        dict: Method name to priority class
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown class
+    """
+    priorities = {}
+    for pair in (value or "").split(","):
+        if not pair.strip():
+            continue
+        method, sep, priority = pair.partition("=")
+        priority = priority.strip().lower()
+        if not sep or priority not in PRIORITIES:
+            raise ValueError(
+                f"Invalid method priority '{pair}', expected method="
+                + "|".join(PRIORITIES)
+            )
+        priorities[method.strip()] = priority
+    return priorities
+
+
+def _on_event_loop():
+    """Whether the current thread runs an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _Waiter:
+    """A call queued for a slot, woken from any thread"""
+
+    __slots__ = ("event", "future", "granted", "abandoned")
+
+    def __init__(self, future=None):
+        self.event = None if future is not None else threading.Event()
+        self.future = future
+        self.granted = False
+        self.abandoned = False
+
+    def wake(self):
+        if self.future is None:
+            self.event.set()
+        else:
+            self.future.get_loop().call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """
+    Bound the number of Odoo calls in flight
+
+    Calls over the limit wait in a queue served by priority class, then in
+    arrival order, so cheap lookups do not wait behind large exports. Sync
+    (threads) and async (tasks) callers share the same slots.
+
+    With ``adaptive``, the limit follows an AIMD rule: it grows by one after
+    a full window of calls completed within ``latency_target``, and halves
+    (at most once per ``latency_target``) when a call is slower or fails
+    because Odoo is unreachable or overloaded.
+    """
+
+    def __init__(
+        self,
+        max_concurrency=10,
+        adaptive=False,
+        min_concurrency=1,
+        latency_target=2.0,
+        priorities=None,
+        metrics=None,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            max_concurrency: Maximum number of calls in flight
+            adaptive: Adjust the limit between min_concurrency and
+                max_concurrency from the observed latency and errors
+            min_concurrency: Lowest limit reached by adaptation
+            latency_target: Seconds above which a call counts as a sign of
+                overload
+            priorities: Dictionary of method name to priority class,
+                overriding METHOD_PRIORITIES
+            metrics: Metrics recording the time spent waiting for a slot
+        """
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.min_concurrency = min(max(int(min_concurrency), 1), self.max_concurrency)
+        self.adaptive = adaptive
+        self.latency_target = float(latency_target)
+        self.priorities = dict(METHOD_PRIORITIES, **(priorities or {}))
+        self.metrics = metrics
+
+        self.limit = self.max_concurrency
+        self._active = 0
+        self._queue = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        # AIMD state: successes since the last increase, last decrease time
+        self._window = 0
+        self._decreased_at = 0.0
+
+        self.stats = {
+            "calls": 0,
+            "queued": 0,
+            "max_queue": 0,
+            "increases": 0,
+            "decreases": 0,
+            "loop_overruns": 0,
+        }
+
+    def priority(self, method):
+        """Get the priority class of a method"""
+        return self.priorities.get(method, "normal")
+
+    def _try_acquire(self, method, waiter):
+        """Take a free slot or queue the waiter (lock held)"""
+        self.stats["calls"] += 1
+        if self._active < self.limit and not self._queue:
+            self._active += 1
+            return True
+        rank = PRIORITIES.index(self.priority(method))
+        heapq.heappush(self._queue, (rank, next(self._order), waiter))
+        self.stats["queued"] += 1
+        self.stats["max_queue"] = max(self.stats["max_queue"], len(self._queue))
+        return False
+
+    def _grant(self):
+        """Hand free slots to the first waiters (lock held)"""
+        while self._queue and self._active < self.limit:
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.abandoned:
+                continue
+            waiter.granted = True
+            self._active += 1
+            waiter.wake()
+
+    def _release(self, seconds, overloaded):
+        """Free a slot and adapt the limit to the call outcome"""
+        with self._lock:
+            self._active -= 1
+            if self.adaptive:
+                self._adapt(seconds, overloaded)
+            self._grant()
+
+    def _adapt(self, seconds, overloaded):
+        """Additive increase, multiplicative decrease (lock held)"""
+        now = time.monotonic()
+        if overloaded or seconds > self.latency_target:
+            self._window = 0
+            if (
+                self.limit > self.min_concurrency
+                and now - self._decreased_at >= self.latency_target
+            ):
+                self.limit = max(self.min_concurrency, self.limit // 2)
+                self._decreased_at = now
+                self.stats["decreases"] += 1
+                logger.info("Odoo looks overloaded, concurrency limit %d", self.limit)
+            return
+        self._window += 1
+        if self._window >= self.limit and self.limit < self.max_concurrency:
+            self.limit += 1
+            self._window = 0
+            self.stats["increases"] += 1
+
+    def _record_wait(self, method, start, abandoned=False):
+        if self.metrics is not None:
+            self.metrics.observe(
+                "queue",
+                (self.priority(method),),
+                time.perf_counter() - start,
+                error=abandoned,
+            )
+
+    @contextlib.contextmanager
+    def slot(self, method, is_overload=None):
+        """
+        Hold a slot for the duration of the with block (threads)
+
+        A sync call made on an event loop thread never waits: the async
+        calls holding the slots could only release them on that loop. When
+        no slot is free it runs over the limit (counted as a loop overrun).
+
+        Args:
+            method: Odoo method called, selects the priority class
+            is_overload: Callable telling whether an exception raised in
+                the block means Odoo is unreachable or overloaded
+        """
+        start = time.perf_counter()
+        waiter = _Waiter()
+        with self._lock:
+            acquired = self._try_acquire(method, waiter)
+        if not acquired and _on_event_loop():
+            with self._lock:
+                waiter.abandoned = True
+                acquired = waiter.granted
+                if not acquired:
+                    self.stats["loop_overruns"] += 1
+            if not acquired:
+                logger.warning(
+                    "Sync Odoo call %s on the event loop thread, running it over "
+                    "the concurrency limit instead of blocking the loop",
+                    method,
+                )
+                yield
+                return
+        if not acquired:
+            waiter.event.wait()
+        self._record_wait(method, start)
+        start = time.perf_counter()
+        overloaded = False
+        try:
+            yield
+        except BaseException as e:
+            overloaded = bool(is_overload and is_overload(e))
+            raise
+        finally:
+            self._release(time.perf_counter() - start, overloaded)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, method, is_overload=None):
+        """
+        Hold a slot for the duration of the async with block (tasks)
+
+        Args:
+            method: Odoo method called, selects the priority class
+            is_overload: Callable telling whether an exception raised in
+                the block means Odoo is unreachable or overloaded
+        """
+        start = time.perf_counter()
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        with self._lock:
+            acquired = self._try_acquire(method, waiter)
+        if not acquired:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    waiter.abandoned = True
+                    granted = waiter.granted
+                if granted:
+                    # The slot arrived with the cancellation: pass it on
+                    self._release(0.0, False)
+                self._record_wait(method, start, abandoned=True)
+                raise
+        self._record_wait(method, start)
+        start = time.perf_counter()
+        overloaded = False
+        try:
+            yield
+        except BaseException as e:
+            overloaded = bool(is_overload and is_overload(e))
+            raise
+        finally:
+            self._release(time.perf_counter() - start, overloaded)
+
+    def snapshot(self):
+        """
+        Get the limiter state and counters
+
+        Returns:
+            dict: Current limit, calls in flight and queued, counters
+        """
+        with self._lock:
+            waiting = {name: 0 for name in PRIORITIES}
+            for rank, _, waiter in self._queue:
+                if not waiter.abandoned:
+                    waiting[PRIORITIES[rank]] += 1
+            return {
+                "limit": self.limit,
+                "max_concurrency": self.max_concurrency,
+                "adaptive": self.adaptive,
+                "in_flight": self._active,
+                "waiting": waiting,
+                **self.stats,
+            }
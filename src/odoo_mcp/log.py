@@ -0,0 +1,132 @@
+"""
+Logging of the odoo_mcp package: levels, sampling and JSON output
+
+Every module logs through ``logging.getLogger(__name__)``. Records go to
+stderr only, stdout carries the MCP stdio stream.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+LOGGER_NAME = "odoo_mcp"
+
+# Attributes of every LogRecord, anything else was passed with extra=
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "asctime", "taskName"}
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Libraries logging every HTTP request at INFO (the async client transport),
+# only their warnings are kept
+_QUIET_LOGGERS = ("httpx", "httpcore")
+
+_configure_lock = threading.Lock()
+_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through one DEBUG record out of ``every`` per message template
+
+    Hot paths (one message per RPC call) stay visible at DEBUG level
+    without paying for every line. Records above DEBUG are never dropped.
+    """
+
+    def __init__(self, every=1):
+        super().__init__()
+        self.every = max(1, int(every))
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.every == 1 or record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._seen.get(key, 0)
+            self._seen[key] = count + 1
+        if count % self.every:
+            return False
+        if count:
+            record.sampled = self.every
+        return True
+
+
+def configure_logging(level=None, json_output=None, sample_every=None, stream=None):
+    """
+    Attach a stderr handler to the package logger
+
+    Calling it again replaces the previous handler, so the settings of the
+    last call win. Arguments left to None are read from the environment.
+    The HTTP libraries used by the async client log through the same
+    handler, warnings only.
+
+    Args:
+        level: Level name or number (ODOO_LOG_LEVEL, default INFO)
+        json_output: Emit JSON lines instead of text (ODOO_LOG_FORMAT=json)
+        sample_every: Keep one DEBUG record out of N per message
+            (ODOO_LOG_SAMPLE_EVERY, default 1: keep all)
+        stream: Destination stream (default sys.stderr)
+
+    Returns:
+        logging.Logger: The package logger
+    """
+    global _handler
+    if level is None:
+        level = os.environ.get("ODOO_LOG_LEVEL", "INFO")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    if json_output is None:
+        json_output = os.environ.get("ODOO_LOG_FORMAT", "text").lower() == "json"
+    if sample_every is None:
+        sample_every = int(os.environ.get("ODOO_LOG_SAMPLE_EVERY", "1"))
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if json_output else logging.Formatter(_TEXT_FORMAT)
+    )
+    handler.addFilter(SamplingFilter(sample_every))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    with _configure_lock:
+        for name in (LOGGER_NAME,) + _QUIET_LOGGERS:
+            target = logging.getLogger(name)
+            if _handler is not None:
+                target.removeHandler(_handler)
+            target.addHandler(handler)
+            target.setLevel(level if name == LOGGER_NAME else logging.WARNING)
+            # The root logger may write to stdout (basicConfig in a host app)
+            target.propagate = False
+        _handler = handler
+    return logger
+
+
+def is_configured():
+    """Whether configure_logging() already ran"""
+    return _handler is not None
@@ -0,0 +1,490 @@
+"""
+Latency histograms, payload sizes and error counts of Odoo calls, MCP tools
+and resources
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pydantic_core
+
+from .settings import env_flag
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Kind of measured call -> (label names, Prometheus metric prefix, help text)
+KINDS = {
+    "rpc": (("model", "method"), "odoo_mcp_rpc", "Odoo execute_kw calls"),
+    "tool": (("name",), "odoo_mcp_tool", "MCP tool calls"),
+    "resource": (("name",), "odoo_mcp_resource", "MCP resource reads"),
+    "queue": (
+        ("priority",),
+        "odoo_mcp_queue",
+        "waits for an Odoo concurrency slot",
+    ),
+}
+
+# Body bytes (sent, received) of the HTTP exchanges of the call being measured
+_traffic = contextvars.ContextVar("odoo_mcp_traffic", default=None)
+
+# Serialized responses reporting a failure: {"success": false, ...} or
+# {"error": "...", ...}, indented or not
+_ERROR_RESPONSE = re.compile(r'\{\s*"(?:success"\s*:\s*false|error"\s*:\s*(?!null))')
+
+
+def count_traffic(sent, received):
+    """
+    Add the body bytes of an HTTP exchange to the call being measured
+
+    Called by the transports; does nothing outside Metrics.measure_call().
+
+    Args:
+        sent: Request body bytes
+        received: Response body bytes, as received (compressed or not)
+    """
+    counter = _traffic.get()
+    if counter is not None:
+        counter[0] += sent
+        counter[1] += received
+
+
+def payload_bytes(value, encode=True):
+    """
+    Approximate size in bytes of a tool or resource payload
+
+    Args:
+        value: Arguments or result of a tool or resource
+        encode: Serialize values that are not already text to measure them
+            (0 is returned for them otherwise)
+
+    Returns:
+        int: Size of the payload
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if not encode:
+        return 0
+    try:
+        return len(pydantic_core.to_json(value, fallback=str))
+    except Exception:
+        return 0
+
+
+def is_error_response(value):
+    """Whether a tool or resource result reports a failure"""
+    if isinstance(value, str):
+        return _ERROR_RESPONSE.match(value[:64]) is not None
+    if isinstance(value, dict):
+        return value.get("success") is False or value.get("error") is not None
+    return getattr(value, "success", None) is False
+
+
+class _Series:
+    """Counters of one kind and label set"""
+
+    __slots__ = (
+        "count",
+        "errors",
+        "seconds",
+        "max_seconds",
+        "buckets",
+        "sent",
+        "received",
+    )
+
+    def __init__(self, bucket_count):
+        """Initialize zero counters for bucket_count latency buckets"""
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        # One counter per bucket, plus +Inf
+        self.buckets = [0] * (bucket_count + 1)
+        self.sent = 0
+        self.received = 0
+
+
+def _quantile(bounds, buckets, count, fraction):
+    """Estimate a quantile from histogram buckets (linear within a bucket)"""
+    if not count:
+        return None
+    rank = fraction * count
+    seen = 0
+    lower = 0.0
+    for bound, bucket in zip(bounds, buckets):
+        if bucket and seen + bucket >= rank:
+            return lower + (bound - lower) * (rank - seen) / bucket
+        seen += bucket
+        lower = bound
+    # In the +Inf bucket: the best estimate is the largest bound
+    return bounds[-1]
+
+
+def _escape(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """
+    Thread-safe registry of call metrics
+
+    Every series is identified by a kind ('rpc', 'tool' or 'resource') and
+    its labels (model and method for Odoo calls, name for tools and
+    resources) and keeps a latency histogram, the number of calls and
+    errors, and the bytes sent and received.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, payload_sizes=None):
+        """
+        Initialize empty metrics
+
+        Args:
+            buckets: Sorted upper bounds of the latency buckets, in seconds
+            payload_sizes: Serialize the arguments and results of tools and
+                resources that are not already text to count their bytes,
+                which costs a second encoding (ODOO_METRICS_PAYLOAD_SIZES,
+                off by default)
+        """
+        if payload_sizes is None:
+            payload_sizes = env_flag("ODOO_METRICS_PAYLOAD_SIZES", "0")
+        self.payload_sizes = payload_sizes
+        self.buckets = tuple(buckets)
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._series = {kind: {} for kind in KINDS}
+
+    def observe(self, kind, labels, seconds, sent=0, received=0, error=False):
+        """
+        Record one call
+
+        Args:
+            kind: 'rpc', 'tool', 'resource' or 'queue'
+            labels: Tuple of label values, see KINDS
+            seconds: Duration of the call
+            sent: Bytes sent (request)
+            received: Bytes received (response)
+            error: Whether the call failed
+        """
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = position
+                break
+        with self._lock:
+            series = self._series[kind].get(labels)
+            if series is None:
+                series = self._series[kind][labels] = _Series(len(self.buckets))
+            series.count += 1
+            series.errors += bool(error)
+            series.seconds += seconds
+            series.max_seconds = max(series.max_seconds, seconds)
+            series.buckets[index] += 1
+            series.sent += sent
+            series.received += received
+
+    @contextlib.contextmanager
+    def measure_call(self, model, method):
+        """
+        Measure an Odoo call made inside the with block
+
+        The transports report the bytes they send and receive with
+        count_traffic(); an exception marks the call as failed.
+
+        Args:
+            model: Model name
+            method: Method name
+        """
+        counter = [0, 0]
+        token = _traffic.set(counter)
+        error = False
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            _traffic.reset(token)
+            self.observe(
+                "rpc",
+                (model, method),
+                time.perf_counter() - start,
+                counter[0],
+                counter[1],
+                error,
+            )
+
+    def reset(self):
+        """Drop every series"""
+        with self._lock:
+            self._series = {kind: {} for kind in KINDS}
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """
+        Get every series with its latency percentiles
+
+        Returns:
+            dict: Uptime plus one list of series per kind, slowest total first
+        """
+        with self._lock:
+            series = {
+                kind: [(labels, _copy(item)) for labels, item in entries.items()]
+                for kind, entries in self._series.items()
+            }
+
+        result = {"uptime_seconds": round(time.time() - self.started_at, 1)}
+        for kind, entries in series.items():
+            names = KINDS[kind][0]
+            rows = []
+            for labels, item in sorted(entries, key=lambda e: -e[1].seconds):
+                row = dict(zip(names, labels))
+                row.update(
+                    count=item.count,
+                    errors=item.errors,
+                    total_seconds=round(item.seconds, 6),
+                    mean_ms=round(item.seconds / item.count * 1000, 3),
+                    max_ms=round(item.max_seconds * 1000, 3),
+                    bytes_sent=item.sent,
+                    bytes_received=item.received,
+                )
+                for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                    value = _quantile(self.buckets, item.buckets, item.count, fraction)
+                    # Never beyond the slowest call actually seen
+                    value = min(value, item.max_seconds)
+                    row[f"{label}_ms"] = round(value * 1000, 3)
+                row["histogram"] = dict(
+                    zip([str(b) for b in self.buckets] + ["+Inf"], item.buckets)
+                )
+                rows.append(row)
+            result[kind] = rows
+        return result
+
+    def render_prometheus(self):
+        """
+        Render the metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Histograms of durations and counters of errors and bytes
+        """
+        with self._lock:
+            series = {
+                kind: [(labels, _copy(item)) for labels, item in entries.items()]
+                for kind, entries in self._series.items()
+            }
+
+        lines = []
+        for kind, entries in series.items():
+            names, prefix, description = KINDS[kind]
+            counters = (
+                ("errors_total", "errors", f"Failed {description}"),
+                ("request_bytes_total", "sent", f"Request bytes of {description}"),
+                (
+                    "response_bytes_total",
+                    "received",
+                    f"Response bytes of {description}",
+                ),
+            )
+            lines += [
+                f"# HELP {prefix}_duration_seconds Duration of {description}",
+                f"# TYPE {prefix}_duration_seconds histogram",
+            ]
+            for labels, item in entries:
+                base = ",".join(
+                    f'{name}="{_escape(value)}"' for name, value in zip(names, labels)
+                )
+                cumulative = 0
+                bounds = [repr(float(b)) for b in self.buckets] + ["+Inf"]
+                for bound, bucket in zip(bounds, item.buckets):
+                    cumulative += bucket
+                    lines.append(
+                        f'{prefix}_duration_seconds_bucket{{{base},le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f"{prefix}_duration_seconds_sum{{{base}}} {item.seconds}")
+                lines.append(f"{prefix}_duration_seconds_count{{{base}}} {item.count}")
+            for suffix, attribute, help_text in counters:
+                lines += [
+                    f"# HELP {prefix}_{suffix} {help_text}",
+                    f"# TYPE {prefix}_{suffix} counter",
+                ]
+                for labels, item in entries:
+                    base = ",".join(
+                        f'{name}="{_escape(value)}"'
+                        for name, value in zip(names, labels)
+                    )
+                    lines.append(
+                        f"{prefix}_{suffix}{{{base}}} {getattr(item, attribute)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def _copy(series):
+    """Copy a series so it can be read without the lock"""
+    copy = _Series(len(series.buckets) - 1)
+    for attribute in _Series.__slots__:
+        value = getattr(series, attribute)
+        setattr(copy, attribute, list(value) if isinstance(value, list) else value)
+    return copy
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """
+    Get the process-wide metrics
+
+    Returns:
+        Metrics: The metrics shared by the clients, tools and resources
+    """
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = Metrics()
+    return _metrics
+
+
+def instrument(kind, name=None):
+    """
+    Decorator recording the duration, payload sizes and errors of a tool or
+    resource function
+
+    Results reporting a failure ({"success": false} or {"error": ...}) count
+    as errors, like raised exceptions. Payloads already encoded as text are
+    measured as they are; others only with Metrics.payload_sizes. Works on
+    sync and async functions and keeps their signature, so FastMCP sees the
+    original parameters.
+
+    Args:
+        kind: 'tool' or 'resource'
+        name: Label of the series (defaults to the function name)
+    """
+
+    def decorate(func):
+        label = (name or func.__name__,)
+
+        def record(start, arguments, result, error):
+            metrics = get_metrics()
+            sent = 0
+            if metrics.payload_sizes:
+                sent = payload_bytes({k: v for k, v in arguments.items() if k != "ctx"})
+            metrics.observe(
+                kind,
+                label,
+                time.perf_counter() - start,
+                sent,
+                payload_bytes(result, encode=metrics.payload_sizes),
+                error or is_error_response(result),
+            )
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                result, error = None, True
+                try:
+                    result = await func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    record(start, kwargs, result, error)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                result, error = None, True
+                try:
+                    result = func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    record(start, kwargs, result, error)
+
+        return wrapper
+
+    return decorate
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve GET /metrics in the Prometheus text format"""
+
+    def do_GET(self):
+        """Answer a scrape"""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_metrics().render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Scrapes are not logged"""
+
+
+_metrics_server = None
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """
+    Serve /metrics for Prometheus from a background thread (once per process)
+
+    Args:
+        port: TCP port to listen on
+        host: Address to listen on
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    global _metrics_server
+    with _metrics_lock:
+        if _metrics_server is None:
+            server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(
+                target=server.serve_forever, name="odoo-metrics", daemon=True
+            ).start()
+            _metrics_server = server
+            logger.info(
+                "Serving Prometheus metrics on http://%s:%s/metrics", host, port
+            )
+        return _metrics_server
+
+
+def start_metrics_server_from_env():
+    """
+    Start the Prometheus endpoint when ODOO_METRICS_PORT is set
+
+    ODOO_METRICS_HOST selects the address (default 127.0.0.1).
+
+    Returns:
+        ThreadingHTTPServer or None if the endpoint is disabled
+    """
+    port = os.environ.get("ODOO_METRICS_PORT")
+    if not port:
+        return None
+    return start_metrics_server(
+        int(port), os.environ.get("ODOO_METRICS_HOST", "127.0.0.1")
+    )
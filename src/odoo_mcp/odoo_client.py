@@ -2,309 +2,379 @@
 Odoo XML-RPC client for MCP server integration
 """
 
+import contextlib
+import gzip
 import json
+import logging
 import os
-import re
 import socket
+import threading
+import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
 import http.client
 import xmlrpc.client
 
+from .backends import get_backend_class, multicall_payload
+from .catalog import ModelCatalog
+from .client_base import (
+    CALL,
+    MULTICALL,
+    PARALLEL,
+    SUPPORTS_MULTICALL,
+    BaseOdooClient,
+    is_session_error,
+)
+from .coalesce import CallCoalescer
+from .directory import EmployeeDirectory
+from .leave_cache import LeaveCalendarCache
+from .limiter import ConcurrencyLimiter, parse_priorities
+from .metrics import count_traffic, get_metrics
+from .pool import ConnectionPool
+from .resilience import CircuitBreaker
+from .result_cache import ResultCache, parse_model_ttls
+from .schema_cache import SchemaCache
+from .settings import env_flag, flag
+
+logger = logging.getLogger(__name__)
+
+
+class OdooClient(BaseOdooClient):
+    """
+    Client for interacting with Odoo via XML-RPC or JSON-RPC
 
-class OdooClient:
-    """Client for interacting with Odoo via XML-RPC"""
+    Sends the requests of the shared operations (see BaseOdooClient) from
+    the calling thread, over a pool of keep-alive connections.
+    """
 
-    def __init__(
-        self,
-        url,
-        db,
-        username,
-        password,
-        timeout=10,
-        verify_ssl=True,
-    ):
+    def __init__(self, *args, **kwargs):
         """
-        Initialize the Odoo client with connection parameters
+        Initialize the Odoo client and authenticate
 
-        Args:
-            url: Odoo server URL (with or without protocol)
-            db: Database name
-            username: Login username
-            password: Login password
-            timeout: Connection timeout in seconds
-            verify_ssl: Whether to verify SSL certificates
+        Takes the arguments of BaseOdooClient.__init__().
         """
-        # Ensure URL has a protocol
-        if not re.match(r"^https?://", url):
-            url = f"http://{url}"
-
-        # Remove trailing slash from URL if present
-        url = url.rstrip("/")
-
-        self.url = url
-        self.db = db
-        self.username = username
-        self.password = password
-        self.uid = None
-
-        # Set timeout and SSL verification
-        self.timeout = timeout
-        self.verify_ssl = verify_ssl
+        super().__init__(*args, **kwargs)
+        self._auth_lock = threading.Lock()
 
         # Setup connections
-        self._common = None
-        self._models = None
+        self._transport = None
+        self._backend = None
 
-        # Parse hostname for logging
-        parsed_url = urllib.parse.urlparse(self.url)
-        self.hostname = parsed_url.netloc
+        # Worker threads for concurrent calls, sized like the connection pool
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
         # Connect
         self._connect()
 
     def _connect(self):
-        """Initialize the XML-RPC connection and authenticate"""
+        """Initialize the RPC connection and authenticate"""
         # Tạo transport với timeout phù hợp
         is_https = self.url.startswith("https://")
         transport = RedirectTransport(
-            timeout=self.timeout, use_https=is_https, verify_ssl=self.verify_ssl
+            timeout=self.timeout,
+            use_https=is_https,
+            verify_ssl=self.verify_ssl,
+            pool_size=self.pool_size,
+            pool_idle_timeout=self.pool_idle_timeout,
+            pool_timeout=self.pool_timeout,
         )
-
-        print(f"Connecting to Odoo at: {self.url}", file=os.sys.stderr)
-        print(f"  Hostname: {self.hostname}", file=os.sys.stderr)
-        print(
-            f"  Timeout: {self.timeout}s, Verify SSL: {self.verify_ssl}",
-            file=os.sys.stderr,
+        self._transport = transport
+
+        logger.info(
+            "Connecting to Odoo at %s (timeout %ss, verify SSL %s, protocol %s)",
+            self.url,
+            self.timeout,
+            self.verify_ssl,
+            self.protocol,
+            extra={"hostname": self.hostname},
         )
 
         # Thiết lập endpoints
-        self._common = xmlrpc.client.ServerProxy(
-            f"{self.url}/xmlrpc/2/common", transport=transport
-        )
-        self._models = xmlrpc.client.ServerProxy(
-            f"{self.url}/xmlrpc/2/object", transport=transport
-        )
+        self._backend = get_backend_class(self.protocol)(self.url, transport)
 
         # Xác thực và lấy user ID
-        print(
-            f"Authenticating with database: {self.db}, username: {self.username}",
-            file=os.sys.stderr,
+        self._authenticate()
+
+    def _authenticate(self):
+        """Authenticate against the common endpoint and store the user ID"""
+        logger.info(
+            "Authenticating with database: %s, username: %s", self.db, self.username
         )
         try:
-            print(
-                f"Making request to {self.hostname}/xmlrpc/2/common (attempt 1)",
-                file=os.sys.stderr,
-            )
-            self.uid = self._common.authenticate(
-                self.db, self.username, self.password, {}
+            self.auth_count += 1
+            self.uid = self._backend.call(
+                "common", "authenticate", self.db, self.username, self.password, {}
             )
             if not self.uid:
                 raise ValueError("Authentication failed: Invalid username or password")
         except (socket.error, socket.timeout, ConnectionError, TimeoutError) as e:
-            print(f"Connection error: {str(e)}", file=os.sys.stderr)
+            logger.error("Connection error: %s", e)
             raise ConnectionError(f"Failed to connect to Odoo server: {str(e)}")
         except Exception as e:
-            print(f"Authentication error: {str(e)}", file=os.sys.stderr)
+            logger.error("Authentication error: %s", e)
             raise ValueError(f"Failed to authenticate with Odoo: {str(e)}")
 
-    def _execute(self, model, method, *args, **kwargs):
-        """Execute a method on an Odoo model"""
-        return self._models.execute_kw(
-            self.db, self.uid, self.password, model, method, args, kwargs
+    def close(self):
+        """Close the pooled connections to the Odoo server"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._transport is not None:
+            self._transport.close()
+        self.schema_cache.save()
+
+    def _get_executor(self):
+        """Get the worker pool used for concurrent calls"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.pool_size, thread_name_prefix="odoo-rpc"
+                    )
+        return self._executor
+
+    def _call_kw(self, model, method, args, kwargs):
+        """Send one execute_kw call through the configured backend"""
+        return self._backend.call(
+            "object",
+            "execute_kw",
+            self.db,
+            self.uid,
+            self.password,
+            model,
+            method,
+            args,
+            kwargs,
         )
 
-    def execute_method(self, model, method, *args, **kwargs):
+    def release(self):
         """
-        Execute an arbitrary method on a model
+        Close the connections once the operations in flight complete
 
-        Args:
-            model: The model name (e.g., 'res.partner')
-            method: Method name to execute
-            *args: Positional arguments to pass to the method
-            **kwargs: Keyword arguments to pass to the method
-
-        Returns:
-            Result of the method execution
+        A released client stays usable: a late call reconnects, and its
+        connections are closed again when it completes.
         """
-        return self._execute(model, method, *args, **kwargs)
-
-    def get_models(self):
+        if self._release():
+            self._close_idle()
+
+    def _close_idle(self):
+        """Close the workers and connections of a released, idle client"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._transport is not None:
+            self._transport.clear()
+        self.schema_cache.save()
+
+    def _run(self, plan):
+        """Run a plan of BaseOdooClient as one operation in flight"""
+        self._begin()
+        try:
+            return self._drive(plan)
+        finally:
+            if self._end():
+                self._close_idle()
+
+    def _drive(self, plan):
+        """Run a plan of BaseOdooClient, sending its requests from this thread"""
+        result, error = None, None
+        while True:
+            try:
+                if error is None:
+                    request = plan.send(result)
+                else:
+                    request = plan.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            result, error = None, None
+            try:
+                result = self._dispatch(request)
+            except Exception as e:
+                error = e
+
+    def _dispatch(self, request):
+        """Send one request yielded by a plan"""
+        kind = request[0]
+        if kind == CALL:
+            return self._execute(*request[1:])
+        if kind == PARALLEL:
+            plans = request[1]
+            if len(plans) <= 1:
+                return [self._drive(plan) for plan in plans]
+            return list(self._get_executor().map(self._drive, plans))
+        if kind == MULTICALL:
+            return self._multicall(request[1])
+        if kind == SUPPORTS_MULTICALL:
+            return self.supports_multicall()
+        raise ValueError(f"Unknown request {kind!r}")
+
+    def _execute(self, model, method, args, kwargs):
         """
-        Get a list of all available models in the system
-
-        Returns:
-            List of model names
+        Send a call to Odoo
 
-        Examples:
-            >>> client = OdooClient(url, db, username, password)
-            >>> models = client.get_models()
-            >>> print(len(models))
-            125
-            >>> print(models[:5])
-            ['res.partner', 'res.users', 'res.company', 'res.groups', 'ir.model']
+        With a coalescer, concurrent identical read-only calls share one
+        request.
         """
-        try:
-            # First search for model IDs
-            model_ids = self._execute("ir.model", "search", [])
-
-            if not model_ids:
-                return {
-                    "model_names": [],
-                    "models_details": {},
-                    "error": "No models found",
-                }
-
-            # Then read the model data with only the most basic fields
-            # that are guaranteed to exist in all Odoo versions
-            result = self._execute("ir.model", "read", model_ids, ["model", "name"])
-
-            # Extract and sort model names alphabetically
-            models = sorted([rec["model"] for rec in result])
-
-            # For more detailed information, include the full records
-            models_info = {
-                "model_names": models,
-                "models_details": {
-                    rec["model"]: {"name": rec.get("name", "")} for rec in result
-                },
-            }
-
-            return models_info
-        except Exception as e:
-            print(f"Error retrieving models: {str(e)}", file=os.sys.stderr)
-            return {"model_names": [], "models_details": {}, "error": str(e)}
-
-    def get_model_info(self, model_name):
+        key = self._coalesce_key(model, method, args, kwargs)
+        if key is None:
+            return self._send(model, method, args, kwargs)
+        return self.coalescer.run(key, lambda: self._send(model, method, args, kwargs))
+
+    def _slot(self, method):
+        """Hold a concurrency slot for a call, if calls are limited"""
+        if self.limiter is None:
+            return contextlib.nullcontext()
+        return self.limiter.slot(method, self.retry_policy.is_transient)
+
+    def _send(self, model, method, args, kwargs):
         """
-        Get information about a specific model
-
-        Args:
-            model_name: Name of the model (e.g., 'res.partner')
+        Send one call to Odoo
 
-        Returns:
-            Dictionary with model information
-
-        Examples:
-            >>> client = OdooClient(url, db, username, password)
-            >>> info = client.get_model_info('res.partner')
-            >>> print(info['name'])
-            'Contact'
+        Read-only methods failing with a transient error are retried with
+        jittered backoff, and calls fail fast while the circuit is open.
         """
-        try:
-            result = self._execute(
-                "ir.model",
-                "search_read",
-                [("model", "=", model_name)],
-                {"fields": ["name", "model"]},
-            )
-
-            if not result:
-                return {"error": f"Model {model_name} not found"}
-
-            return result[0]
-        except Exception as e:
-            print(f"Error retrieving model info: {str(e)}", file=os.sys.stderr)
-            return {"error": str(e)}
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            try:
+                with self._slot(method), self.metrics.measure_call(model, method):
+                    result = self._execute_kw(model, method, args, kwargs)
+            except Exception as e:
+                delay = self._retry_delay(model, method, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.circuit_breaker.record_success()
+            return result
 
-    def get_model_fields(self, model_name):
+    def _execute_kw(self, model, method, args, kwargs):
+        """Send an execute_kw call, re-authenticating once if needed"""
+        auth_count = self.auth_count
+        try:
+            return self._call_kw(model, method, args, kwargs)
+        except xmlrpc.client.Fault as e:
+            if not is_session_error(e):
+                raise
+            # Odoo rejected the session (expired API key, password change,
+            # restored database...): authenticate again and retry once.
+            # Concurrent callers wait for the first one to re-authenticate.
+            with self._auth_lock:
+                if self.auth_count == auth_count:
+                    logger.warning(
+                        "Session rejected by Odoo, re-authenticating: %s",
+                        e.faultString,
+                    )
+                    self._authenticate()
+            return self._call_kw(model, method, args, kwargs)
+
+    def supports_multicall(self):
         """
-        Get field definitions for a specific model
+        Check (once) whether the server accepts system.multicall
 
-        Args:
-            model_name: Name of the model (e.g., 'res.partner')
+        Stock Odoo does not implement it, but XML-RPC gateways in front of
+        Odoo may. Only the XML-RPC backend can use it.
 
         Returns:
-            Dictionary mapping field names to their definitions
-
-        Examples:
-            >>> client = OdooClient(url, db, username, password)
-            >>> fields = client.get_model_fields('res.partner')
-            >>> print(fields['name']['type'])
-            'char'
+            bool: True if batches can be sent as a single multicall request
         """
-        try:
-            fields = self._execute(model_name, "fields_get")
-            return fields
-        except Exception as e:
-            print(f"Error retrieving fields: {str(e)}", file=os.sys.stderr)
-            return {"error": str(e)}
+        if self._multicall_supported is None:
+            supported = False
+            if self.protocol == "xmlrpc":
+                try:
+                    methods = self._backend.call("object", "system.listMethods")
+                    supported = "system.multicall" in methods
+                except Exception:
+                    supported = False
+            self._multicall_supported = supported
+        return self._multicall_supported
+
+    def _multicall(self, operations):
+        """Send operations in one system.multicall request"""
+        with self._slot("multicall"), self.metrics.measure_call("system", "multicall"):
+            return self._backend.call(
+                "object",
+                "system.multicall",
+                multicall_payload(self.db, self.uid, self.password, operations),
+            )
 
-    def search_read(
-        self, model_name, domain, fields=None, offset=None, limit=None, order=None
+    def iter_search_read(
+        self,
+        model_name,
+        domain,
+        fields=None,
+        batch_size=1000,
+        after_id=0,
+        include_binary=False,
     ):
         """
-        Search for records and read their data in a single call
+        Iterate over matching records in batches using keyset pagination
 
-        Args:
-            model_name: Name of the model (e.g., 'res.partner')
-            domain: Search domain (e.g., [('is_company', '=', True)])
-            fields: List of field names to return (None for all)
-            offset: Number of records to skip
-            limit: Maximum number of records to return
-            order: Sorting criteria (e.g., 'name ASC, id DESC')
-
-        Returns:
-            List of dictionaries with the matching records
-
-        Examples:
-            >>> client = OdooClient(url, db, username, password)
-            >>> records = client.search_read('res.partner', [('is_company', '=', True)], limit=5)
-            >>> print(len(records))
-            5
-        """
-        try:
-            kwargs = {}
-            if offset:
-                kwargs["offset"] = offset
-            if fields is not None:
-                kwargs["fields"] = fields
-            if limit is not None:
-                kwargs["limit"] = limit
-            if order is not None:
-                kwargs["order"] = order
-
-            result = self.execute_method(model_name, "search_read", *domain, **kwargs)
-            return result
-        except Exception as e:
-            print(f"Error in search_read: {str(e)}", file=os.sys.stderr)
-            return []
-
-    def read_records(self, model_name, ids, fields=None):
-        """
-        Read data of records by IDs
+        Each batch is fetched with ``id > last_id`` ordered by id, so every
+        page costs the same on the server no matter how deep the iteration
+        goes, and only one batch is held in memory at a time. Unlike
+        search_read(), errors are raised instead of ending the iteration.
 
         Args:
-            model_name: Name of the model (e.g., 'res.partner')
-            ids: List of record IDs to read
-            fields: List of field names to return (None for all)
+            model_name: Name of the model (e.g., 'account.move.line')
+            domain: Search domain (e.g., [('parent_state', '=', 'posted')])
+            fields: List of field names to return (None for the lean default
+                projection: stored scalar and many2one fields)
+            batch_size: Number of records per batch
+            after_id: Only return records with an ID greater than this
+            include_binary: Add binary fields to the default projection
 
-        Returns:
-            List of dictionaries with the requested records
+        Yields:
+            Lists of at most batch_size record dictionaries, in ID order
 
         Examples:
             >>> client = OdooClient(url, db, username, password)
-            >>> records = client.read_records('res.partner', [1])
-            >>> print(records[0]['name'])
-            'YourCompany'
+            >>> for batch in client.iter_search_read('account.move.line', [], ['debit']):
+            ...     process(batch)
         """
+        # The whole iteration is one operation in flight
+        self._begin()
         try:
-            kwargs = {}
-            if fields is not None:
-                kwargs["fields"] = fields
-
-            result = self._execute(model_name, "read", ids, kwargs)
-            return result
-        except Exception as e:
-            print(f"Error reading records: {str(e)}", file=os.sys.stderr)
-            return []
+            fields, fields_skipped = self._drive(
+                self._plan_default_fields(model_name, fields, include_binary)
+            )
+            last_id = after_id
+            while last_id is not None:
+                batch, last_id = self._drive(
+                    self._plan_keyset_page(
+                        model_name, domain, fields, fields_skipped, batch_size, last_id
+                    )
+                )
+                if batch:
+                    yield batch
+        finally:
+            if self._end():
+                self._close_idle()
 
 
 class RedirectTransport(xmlrpc.client.Transport):
-    """Transport that adds timeout, SSL verification, and redirect handling"""
+    """
+    Transport that adds timeout, SSL verification, redirect handling and a
+    pool of keep-alive connections
+
+    Every request borrows a persistent HTTP/1.1 connection from a bounded
+    per-host pool, so concurrent calls never share a socket and sequential
+    calls skip the TCP/TLS (or proxy tunnel) handshake.
+    """
 
     def __init__(
-        self, timeout=10, use_https=True, verify_ssl=True, max_redirects=5, proxy=None
+        self,
+        timeout=10,
+        use_https=True,
+        verify_ssl=True,
+        max_redirects=5,
+        proxy=None,
+        pool_size=10,
+        pool_idle_timeout=60,
+        pool_timeout=None,
     ):
         super().__init__()
         self.timeout = timeout
@@ -312,38 +382,165 @@ class RedirectTransport(xmlrpc.client.Transport):
         self.verify_ssl = verify_ssl
         self.max_redirects = max_redirects
         self.proxy = proxy or os.environ.get("HTTP_PROXY")
+        self.context = None
+        self.verbose = False
 
         if use_https and not verify_ssl:
             import ssl
 
             self.context = ssl._create_unverified_context()
 
-    def make_connection(self, host):
+        self._pool = ConnectionPool(
+            self._new_connection,
+            max_size=pool_size,
+            idle_timeout=pool_idle_timeout,
+            acquire_timeout=pool_timeout,
+        )
+        # Connection borrowed by the request running in the current thread
+        self._local = threading.local()
+
+    def _new_connection(self, host):
+        """Build a new (not yet connected) HTTP connection for a host"""
+        connection_class = (
+            http.client.HTTPSConnection
+            if self.use_https
+            else http.client.HTTPConnection
+        )
+        options = {"timeout": self.timeout}
+        if self.use_https and self.context is not None:
+            options["context"] = self.context
+
         if self.proxy:
             proxy_url = urllib.parse.urlparse(self.proxy)
-            connection = http.client.HTTPConnection(
-                proxy_url.hostname, proxy_url.port, timeout=self.timeout
-            )
+            connection = connection_class(proxy_url.hostname, proxy_url.port, **options)
             connection.set_tunnel(host)
         else:
-            if self.use_https and not self.verify_ssl:
-                connection = http.client.HTTPSConnection(
-                    host, timeout=self.timeout, context=self.context
-                )
-            else:
-                if self.use_https:
-                    connection = http.client.HTTPSConnection(host, timeout=self.timeout)
-                else:
-                    connection = http.client.HTTPConnection(host, timeout=self.timeout)
+            connection = connection_class(host, **options)
 
         return connection
 
+    def make_connection(self, host):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Called outside single_request(): hand out a private connection
+            connection = self._new_connection(host)
+        return connection
+
+    def single_request(self, host, handler, request_body, verbose=False):
+        """Send one request over a pooled keep-alive connection"""
+        connection = self._pool.acquire(host)
+        self._local.connection = connection
+        reusable = False
+        try:
+            self.send_request(host, handler, request_body, verbose)
+            response = connection.getresponse()
+            try:
+                if response.status == 200:
+                    count_traffic(
+                        len(request_body),
+                        int(response.getheader("Content-Length") or 0),
+                    )
+                    return self.parse_response(response)
+
+                # Drain the error body so the connection stays usable
+                response.read()
+                raise xmlrpc.client.ProtocolError(
+                    host + handler,
+                    response.status,
+                    response.reason,
+                    dict(response.getheaders()),
+                )
+            finally:
+                # Only a fully consumed response leaves the socket reusable;
+                # parse_response() reads the whole body even for a Fault
+                reusable = response.isclosed() and not response.will_close
+        finally:
+            self._local.connection = None
+            self._pool.release(host, connection, reusable)
+
+    def post(self, host, handler, body, content_type):
+        """
+        POST a raw request body over a pooled keep-alive connection
+
+        Used by the non XML-RPC backends. Redirects are followed and a request
+        on a keep-alive socket dropped by the server is retried once.
+
+        Args:
+            host: Host (with optional port) to send the request to
+            handler: Request path
+            body: Request body bytes
+            content_type: Content-Type of the body
+
+        Returns:
+            bytes: The (decompressed) response body
+        """
+        for _ in range(self.max_redirects):
+            status, reason, headers, data = self._post_once(
+                host, handler, body, content_type
+            )
+            location = headers.get("location")
+            if status in (301, 302, 303, 307, 308) and location:
+                parsed = urllib.parse.urlparse(location)
+                if parsed.netloc:
+                    host = parsed.netloc
+                handler = parsed.path
+                if parsed.query:
+                    handler += "?" + parsed.query
+                continue
+            if status != 200:
+                raise xmlrpc.client.ProtocolError(
+                    host + handler, status, reason, headers
+                )
+            return data
+
+        raise xmlrpc.client.ProtocolError(host + handler, 310, "Too many redirects", {})
+
+    def _post_once(self, host, handler, body, content_type):
+        """Send one POST request, retrying once on a stale keep-alive socket"""
+        headers = {
+            "Content-Type": content_type,
+            "Accept-Encoding": "gzip",
+            "User-Agent": self.user_agent,
+        }
+        for attempt in (0, 1):
+            connection = self._pool.acquire(host)
+            reusable = False
+            try:
+                connection.request("POST", handler, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+                reusable = not response.will_close
+                count_traffic(len(body), len(data))
+            except (ConnectionResetError, ConnectionAbortedError, BrokenPipeError):
+                if attempt:
+                    raise
+                continue
+            finally:
+                self._pool.release(host, connection, reusable)
+
+            if response.getheader("Content-Encoding", "") == "gzip":
+                data = gzip.decompress(data)
+            response_headers = {k.lower(): v for k, v in response.getheaders()}
+            return response.status, response.reason, response_headers, data
+
+    def close(self):
+        """Close all pooled connections"""
+        self._pool.close()
+
+    def clear(self):
+        """Close the idle pooled connections, keeping the transport usable"""
+        self._pool.clear()
+
+    def pool_stats(self):
+        """Get connection pool counters"""
+        return self._pool.snapshot()
+
     def request(self, host, handler, request_body, verbose):
         """Send HTTP request with retry for redirects"""
         redirects = 0
         while redirects < self.max_redirects:
             try:
-                print(f"Making request to {host}{handler}", file=os.sys.stderr)
+                logger.debug("Making request to %s%s", host, handler)
                 return super().request(host, handler, request_body, verbose)
             except xmlrpc.client.ProtocolError as err:
                 if err.errcode in (301, 302, 303, 307, 308) and err.headers.get(
@@ -360,7 +557,7 @@ class RedirectTransport(xmlrpc.client.Transport):
                 else:
                     raise
             except Exception as e:
-                print(f"Error during request: {str(e)}", file=os.sys.stderr)
+                logger.debug("Error during request to %s%s: %s", host, handler, e)
                 raise
 
         raise xmlrpc.client.ProtocolError(host + handler, 310, "Too many redirects", {})
@@ -404,34 +601,229 @@ def load_config():
     )
 
 
-def get_odoo_client():
+def load_targets():
     """
-    Get a configured Odoo client instance
+    Load the named Odoo targets
+
+    Targets come from the ODOO_TARGETS environment variable (a JSON object
+    of name to configuration), else from a "targets" object in the config
+    file. A single configuration, as returned by load_config(), becomes the
+    target named "default". ODOO_DEFAULT_TARGET, or "default_target" in the
+    config file, names the target used when a call does not select one.
 
     Returns:
-        OdooClient: A configured Odoo client instance
+        tuple: (dict of target name to configuration, default target name)
+
+    Raises:
+        ValueError: If a target misses a setting or the default is unknown
     """
-    config = load_config()
+    default = None
+    if os.environ.get("ODOO_TARGETS"):
+        targets = json.loads(os.environ["ODOO_TARGETS"])
+    else:
+        config = load_config()
+        if "targets" in config:
+            targets = config["targets"]
+            default = config.get("default_target")
+        else:
+            targets = {"default": config}
+
+    if not isinstance(targets, dict) or not targets:
+        raise ValueError("Odoo targets must be a non-empty object of name to config")
+    for name, target in targets.items():
+        missing = [
+            key for key in ("url", "db", "username", "password") if key not in target
+        ]
+        if missing:
+            raise ValueError(
+                f"Odoo target '{name}' misses settings: {', '.join(missing)}"
+            )
+        target.setdefault("name", name)
+
+    default = os.environ.get("ODOO_DEFAULT_TARGET") or default
+    if default is None:
+        default = "default" if "default" in targets else next(iter(targets))
+    if default not in targets:
+        raise ValueError(
+            f"Unknown default Odoo target '{default}', "
+            f"available: {', '.join(sorted(targets))}"
+        )
+    return targets, default
+
+
+def _option(config, key, variable, default):
+    """Get a setting of a target configuration, else from the environment"""
+    value = config.get(key)
+    if value is None:
+        value = os.environ.get(variable, default)
+    return value
+
+
+def odoo_client_options(config=None):
+    """
+    Build the settings and shared components of an Odoo client
+
+    Both client classes take them, so a synchronous and an asyncio client
+    built from the same options share their caches and limits.
+
+    Args:
+        config: Configuration dictionary as returned by load_config().
+            Loaded from the environment or config file when omitted. The
+            keys timeout, verify_ssl, pool_size, pool_idle_timeout,
+            pool_timeout, max_concurrency, read_batch_size and
+            schema_cache_path override the matching environment variables,
+            so every target can have its own pool and limits.
+
+    Returns:
+        dict: Keyword arguments of OdooClient and AsyncOdooClient
+    """
+    if config is None:
+        config = load_config()
 
     # Get additional options from environment variables
     timeout = int(
-        os.environ.get("ODOO_TIMEOUT", "30")
+        _option(config, "timeout", "ODOO_TIMEOUT", "30")
     )  # Increase default timeout to 30 seconds
-    verify_ssl = os.environ.get("ODOO_VERIFY_SSL", "1").lower() in ["1", "true", "yes"]
+    verify_ssl = flag(_option(config, "verify_ssl", "ODOO_VERIFY_SSL", "1"))
+
+    # Wire protocol: xmlrpc (default) or jsonrpc
+    protocol = os.environ.get("ODOO_PROTOCOL", config.get("protocol", "xmlrpc"))
+
+    # Model catalog refresh interval
+    model_catalog = ModelCatalog(
+        refresh_interval=float(os.environ.get("ODOO_MODEL_CATALOG_REFRESH", "300"))
+    )
+
+    # Schema cache for fields_get and ir.model lookups
+    schema_cache = SchemaCache(
+        max_entries=int(os.environ.get("ODOO_SCHEMA_CACHE_SIZE", "256")),
+        ttl=float(os.environ.get("ODOO_SCHEMA_CACHE_TTL", "3600")),
+        check_interval=float(os.environ.get("ODOO_SCHEMA_CHECK_INTERVAL", "60")),
+        path=_option(config, "schema_cache_path", "ODOO_SCHEMA_CACHE_PATH", None),
+    )
+
+    # Keep-alive connection pool limits
+    pool_size = int(_option(config, "pool_size", "ODOO_POOL_SIZE", "10"))
+    pool_idle_timeout = float(
+        _option(config, "pool_idle_timeout", "ODOO_POOL_IDLE_TIMEOUT", "60")
+    )
+    pool_timeout = _option(config, "pool_timeout", "ODOO_POOL_TIMEOUT", None)
+    pool_timeout = float(pool_timeout) if pool_timeout else None
+
+    # Chunking of large read_records() calls
+    read_batch_size = int(
+        _option(config, "read_batch_size", "ODOO_READ_BATCH_SIZE", "1000")
+    )
+    read_retries = int(os.environ.get("ODOO_READ_RETRIES", "2"))
+    retry_backoff = float(os.environ.get("ODOO_RETRY_BACKOFF", "0.1"))
+
+    # Bound on the calls in flight, optionally adapted to Odoo's latency
+    limiter = None
+    max_concurrency = int(
+        _option(config, "max_concurrency", "ODOO_MAX_CONCURRENCY", str(pool_size))
+    )
+    if max_concurrency > 0:
+        limiter = ConcurrencyLimiter(
+            max_concurrency=max_concurrency,
+            adaptive=env_flag("ODOO_ADAPTIVE_CONCURRENCY", "0"),
+            min_concurrency=int(os.environ.get("ODOO_MIN_CONCURRENCY", "1")),
+            latency_target=float(os.environ.get("ODOO_LATENCY_TARGET", "2")),
+            priorities=parse_priorities(os.environ.get("ODOO_METHOD_PRIORITIES")),
+            metrics=get_metrics(),
+        )
+
+    # Concurrent identical reads share one request
+    coalescer = None
+    if env_flag("ODOO_COALESCE", "1"):
+        coalescer = CallCoalescer()
+
+    # Fail fast after consecutive network failures, probe again later
+    circuit_breaker = CircuitBreaker(
+        failure_threshold=int(os.environ.get("ODOO_CIRCUIT_THRESHOLD", "5")),
+        reset_timeout=float(os.environ.get("ODOO_CIRCUIT_RESET", "30")),
+    )
+
+    # Lean default projection of reads without explicit fields
+    lean_projection = env_flag("ODOO_LEAN_PROJECTION", "1")
+
+    # Optional cache of search/read results
+    result_cache = None
+    if env_flag("ODOO_RESULT_CACHE", "0"):
+        result_cache = ResultCache(
+            max_entries=int(os.environ.get("ODOO_RESULT_CACHE_SIZE", "1024")),
+            max_bytes=float(os.environ.get("ODOO_RESULT_CACHE_MAX_MB", "64"))
+            * 1024
+            * 1024,
+            ttl=float(os.environ.get("ODOO_RESULT_CACHE_TTL", "60")),
+            model_ttls=parse_model_ttls(os.environ.get("ODOO_RESULT_CACHE_MODEL_TTLS")),
+        )
+
+    # Optional date-range cache of the leave calendar (search_holidays), off
+    # by default: leaves changed outside this process show up after its TTL
+    leave_cache = None
+    if env_flag("ODOO_LEAVE_CACHE", "0"):
+        leave_cache = LeaveCalendarCache(
+            ttl=float(os.environ.get("ODOO_LEAVE_CACHE_TTL", "300")),
+            max_employees=int(os.environ.get("ODOO_LEAVE_CACHE_EMPLOYEES", "2000")),
+        )
+
+    # Optional local index of the employee names (search_employee)
+    employee_directory = None
+    if env_flag("ODOO_EMPLOYEE_INDEX", "0"):
+        employee_directory = EmployeeDirectory(
+            refresh_interval=float(os.environ.get("ODOO_EMPLOYEE_INDEX_REFRESH", "60")),
+        )
 
     # Print detailed configuration
-    print("Odoo client configuration:", file=os.sys.stderr)
-    print(f"  URL: {config['url']}", file=os.sys.stderr)
-    print(f"  Database: {config['db']}", file=os.sys.stderr)
-    print(f"  Username: {config['username']}", file=os.sys.stderr)
-    print(f"  Timeout: {timeout}s", file=os.sys.stderr)
-    print(f"  Verify SSL: {verify_ssl}", file=os.sys.stderr)
-
-    return OdooClient(
+    logger.info(
+        "Odoo client configuration: target=%s url=%s db=%s username=%s "
+        "timeout=%ss verify_ssl=%s protocol=%s pool_size=%s result_cache=%s",
+        config.get("name", "default"),
+        config["url"],
+        config["db"],
+        config["username"],
+        timeout,
+        verify_ssl,
+        protocol,
+        pool_size,
+        result_cache is not None,
+    )
+
+    return dict(
         url=config["url"],
         db=config["db"],
         username=config["username"],
         password=config["password"],
         timeout=timeout,
         verify_ssl=verify_ssl,
+        pool_size=pool_size,
+        pool_idle_timeout=pool_idle_timeout,
+        pool_timeout=pool_timeout,
+        protocol=protocol,
+        schema_cache=schema_cache,
+        model_catalog=model_catalog,
+        read_batch_size=read_batch_size,
+        read_retries=read_retries,
+        retry_backoff=retry_backoff,
+        lean_projection=lean_projection,
+        result_cache=result_cache,
+        metrics=get_metrics(),
+        circuit_breaker=circuit_breaker,
+        coalescer=coalescer,
+        limiter=limiter,
+        leave_cache=leave_cache,
+        employee_directory=employee_directory,
     )
+
+
+def get_odoo_client(config=None):
+    """
+    Get a configured Odoo client instance
+
+    Args:
+        config: Configuration dictionary, see odoo_client_options()
+
+    Returns:
+        OdooClient: A configured, authenticated Odoo client instance
+    """
+    return OdooClient(**odoo_client_options(config))
@@ -0,0 +1,209 @@
+"""
+Keep-alive HTTP connection pool used by the Odoo transports
+"""
+
+import select
+import threading
+import time
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no connection becomes available in time"""
+
+
+def is_connection_dropped(connection):
+    """
+    Check whether an idle keep-alive connection was closed by the peer
+
+    An idle HTTP/1.1 socket must not be readable: if it is, the server either
+    closed it (EOF) or sent unexpected data, and it cannot be reused.
+
+    Args:
+        connection: http.client.HTTPConnection taken from the pool
+
+    Returns:
+        bool: True when the connection must be discarded
+    """
+    sock = connection.sock
+    if sock is None:
+        # Not connected yet (or already closed): http.client reconnects lazily
+        return False
+    try:
+        if hasattr(select, "poll"):
+            # poll has no FD_SETSIZE limit, unlike select on busy processes
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class ConnectionPool:
+    """
+    Thread-safe, bounded pool of persistent HTTP connections per host
+
+    Each host gets at most ``max_size`` connections (idle + in use). Callers
+    block up to ``acquire_timeout`` seconds when the limit is reached. Idle
+    connections older than ``idle_timeout`` seconds and sockets dropped by the
+    server are discarded instead of being handed out.
+    """
+
+    def __init__(self, factory, max_size=10, idle_timeout=60, acquire_timeout=None):
+        """
+        Initialize the pool
+
+        Args:
+            factory: Callable building a new connection for a host
+            max_size: Maximum number of connections per host
+            idle_timeout: Seconds an idle connection is kept before eviction
+            acquire_timeout: Seconds to wait for a free connection (None waits
+                forever)
+        """
+        self._factory = factory
+        self.max_size = max(int(max_size), 1)
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._cond = threading.Condition()
+        # host -> list of (connection, released_at), most recent last
+        self._idle = {}
+        # host -> number of connections handed out
+        self._in_use = {}
+        self._closed = False
+
+        self.stats = {
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+            "evicted_idle": 0,
+            "evicted_stale": 0,
+            "waits": 0,
+        }
+
+    def _evict_expired(self, now):
+        """Close idle connections that exceeded the idle timeout (lock held)"""
+        if self.idle_timeout is None:
+            return
+        for host, idle in self._idle.items():
+            fresh = []
+            for connection, released_at in idle:
+                if now - released_at > self.idle_timeout:
+                    connection.close()
+                    self.stats["evicted_idle"] += 1
+                else:
+                    fresh.append((connection, released_at))
+            self._idle[host] = fresh
+
+    def acquire(self, host):
+        """
+        Take a connection for a host, reusing an idle one when possible
+
+        Args:
+            host: Host (with optional port) the connection is for
+
+        Returns:
+            http.client.HTTPConnection: A connection reserved for the caller
+
+        Raises:
+            PoolTimeoutError: If the pool stays exhausted for acquire_timeout
+        """
+        deadline = None
+        if self.acquire_timeout is not None:
+            deadline = time.monotonic() + self.acquire_timeout
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            while True:
+                now = time.monotonic()
+                self._evict_expired(now)
+
+                idle = self._idle.get(host)
+                while idle:
+                    connection, _ = idle.pop()
+                    if is_connection_dropped(connection):
+                        connection.close()
+                        self.stats["evicted_stale"] += 1
+                        continue
+                    self._in_use[host] = self._in_use.get(host, 0) + 1
+                    self.stats["reused"] += 1
+                    return connection
+
+                if self._in_use.get(host, 0) < self.max_size:
+                    self._in_use[host] = self._in_use.get(host, 0) + 1
+                    break
+
+                if deadline is not None and now >= deadline:
+                    raise PoolTimeoutError(
+                        f"No connection to {host} available after "
+                        f"{self.acquire_timeout}s (pool size {self.max_size})"
+                    )
+                self.stats["waits"] += 1
+                self._cond.wait(None if deadline is None else deadline - now)
+
+        # Build the connection outside the lock; it connects lazily on first use
+        try:
+            connection = self._factory(host)
+        except Exception:
+            with self._cond:
+                self._in_use[host] -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.stats["created"] += 1
+        return connection
+
+    def release(self, host, connection, reusable=True):
+        """
+        Give a connection back to the pool
+
+        Args:
+            host: Host the connection was acquired for
+            connection: The connection returned by acquire()
+            reusable: False when the connection is in an unknown state (error,
+                unread response, ``Connection: close``) and must be closed
+        """
+        with self._cond:
+            self._in_use[host] = max(self._in_use.get(host, 0) - 1, 0)
+            if reusable and not self._closed and connection.sock is not None:
+                self._idle.setdefault(host, []).append((connection, time.monotonic()))
+            else:
+                connection.close()
+                self.stats["discarded"] += 1
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection and refuse new acquisitions"""
+        with self._cond:
+            self._closed = True
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+            self._idle.clear()
+            self._cond.notify_all()
+
+    def clear(self):
+        """Close idle connections but keep the pool usable"""
+        with self._cond:
+            for idle in self._idle.values():
+                for connection, _ in idle:
+                    connection.close()
+            self._idle.clear()
+
+    def snapshot(self):
+        """
+        Get pool counters and current occupancy
+
+        Returns:
+            dict: Statistics plus idle and in-use connection counts per host
+        """
+        with self._cond:
+            return dict(
+                self.stats,
+                idle={host: len(idle) for host, idle in self._idle.items()},
+                in_use=dict(self._in_use),
+                max_size=self.max_size,
+            )
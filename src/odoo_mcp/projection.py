@@ -0,0 +1,112 @@
+"""
+Lean default field projection for search_read and read calls
+"""
+
+import json
+import threading
+
+# Field types returned by default: cheap scalars plus many2one ids. Binary
+# fields (images, attachments), x2many lists and non-stored computed fields
+# are left out unless explicitly requested.
+LEAN_FIELD_TYPES = frozenset(
+    {
+        "boolean",
+        "char",
+        "date",
+        "datetime",
+        "float",
+        "html",
+        "integer",
+        "many2one",
+        "many2one_reference",
+        "monetary",
+        "reference",
+        "selection",
+        "text",
+    }
+)
+
+
+def lean_fields(fields_info, include_binary=False):
+    """
+    Select the fields of the lean default projection
+
+    Args:
+        fields_info: Result of fields_get() for the model
+        include_binary: Also select stored binary fields
+
+    Returns:
+        tuple: (sorted list of selected field names, number of fields skipped)
+    """
+    selected = []
+    for name, info in fields_info.items():
+        field_type = info.get("type")
+        # Odoo versions without the store attribute only list stored fields
+        if not info.get("store", True):
+            continue
+        if field_type in LEAN_FIELD_TYPES or (
+            include_binary and field_type == "binary"
+        ):
+            selected.append(name)
+    return sorted(selected), len(fields_info) - len(selected)
+
+
+def payload_size(rows):
+    """Approximate size in bytes of a result once serialized"""
+    return len(json.dumps(rows, default=str, separators=(",", ":")))
+
+
+class ProjectionStats:
+    """
+    Reads served by the lean projection, overall and per model
+
+    Counts the calls, rows and bytes received and the fields left out. The
+    rows are never read again with every field just to measure them, so
+    the bytes a full read would have cost are not known.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics"""
+        self._lock = threading.Lock()
+        self._models = {}
+        self.stats = {
+            "calls": 0,
+            "rows": 0,
+            "bytes": 0,
+            "fields_skipped": 0,
+        }
+
+    def record(self, model, rows, fields_skipped):
+        """
+        Account for a call that used the lean projection
+
+        Args:
+            model: Model name
+            rows: Records returned by the call
+            fields_skipped: Number of fields left out of the projection
+        """
+        size = payload_size(rows)
+        with self._lock:
+            for counters in (
+                self.stats,
+                self._models.setdefault(model, dict.fromkeys(self.stats, 0)),
+            ):
+                counters["calls"] += 1
+                counters["rows"] += len(rows)
+                counters["bytes"] += size
+                counters["fields_skipped"] += fields_skipped
+
+    def snapshot(self):
+        """
+        Get projection counters
+
+        Returns:
+            dict: Totals plus per-model counters
+        """
+        with self._lock:
+            return dict(
+                self.stats,
+                models={
+                    model: dict(counters) for model, counters in self._models.items()
+                },
+            )
@@ -0,0 +1,541 @@
+"""
+Process-wide registry of authenticated Odoo clients
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from .odoo_client import OdooClient, load_targets, odoo_client_options
+
+logger = logging.getLogger(__name__)
+
+
+class _Target:
+    """Clients of one named Odoo target and the time of their last use"""
+
+    __slots__ = (
+        "name",
+        "options",
+        "client",
+        "async_client",
+        "last_used",
+        "auth_count",
+        "connect_lock",
+    )
+
+    def __init__(self, name):
+        self.name = name
+        # Held while authenticating, other targets stay available meanwhile
+        self.connect_lock = threading.Lock()
+        # Settings and components shared by the two clients of the target
+        self.options = None
+        self.client = None
+        self.async_client = None
+        self.last_used = time.monotonic()
+        # Authentications done by clients that were already released
+        self.auth_count = 0
+
+    @property
+    def connected(self):
+        return self.live is not None
+
+    @property
+    def live(self):
+        """The async client of the target, else its synchronous one"""
+        return self.async_client if self.async_client is not None else self.client
+
+
+class ClientRegistry:
+    """
+    Share authenticated Odoo clients between all MCP tools and resources
+
+    The registry knows one or more named Odoo targets (see load_targets()).
+    Each target connects and authenticates on first use only, and keeps its
+    ``uid``, connection pool, limiter and caches for the lifetime of the
+    process, so reading a resource no longer costs a config lookup and an
+    ``authenticate`` round trip. Calls that do not select a target go to the
+    default one. Async tools get an AsyncOdooClient, which authenticates on
+    its own; a synchronous OdooClient is only built for callers asking for
+    one, and shares the caches and limits of the async client.
+
+    A target unused for ``idle_timeout`` seconds releases its clients; its
+    next use connects again. A background thread checks for idle targets.
+    Released clients close their connections as soon as the calls still
+    using them complete (see release()).
+
+    The registry is reference counted: every MCP session lifespan calls
+    ``open()`` on entry and ``close()`` on exit, and the clients are dropped
+    when the last session goes away. The configuration stays cached.
+    """
+
+    def __init__(
+        self,
+        target_loader=load_targets,
+        options_factory=odoo_client_options,
+        idle_timeout=None,
+    ):
+        """
+        Initialize an empty registry
+
+        Args:
+            target_loader: Callable returning the targets dictionary and the
+                default target name
+            options_factory: Callable building the client options of a
+                target (see odoo_client_options()) from its configuration
+            idle_timeout: Seconds after which an unused target releases its
+                clients (ODOO_TARGET_IDLE_TIMEOUT, default 600, 0: never)
+        """
+        if idle_timeout is None:
+            idle_timeout = float(os.environ.get("ODOO_TARGET_IDLE_TIMEOUT", "600"))
+        self._target_loader = target_loader
+        self._options_factory = options_factory
+        self.idle_timeout = idle_timeout
+        self._targets = None
+        self._default = None
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._users = 0
+        # Target name to its warm-up task
+        self._warming = {}
+        self._sweeper = None
+        self.counters = {"connects": 0, "idle_releases": 0}
+
+    def _load(self):
+        """Load the targets on first use (lock held)"""
+        if self._targets is None:
+            self._targets, self._default = self._target_loader()
+
+    @property
+    def default_target(self):
+        """Name of the target used when none is selected"""
+        with self._lock:
+            self._load()
+            return self._default
+
+    def targets(self):
+        """
+        Get the names of the configured targets
+
+        Returns:
+            list: Target names, the default one first
+        """
+        with self._lock:
+            self._load()
+            return [self._default] + sorted(
+                name for name in self._targets if name != self._default
+            )
+
+    def get_config(self, target=None):
+        """
+        Get the configuration of a target, loading the targets on first use
+
+        Args:
+            target: Target name (default target if None)
+
+        Returns:
+            dict: Configuration dictionary with url, db, username, password
+
+        Raises:
+            ValueError: If the target is unknown
+        """
+        with self._lock:
+            self._load()
+            name = target or self._default
+            config = self._targets.get(name)
+            if config is None:
+                raise ValueError(
+                    f"Unknown Odoo target '{name}', "
+                    f"available: {', '.join(self.targets())}"
+                )
+            return config
+
+    def _entry(self, target):
+        """Get the entry of a target and mark it used"""
+        with self._lock:
+            self._load()
+            name = target or self._default
+            entry = self._entries.get(name)
+            if entry is None:
+                self.get_config(name)
+                entry = self._entries[name] = _Target(name)
+                self._start_sweeper()
+            entry.last_used = time.monotonic()
+            return entry
+
+    def _start_sweeper(self):
+        """Start the thread releasing idle targets, once (lock held)"""
+        if not self.idle_timeout or self._sweeper is not None:
+            return
+        interval = min(self.idle_timeout, 60)
+
+        def sweep():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.release_idle()
+                except Exception as e:
+                    logger.warning("Releasing idle Odoo targets failed: %s", e)
+
+        self._sweeper = threading.Thread(
+            target=sweep, name="odoo-idle-targets", daemon=True
+        )
+        self._sweeper.start()
+
+    def get_client(self, target=None):
+        """
+        Get the shared Odoo client of a target, connecting on first use
+
+        Args:
+            target: Target name (default target if None)
+
+        Returns:
+            OdooClient: The authenticated client shared by the whole process
+        """
+        entry = self._entry(target)
+        client = entry.client
+        if client is not None:
+            return client
+
+        with entry.connect_lock:
+            if entry.client is None:
+                client = OdooClient(**self._options(entry))
+                with self._lock:
+                    entry.client = client
+            return entry.client
+
+    def _options(self, entry):
+        """Get the client options of a target, building them once
+        (connect_lock held)"""
+        if entry.options is None:
+            logger.info("Connecting to Odoo target '%s'", entry.name)
+            entry.options = self._options_factory(self.get_config(entry.name))
+            with self._lock:
+                self.counters["connects"] += 1
+        return entry.options
+
+    def warm_up(self, target=None):
+        """
+        Connect a target in a background task of the running event loop
+
+        Startup does not wait for Odoo: the MCP handshake completes while the
+        client authenticates, and a failure is only logged, the first call
+        using the target tries again.
+
+        Args:
+            target: Target name (default target if None)
+
+        Returns:
+            asyncio.Task: The started task, None if already connected or
+                connecting
+        """
+        with self._lock:
+            if target is None and self._targets is None:
+                try:
+                    self._load()
+                except Exception as e:
+                    logger.warning("Cannot load the Odoo configuration: %s", e)
+                    return None
+            name = target or self._default
+            if name in self._warming:
+                return None
+            entry = self._entries.get(name)
+            if entry is not None and entry.async_client is not None:
+                return None
+
+            async def connect():
+                start = time.perf_counter()
+                try:
+                    await self.get_async_client(name)
+                    logger.info(
+                        "Odoo target '%s' ready in %.2fs",
+                        name,
+                        time.perf_counter() - start,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Background connection to Odoo target '%s' failed, "
+                        "retrying on first use: %s",
+                        name,
+                        e,
+                    )
+                finally:
+                    with self._lock:
+                        self._warming.pop(name, None)
+
+            task = asyncio.get_running_loop().create_task(
+                connect(), name=f"odoo-warm-up-{name}"
+            )
+            self._warming[name] = task
+            return task
+
+    async def get_async_client(self, target=None):
+        """
+        Get the shared asyncio Odoo client of a target, authenticated
+
+        The client is built in a worker thread (loading certificates and
+        the schema cache is slow), then authenticates on the event loop, so
+        the loop never blocks on Odoo.
+
+        Args:
+            target: Target name (default target if None)
+
+        Returns:
+            AsyncOdooClient: The async client shared by the whole process
+        """
+        entry = self._entry(target)
+        client = entry.async_client
+        if client is None:
+            built = await asyncio.to_thread(self._build_async_client, entry)
+            with self._lock:
+                if entry.async_client is None:
+                    entry.async_client = built
+                client = entry.async_client
+            if client is not built:
+                # Another call built one first
+                await built.aclose()
+        await client.connect()
+        return client
+
+    def _build_async_client(self, entry):
+        """Build the async client of a target (worker thread)"""
+        # Deferred: processes using only the synchronous client skip httpx
+        from .async_client import AsyncOdooClient
+
+        with entry.connect_lock:
+            options = self._options(entry)
+        client = AsyncOdooClient(**options)
+        # The HTTP client loads the CA bundle, which is slow
+        client._get_http()
+        return client
+
+    def open(self):
+        """Register a user of the registry (usually an MCP session lifespan)"""
+        with self._lock:
+            self._users += 1
+
+    def _leave(self):
+        """Unregister a user, detaching every client after the last one"""
+        with self._lock:
+            self._users = max(self._users - 1, 0)
+            if self._users:
+                return [], []
+            return self._detach_all()
+
+    def close(self):
+        """Release a user of the registry, dropping the clients after the last one"""
+        self._release(*self._leave())
+
+    async def aclose(self):
+        """Like close(), awaiting the close of the idle async clients"""
+        clients, async_clients = self._leave()
+        for client in clients:
+            # Saves the schema cache to disk
+            await asyncio.to_thread(client.release)
+        for async_client in async_clients:
+            await asyncio.to_thread(async_client.schema_cache.save)
+            await async_client.arelease()
+
+    def reset(self):
+        """Forget the cached configuration and clients"""
+        with self._lock:
+            clients, async_clients = self._detach_all()
+            self._entries.clear()
+            self._targets = None
+            self._default = None
+        self._release(clients, async_clients)
+
+    @staticmethod
+    def _release(clients, async_clients):
+        """
+        Close detached clients once their calls in flight complete, saving
+        their schema cache
+        """
+        for client in clients:
+            # Saves the schema cache when closing
+            client.release()
+        for async_client in async_clients:
+            async_client.schema_cache.save()
+            async_client.release()
+
+    def release_idle(self):
+        """
+        Release the clients of the targets unused for idle_timeout seconds
+
+        Calls still using the clients complete, then the clients close
+        their connections (immediately when idle). Their schema cache is
+        saved.
+
+        Returns:
+            list: Names of the released targets
+        """
+        if not self.idle_timeout:
+            return []
+        released = []
+        clients, async_clients = [], []
+        with self._lock:
+            now = time.monotonic()
+            for entry in self._entries.values():
+                if entry.connected and now - entry.last_used >= self.idle_timeout:
+                    logger.info(
+                        "Releasing Odoo target '%s', idle for %.0fs",
+                        entry.name,
+                        now - entry.last_used,
+                    )
+                    detached = self._detach(entry)
+                    clients += detached[0]
+                    async_clients += detached[1]
+                    self.counters["idle_releases"] += 1
+                    released.append(entry.name)
+        # Disk I/O outside the lock
+        self._release(clients, async_clients)
+        return released
+
+    def _detach(self, entry):
+        """
+        Drop the clients of a target, keeping their authentication count
+        (lock held)
+
+        Returns:
+            tuple: (sync clients, async clients) detached
+        """
+        clients, async_clients = [], []
+        if entry.client is not None:
+            entry.auth_count += entry.client.auth_count
+            clients.append(entry.client)
+        if entry.async_client is not None:
+            entry.auth_count += entry.async_client.auth_count
+            async_clients.append(entry.async_client)
+        entry.client = None
+        entry.async_client = None
+        entry.options = None
+        return clients, async_clients
+
+    def _detach_all(self):
+        """Drop the clients of every target (lock held)"""
+        clients, async_clients = [], []
+        for entry in self._entries.values():
+            detached = self._detach(entry)
+            clients += detached[0]
+            async_clients += detached[1]
+        return clients, async_clients
+
+    @property
+    def auth_count(self):
+        """Total number of authentication round trips done by the registry"""
+        with self._lock:
+            return sum(
+                self._target_auth_count(entry) for entry in self._entries.values()
+            )
+
+    @staticmethod
+    def _target_auth_count(entry):
+        count = entry.auth_count
+        for client in (entry.client, entry.async_client):
+            if client is not None:
+                count += client.auth_count
+        return count
+
+    @staticmethod
+    def _client_stats(client):
+        """Connection details and component snapshots of a client"""
+        return {
+            "connected": client is not None,
+            "url": client.url if client else None,
+            "db": client.db if client else None,
+            "uid": client.uid if client else None,
+            "schema_cache": client.schema_cache.snapshot() if client else None,
+            "model_catalog": (
+                dict(client.model_catalog.stats, etag=client.model_catalog.etag)
+                if client
+                else None
+            ),
+            "projection": client.projection_stats.snapshot() if client else None,
+            "coalescing": (
+                client.coalescer.snapshot()
+                if client and client.coalescer is not None
+                else None
+            ),
+            "limiter": (
+                client.limiter.snapshot()
+                if client and client.limiter is not None
+                else None
+            ),
+            "circuit_breaker": client.circuit_breaker.snapshot() if client else None,
+            "result_cache": (
+                client.result_cache.snapshot()
+                if client and client.result_cache is not None
+                else None
+            ),
+            "leave_cache": (
+                client.leave_cache.snapshot()
+                if client and client.leave_cache is not None
+                else None
+            ),
+            "employee_directory": (
+                client.employee_directory.snapshot()
+                if client and client.employee_directory is not None
+                else None
+            ),
+        }
+
+    def stats(self):
+        """
+        Get a snapshot of the registry state
+
+        The top-level connection details describe the default target, the
+        "targets" entry summarizes every configured target.
+
+        Returns:
+            dict: Connection details and authentication counter
+        """
+        with self._lock:
+            now = time.monotonic()
+            default = self._default
+            entry = self._entries.get(default)
+            targets = {}
+            for name in self.targets() if self._targets is not None else []:
+                target = self._entries.get(name)
+                config = self._targets[name]
+                targets[name] = {
+                    "url": config["url"],
+                    "db": config["db"],
+                    "connected": bool(target and target.connected),
+                    "uid": target.live.uid if target and target.live else None,
+                    "authentications": (
+                        self._target_auth_count(target) if target else 0
+                    ),
+                    "idle_seconds": (
+                        round(now - target.last_used, 1) if target else None
+                    ),
+                }
+            return {
+                **self._client_stats(entry.live if entry else None),
+                "sessions": self._users,
+                "authentications": self.auth_count,
+                "default_target": default,
+                "idle_timeout": self.idle_timeout,
+                **self.counters,
+                "targets": targets,
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Get the process-wide client registry
+
+    Returns:
+        ClientRegistry: The registry shared by all MCP sessions
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ClientRegistry()
+    return _registry
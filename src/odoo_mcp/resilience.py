@@ -0,0 +1,239 @@
+"""
+Retries with jittered backoff and a circuit breaker for Odoo calls
+"""
+
+import http.client
+import logging
+import random
+import socket
+import threading
+import time
+import xmlrpc.client
+
+from .pool import PoolTimeoutError
+from .result_cache import READ_ONLY_METHODS
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: the request may succeed on another attempt
+TRANSIENT_ERRORS = (OSError, http.client.HTTPException, xmlrpc.client.ProtocolError)
+
+# Errors raised before the request reached Odoo: even a write can be resent
+UNSENT_ERRORS = (ConnectionRefusedError, socket.gaierror)
+
+# Saturation of this process (no free pooled connection), which says nothing
+# about the health of Odoo
+LOCAL_ERRORS = (PoolTimeoutError,)
+
+# HTTP statuses of an Odoo worker (or its proxy) restarting or overloaded
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling Odoo while the circuit breaker is open"""
+
+
+class RetryPolicy:
+    """
+    Decide which failed calls are retried and how long to wait
+
+    Read-only methods are retried on transient errors (network failures,
+    worker restarts); other methods only when the request was never sent.
+    Delays use exponential backoff with full jitter, so that concurrent
+    callers do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        retries=2,
+        backoff=0.1,
+        max_backoff=2.0,
+        transient_errors=TRANSIENT_ERRORS,
+        unsent_errors=UNSENT_ERRORS,
+        local_errors=LOCAL_ERRORS,
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            retries: Maximum number of retries of one call (0 disables them)
+            backoff: Base delay in seconds, doubled on every attempt
+            max_backoff: Upper bound of a delay in seconds
+            transient_errors: Exception types worth another attempt
+            unsent_errors: Exception types raised before anything was sent
+            local_errors: Exception types of a saturated client, neither
+                retried nor counted as Odoo failures
+        """
+        self.retries = max(int(retries), 0)
+        self.backoff = max(float(backoff), 0.0)
+        self.max_backoff = max(float(max_backoff), self.backoff)
+        self.transient_errors = transient_errors
+        self.unsent_errors = unsent_errors
+        self.local_errors = local_errors
+
+    def is_local(self, error):
+        """
+        Check whether an error comes from this process running out of
+        connections rather than from Odoo
+
+        Args:
+            error: Exception raised by a call
+
+        Returns:
+            bool: True for local saturation errors (e.g. pool timeouts)
+        """
+        return isinstance(error, self.local_errors)
+
+    def is_transient(self, error):
+        """
+        Check whether an error means Odoo could not be reached or answer
+
+        Args:
+            error: Exception raised by a call
+
+        Returns:
+            bool: True for network errors and unavailable servers, False
+            for errors returned by Odoo (faults, HTTP 4xx/500)
+        """
+        if isinstance(error, CircuitOpenError) or self.is_local(error):
+            return False
+        if isinstance(error, xmlrpc.client.ProtocolError):
+            return error.errcode in RETRYABLE_STATUSES
+        return isinstance(error, self.transient_errors)
+
+    def should_retry(self, method, error, attempt):
+        """
+        Check whether a failed call is attempted again
+
+        Args:
+            method: Name of the Odoo method called
+            error: Exception raised by the attempt
+            attempt: Number of retries already done
+
+        Returns:
+            bool: True if the call should be sent again
+        """
+        if attempt >= self.retries:
+            return False
+        if isinstance(error, self.unsent_errors):
+            return True
+        return method in READ_ONLY_METHODS and self.is_transient(error)
+
+    def delay(self, attempt):
+        """
+        Get the time to wait before a retry
+
+        Args:
+            attempt: Number of retries already done
+
+        Returns:
+            float: Seconds to wait, between 0 and the capped backoff
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Fail fast while Odoo is unreachable
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls raise CircuitOpenError without touching the network.
+    Once ``reset_timeout`` seconds have passed, one call is let through as a
+    probe: its success closes the circuit, its failure opens it again. Any
+    answer from Odoo, even an error, counts as a success.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Initialize a closed circuit breaker
+
+        Args:
+            failure_threshold: Consecutive failures opening the circuit
+                (0 disables the breaker)
+            reset_timeout: Seconds before a probe call is allowed
+        """
+        self.failure_threshold = max(int(failure_threshold), 0)
+        self.reset_timeout = max(float(reset_timeout), 0.0)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self.stats = {"trips": 0, "rejected": 0}
+
+    @property
+    def state(self):
+        """Current state: 'closed', 'open' or 'half_open'"""
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if self._probing else "open"
+
+    def before_call(self):
+        """
+        Let a call through or reject it
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        if self._opened_at is None:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining <= 0:
+                # Let one probe through per reset_timeout, a probe that
+                # never reports back (cancelled call) does not block others
+                self._opened_at = time.monotonic()
+                self._probing = True
+                return
+            self.stats["rejected"] += 1
+        raise CircuitOpenError(
+            f"Odoo is unavailable (circuit open), next attempt in {remaining:.1f}s"
+        )
+
+    def record_success(self):
+        """Close the circuit after a call reached Odoo"""
+        if self._failures == 0 and self._opened_at is None:
+            return
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Odoo is reachable again, closing the circuit")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """Count a transient failure, opening the circuit past the threshold"""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._probing or (
+                self._opened_at is None and self._failures >= self.failure_threshold
+            ):
+                if not self._probing:
+                    self.stats["trips"] += 1
+                    logger.warning(
+                        "Opening the circuit after %d consecutive failures, "
+                        "failing fast for %ss",
+                        self._failures,
+                        self.reset_timeout,
+                    )
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def snapshot(self):
+        """
+        Get the breaker state and counters
+
+        Returns:
+            dict: State, consecutive failures, trips and rejected calls
+        """
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                **self.stats,
+            }
@@ -0,0 +1,250 @@
+"""
+Cache of read-only query results (search_read, read, search_count...)
+"""
+
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+# Methods whose results are cached
+CACHEABLE_METHODS = frozenset(
+    {
+        "name_get",
+        "name_search",
+        "read",
+        "read_group",
+        "search",
+        "search_count",
+        "search_read",
+    }
+)
+
+# Methods that never change data: they neither use nor invalidate the cache.
+# Every other method (create, write, unlink, action_*...) is assumed to
+# modify its model.
+READ_ONLY_METHODS = CACHEABLE_METHODS | frozenset(
+    {
+        "check_access_rights",
+        "check_access_rule",
+        "default_get",
+        "fields_get",
+        "fields_view_get",
+        "get_views",
+        "search_fetch",
+        "web_read",
+        "web_search_read",
+    }
+)
+
+
+def parse_model_ttls(value):
+    """
+    Parse per-model TTLs from ``model=seconds`` pairs
+
+    Args:
+        value: Comma separated pairs, e.g. 'res.partner=300,stock.quant=0'
+
+    Returns:
+        dict: Model name to TTL in seconds
+
+    Raises:
+        ValueError: If a pair is malformed
+    """
+    ttls = {}
+    for pair in (value or "").split(","):
+        if not pair.strip():
+            continue
+        model, sep, seconds = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid model TTL '{pair}', expected model=seconds")
+        ttls[model.strip()] = float(seconds)
+    return ttls
+
+
+class ResultCache:
+    """
+    LRU cache of query results bounded by entry count and memory
+
+    Results are stored pickled, so a hit returns a private copy and the size
+    of each entry is known exactly. Entries expire after the TTL of their
+    model (``model_ttls``, else ``ttl``; 0 disables caching for a model). A
+    mutating call on a model drops its entries, and a per-model generation
+    counter keeps a read that raced with a write from storing a stale result.
+    """
+
+    def __init__(
+        self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttl=60, model_ttls=None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total size of the cached results (pickled)
+            ttl: Default seconds a result stays valid
+            model_ttls: Dictionary of per-model TTLs overriding ttl
+        """
+        self.max_entries = max(int(max_entries), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+        self.ttl = ttl
+        self.model_ttls = dict(model_ttls or {})
+
+        self._lock = threading.Lock()
+        # key -> (pickled value, expires_at monotonic time)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # (db, model) -> keys, for invalidation
+        self._by_model = {}
+        # (db, model) -> number of invalidations
+        self._generations = {}
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "skipped": 0,
+        }
+
+    def ttl_for(self, model):
+        """Get the TTL of a model's results in seconds"""
+        return self.model_ttls.get(model, self.ttl)
+
+    def is_cacheable(self, model, method):
+        """Whether the result of a call may be cached"""
+        return method in CACHEABLE_METHODS and self.ttl_for(model) > 0
+
+    @staticmethod
+    def make_key(db, model, method, args, kwargs):
+        """
+        Build the cache key of a call
+
+        Args:
+            db: Database name
+            model: Model name
+            method: Method name
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            tuple: Hashable key; equal calls get equal keys
+        """
+        call = json.dumps([args, kwargs], sort_keys=True, default=str)
+        return (db, model, method, call)
+
+    def generation(self, db, model):
+        """Get the invalidation counter of a model, see put()"""
+        with self._lock:
+            return self._generations.get((db, model), 0)
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Args:
+            key: Key returned by make_key()
+
+        Returns:
+            tuple: (True, result) on a hit, (False, None) on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            data, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return True, pickle.loads(data)
+
+    def put(self, key, value, generation):
+        """
+        Store a result
+
+        Args:
+            key: Key returned by make_key()
+            value: Result of the call
+            generation: generation() of the model read before the call; the
+                result is dropped if the model was invalidated meanwhile
+        """
+        db, model = key[0], key[1]
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if (
+                self._generations.get((db, model), 0) != generation
+                or len(data) > self.max_bytes
+            ):
+                self.stats["skipped"] += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, time.monotonic() + self.ttl_for(model))
+            self._bytes += len(data)
+            self._by_model.setdefault((db, model), set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def _remove(self, key):
+        """Drop an entry (lock held)"""
+        data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+        keys = self._by_model.get(key[:2])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_model[key[:2]]
+
+    def invalidate(self, db, model=None):
+        """
+        Drop the cached results of a model
+
+        Args:
+            db: Database name
+            model: Model name (None drops every model of the database)
+        """
+        with self._lock:
+            if model is None:
+                targets = [target for target in self._by_model if target[0] == db]
+            else:
+                targets = [(db, model)]
+            for target in targets:
+                for key in list(self._by_model.get(target, ())):
+                    self._remove(key)
+                self._generations[target] = self._generations.get(target, 0) + 1
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            for target in self._by_model:
+                self._generations[target] = self._generations.get(target, 0) + 1
+            self._entries.clear()
+            self._by_model.clear()
+            self._bytes = 0
+
+    def snapshot(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: Hit/miss statistics, size and memory use
+        """
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(
+                self.stats,
+                size=len(self._entries),
+                bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                hit_ratio=round(self.stats["hits"] / lookups, 4) if lookups else None,
+            )
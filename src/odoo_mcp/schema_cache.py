@@ -0,0 +1,263 @@
+"""
+Cache of Odoo model schemas (fields_get and ir.model lookups)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Calls whose results identify the current schema of a database. Module
+# installs and upgrades touch write_date of ir.model / ir.model.fields, and
+# uninstalls change the number of fields.
+STAMP_QUERIES = (
+    (
+        "ir.model",
+        "search_read",
+        ([],),
+        {"fields": ["write_date"], "limit": 1, "order": "write_date desc"},
+    ),
+    (
+        "ir.model.fields",
+        "search_read",
+        ([],),
+        {"fields": ["write_date"], "limit": 1, "order": "write_date desc"},
+    ),
+    ("ir.model.fields", "search_count", ([],), {}),
+)
+
+
+def stamp_from_results(results):
+    """
+    Build a schema stamp from the results of STAMP_QUERIES
+
+    Args:
+        results: Results of the STAMP_QUERIES calls, in order
+
+    Returns:
+        str: Opaque value that changes whenever the schema changes
+    """
+    parts = []
+    for result in results:
+        if isinstance(result, list):
+            result = result[0].get("write_date") if result else ""
+        parts.append(str(result))
+    return "|".join(parts)
+
+
+class SchemaCache:
+    """
+    LRU cache of model schemas keyed by database, kind and model
+
+    Entries expire after ``ttl`` seconds. The whole database is invalidated
+    when its schema stamp (see STAMP_QUERIES) changes; callers re-check the
+    stamp at most every ``check_interval`` seconds. When ``path`` is set the
+    cache is persisted as JSON and reloaded on startup, so a restarted server
+    does not have to fetch every schema again.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600, check_interval=60, path=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached schemas
+            ttl: Seconds after which an entry expires (None never expires)
+            check_interval: Minimum seconds between two schema stamp checks
+            path: JSON file used to persist the cache (None keeps it in memory)
+        """
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.path = os.path.expanduser(path) if path else None
+
+        self._lock = threading.RLock()
+        # (db, kind, model) -> (value, stored_at wall clock time)
+        self._entries = OrderedDict()
+        # db -> schema stamp / monotonic time of the last check
+        self._stamps = {}
+        self._checked_at = {}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+        if self.path:
+            self.load()
+
+    def get(self, db, kind, model):
+        """
+        Look up a cached schema
+
+        Args:
+            db: Database name
+            kind: Kind of schema ('fields' or 'model')
+            model: Model name
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        key = (db, kind, model)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            value, stored_at = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                self._dirty = True
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, db, kind, model, value):
+        """
+        Store a schema, evicting the least recently used entries if needed
+
+        Args:
+            db: Database name
+            kind: Kind of schema ('fields' or 'model')
+            model: Model name
+            value: JSON-serializable schema
+        """
+        with self._lock:
+            self._entries[(db, kind, model)] = (value, time.time())
+            self._entries.move_to_end((db, kind, model))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            self._dirty = True
+            # Persist at most every 30 seconds; close() flushes the rest
+            if self.path and time.monotonic() - self._saved_at > 30:
+                self.save()
+
+    def invalidate(self, db=None, model=None):
+        """
+        Drop cached schemas
+
+        Args:
+            db: Only drop entries of this database (None for all)
+            model: Only drop entries of this model (None for all)
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if (db is None or key[0] == db) and (model is None or key[2] == model):
+                    del self._entries[key]
+            self._dirty = True
+            self.stats["invalidations"] += 1
+
+    def needs_check(self, db):
+        """Whether the schema stamp of a database should be checked again"""
+        with self._lock:
+            checked_at = self._checked_at.get(db)
+            return (
+                checked_at is None
+                or time.monotonic() - checked_at >= self.check_interval
+            )
+
+    def mark_checked(self, db):
+        """Postpone the next stamp check without changing the stamp"""
+        with self._lock:
+            self._checked_at[db] = time.monotonic()
+
+    def check_stamp(self, db, stamp):
+        """
+        Record the current schema stamp, invalidating the database on change
+
+        Args:
+            db: Database name
+            stamp: Value returned by stamp_from_results()
+
+        Returns:
+            bool: True if the schema changed and entries were dropped
+        """
+        with self._lock:
+            self._checked_at[db] = time.monotonic()
+            previous = self._stamps.get(db)
+            self._stamps[db] = stamp
+            if previous is not None and previous != stamp:
+                self.invalidate(db=db)
+                return True
+            if previous is None and any(key[0] == db for key in self._entries):
+                # Entries loaded from disk without a known stamp
+                self.invalidate(db=db)
+                return True
+            return False
+
+    def snapshot(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: Hit/miss statistics and current size
+        """
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return dict(
+                self.stats,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hit_ratio=round(self.stats["hits"] / lookups, 4) if lookups else None,
+            )
+
+    def load(self):
+        """Load persisted entries, skipping expired ones"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable schema cache: %s", e)
+            return
+
+        now = time.time()
+        with self._lock:
+            self._stamps.update(data.get("stamps", {}))
+            for db, kind, model, value, stored_at in data.get("entries", []):
+                if self.ttl is None or now - stored_at <= self.ttl:
+                    self._entries[(db, kind, model)] = (value, stored_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache to disk atomically if it changed"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "stamps": self._stamps,
+                "entries": [
+                    [db, kind, model, value, stored_at]
+                    for (db, kind, model), (value, stored_at) in self._entries.items()
+                ],
+            }
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Failed to save schema cache: %s", e)
@@ -4,7 +4,9 @@ MCP server for Odoo integration
 Provides MCP tools and resources for interacting with Odoo ERP systems
 """
 
+import base64
 import json
+import logging
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -13,14 +15,32 @@ from typing import Any, AsyncIterator, Dict, List, Optional, Union, cast
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
-from .odoo_client import OdooClient, get_odoo_client
+from .async_client import AsyncOdooClient
+from .domain import compile_domain, validate_domain
+from .formats import dumps, get_format, get_serializer
+from .grouping import (
+    GROUP_CONTEXT_KEYS,
+    parse_aggregates,
+    parse_groupby,
+    validate_grouping,
+)
+from .log import configure_logging, is_configured
+from .metrics import get_metrics, instrument, start_metrics_server_from_env
+from .registry import ClientRegistry, get_registry
+from .settings import env_flag
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class AppContext:
     """Application context for the MCP server"""
 
-    odoo: OdooClient
+    registry: ClientRegistry
+
+    async def async_client(self, target: Optional[str] = None) -> AsyncOdooClient:
+        """Shared asyncio Odoo client of a named target (default if None)"""
+        return await self.registry.get_async_client(target)
 
 
 @asynccontextmanager
@@ -28,14 +48,22 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     """
     Application lifespan for initialization and cleanup
     """
-    # Initialize Odoo client on startup
-    odoo_client = get_odoo_client()
+    # Embedding hosts (or the command line entry point) may configure it first
+    if not is_configured():
+        configure_logging()
+    registry = get_registry()
+    registry.open()
+    # Optional Prometheus endpoint (ODOO_METRICS_PORT), started once
+    start_metrics_server_from_env()
 
     try:
-        yield AppContext(odoo=odoo_client)
+        # Nothing waits on Odoo here: the default target authenticates in
+        # the background (ODOO_WARM_UP), the others on first use
+        if env_flag("ODOO_WARM_UP", "1"):
+            registry.warm_up()
+        yield AppContext(registry=registry)
     finally:
-        # No cleanup needed for Odoo client
-        pass
+        await registry.aclose()
 
 
 # Create MCP server
@@ -53,43 +81,70 @@ mcp = FastMCP(
 @mcp.resource(
     "odoo://models", description="List all available models in the Odoo system"
 )
-def get_models() -> str:
+@instrument("resource")
+async def get_models() -> str:
     """Lists all available models in the Odoo system"""
-    odoo_client = get_odoo_client()
-    models = odoo_client.get_models()
-    return json.dumps(models, indent=2)
+    odoo_client = await get_registry().get_async_client()
+    models = await odoo_client.get_models()
+    if "error" in models:
+        return dumps(models)
+    # Serialized once per catalog version
+    return odoo_client.model_catalog.render(get_serializer())
+
+
+@mcp.resource(
+    "odoo://models/if-none-match/{etag}",
+    description="List all available models unless the catalog still matches the given ETag",
+)
+@instrument("resource")
+async def get_models_if_changed(etag: str) -> str:
+    """
+    Lists all available models only if the catalog changed
+
+    Parameters:
+        etag: ETag returned by a previous read of odoo://models
+    """
+    odoo_client = await get_registry().get_async_client()
+    models = await odoo_client.get_models()
+    if "error" in models:
+        return dumps(models)
+    if models["etag"] == etag:
+        return dumps({"etag": etag, "not_modified": True})
+    return odoo_client.model_catalog.render(get_serializer())
 
 
 @mcp.resource(
     "odoo://model/{model_name}",
     description="Get detailed information about a specific model including fields",
 )
-def get_model_info(model_name: str) -> str:
+@instrument("resource")
+async def get_model_info(model_name: str) -> str:
     """
     Get information about a specific model
 
     Parameters:
         model_name: Name of the Odoo model (e.g., 'res.partner')
     """
-    odoo_client = get_odoo_client()
     try:
+        odoo_client = await get_registry().get_async_client()
         # Get model info
-        model_info = odoo_client.get_model_info(model_name)
+        model_info = await odoo_client.get_model_info(model_name)
 
         # Get field definitions
-        fields = odoo_client.get_model_fields(model_name)
+        fields = await odoo_client.get_model_fields(model_name)
         model_info["fields"] = fields
 
-        return json.dumps(model_info, indent=2)
+        return dumps(model_info)
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return dumps({"error": str(e)})
 
 
 @mcp.resource(
     "odoo://record/{model_name}/{record_id}",
     description="Get detailed information of a specific record by ID",
 )
-def get_record(model_name: str, record_id: str) -> str:
+@instrument("resource")
+async def get_record(model_name: str, record_id: str) -> str:
     """
     Get a specific record by ID
 
@@ -97,24 +152,23 @@ def get_record(model_name: str, record_id: str) -> str:
         model_name: Name of the Odoo model (e.g., 'res.partner')
         record_id: ID of the record
     """
-    odoo_client = get_odoo_client()
     try:
+        odoo_client = await get_registry().get_async_client()
         record_id_int = int(record_id)
-        record = odoo_client.read_records(model_name, [record_id_int])
+        record = await odoo_client.read_records(model_name, [record_id_int])
         if not record:
-            return json.dumps(
-                {"error": f"Record not found: {model_name} ID {record_id}"}, indent=2
-            )
-        return json.dumps(record[0], indent=2)
+            return dumps({"error": f"Record not found: {model_name} ID {record_id}"})
+        return dumps(record[0])
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return dumps({"error": str(e)})
 
 
 @mcp.resource(
     "odoo://search/{model_name}/{domain}",
     description="Search for records matching the domain",
 )
-def search_records_resource(model_name: str, domain: str) -> str:
+@instrument("resource")
+async def search_records_resource(model_name: str, domain: str) -> str:
     """
     Search for records that match a domain
 
@@ -122,8 +176,8 @@ def search_records_resource(model_name: str, domain: str) -> str:
         model_name: Name of the Odoo model (e.g., 'res.partner')
         domain: Search domain in JSON format (e.g., '[["name", "ilike", "test"]]')
     """
-    odoo_client = get_odoo_client()
     try:
+        odoo_client = await get_registry().get_async_client()
         # Parse domain from JSON string
         domain_list = json.loads(domain)
 
@@ -131,11 +185,51 @@ def search_records_resource(model_name: str, domain: str) -> str:
         limit = 10
 
         # Perform search_read for efficiency
-        results = odoo_client.search_read(model_name, domain_list, limit=limit)
+        results = await odoo_client.search_read(model_name, domain_list, limit=limit)
+
+        return dumps(results)
+    except Exception as e:
+        return dumps({"error": str(e)})
+
 
-        return json.dumps(results, indent=2)
+@mcp.resource(
+    "odoo://status",
+    description="Connection status of the shared Odoo client and authentication count",
+)
+@instrument("resource")
+def get_status() -> str:
+    """Shows the shared Odoo connection and how many authentications ran"""
+    return dumps(get_registry().stats())
+
+
+@mcp.resource(
+    "odoo://targets",
+    description="Named Odoo targets that tools can select with their target "
+    "argument",
+)
+@instrument("resource")
+def get_targets() -> str:
+    """Lists the configured Odoo targets and whether they are connected"""
+    registry = get_registry()
+    try:
+        registry.targets()
+        stats = registry.stats()
+        return dumps(
+            {"default_target": stats["default_target"], "targets": stats["targets"]}
+        )
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return dumps({"error": str(e)})
+
+
+@mcp.resource(
+    "odoo://metrics",
+    description="Latency percentiles, payload sizes and error counts of Odoo calls "
+    "(by model and method), tools and resources",
+)
+@instrument("resource")
+def get_call_metrics() -> str:
+    """Shows per model/method, tool and resource call metrics"""
+    return dumps(get_metrics().snapshot())
 
 
 # ----- Pydantic models for type safety -----
@@ -182,6 +276,13 @@ class SearchEmployeeResponse(BaseModel):
     result: Optional[List[EmployeeSearchResult]] = Field(
         default=None, description="List of employee search results"
     )
+    suggestions: Optional[List[EmployeeSearchResult]] = Field(
+        default=None,
+        description=(
+            "Close spellings from the employee index when no name matches,"
+            " not name_search results"
+        ),
+    )
     error: Optional[str] = Field(default=None, description="Error message, if any")
 
 
@@ -208,17 +309,165 @@ class SearchHolidaysResponse(BaseModel):
     error: Optional[str] = Field(default=None, description="Error message, if any")
 
 
+class RecordPageResponse(BaseModel):
+    """Response model for the search_records_page tool."""
+
+    success: bool = Field(description="Indicates if the search was successful")
+    result: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="Records of this page, in ID order"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor to pass to get the next page, null after the last page",
+    )
+    error: Optional[str] = Field(default=None, description="Error message, if any")
+
+
+class AggregateResponse(BaseModel):
+    """Response model for the aggregate_records tool."""
+
+    success: bool = Field(description="Indicates if the aggregation was successful")
+    result: Optional[List[Dict[str, Any]]] = Field(
+        default=None, description="One row per group with its aggregated values"
+    )
+    error: Optional[str] = Field(default=None, description="Error message, if any")
+
+
+class BatchOperation(BaseModel):
+    """One call of the execute_batch tool"""
+
+    model: str = Field(description="The model name (e.g., 'res.partner')")
+    method: str = Field(description="Method name to execute")
+    args: List = Field(default_factory=list, description="Positional arguments")
+    kwargs: Dict[str, Any] = Field(
+        default_factory=dict, description="Keyword arguments"
+    )
+
+
+# ----- Helpers -----
+
+# Largest page the search_records_page tool returns in one call
+MAX_PAGE_SIZE = 5000
+
+# Most operations the execute_batch tool accepts in one call
+MAX_BATCH_SIZE = 500
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Encode pagination state as an opaque, URL-safe cursor"""
+    payload = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor()"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(state, dict) or "model" not in state:
+        raise ValueError("Invalid cursor")
+    return state
+
+
+# Methods taking a search domain as first positional argument
+SEARCH_METHODS = ("search", "search_count", "search_read")
+
+
+def normalize_search_args(method: str, args: List) -> List:
+    """
+    Normalize the domain argument of search methods
+
+    Accepts the domain as a list, a single condition, an object with
+    ``conditions`` or a JSON / Python literal string, and unwraps a domain
+    wrapped in an extra list (see compile_domain).
+
+    Parameters:
+        method: Method name to execute
+        args: Positional arguments
+
+    Returns:
+        The positional arguments with a normalized domain in first position
+
+    Raises:
+        DomainError: If the domain is malformed
+    """
+    if method in SEARCH_METHODS and args:
+        args = list(args)
+        args[0] = compile_domain(args[0])
+
+        logger.debug("Executing %s with normalized domain: %s", method, args[0])
+
+    return args
+
+
+async def validate_search_args(
+    odoo: AsyncOdooClient, model: str, method: str, args: List
+) -> None:
+    """
+    Check the domain of normalized search arguments against the model schema
+
+    Uses the cached fields_get of the model. Validation is skipped when the
+    schema cannot be read, so Odoo reports the error itself.
+
+    Parameters:
+        odoo: Client used to read the schema
+        model: The model name
+        method: Method name to execute
+        args: Arguments returned by normalize_search_args
+
+    Raises:
+        DomainError: If a condition uses an unknown field or a wrong operator
+    """
+    if method not in SEARCH_METHODS or not args or not args[0]:
+        return
+    fields_info = await odoo.get_model_fields(model)
+    if isinstance(fields_info.get("error"), str):
+        return
+    validate_domain(args[0], fields_info)
+
+
+def format_response(response: Any, output_format: Optional[str]) -> Any:
+    """
+    Encode a tool response in the requested output format
+
+    The default 'json' format returns the response unchanged, so FastMCP
+    serializes it as before. Other formats are serialized here.
+
+    Parameters:
+        response: Dictionary or pydantic model returned by the tool
+        output_format: 'json', 'compact' or 'columnar' (None for
+            ODOO_OUTPUT_FORMAT)
+
+    Returns:
+        The response, or its serialization as a string
+    """
+    try:
+        output_format = get_format(output_format)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    if output_format == "json":
+        return response
+    if isinstance(response, BaseModel):
+        response = response.model_dump(mode="json")
+    return dumps(response, output_format)
+
+
 # ----- MCP Tools -----
 
 
 @mcp.tool(description="Execute a custom method on an Odoo model")
-def execute_method(
+@instrument("tool")
+async def execute_method(
     ctx: Context,
     model: str,
     method: str,
     args: List = None,
     kwargs: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
+    target: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> Union[Dict[str, Any], str]:
     """
     Execute a custom method on an Odoo model
 
@@ -227,6 +476,10 @@ def execute_method(
         method: Method name to execute
         args: Positional arguments
         kwargs: Keyword arguments
+        output_format: 'json' (default), 'compact' or 'columnar' (lists
+            of records as {columns, rows})
+        target: Name of the Odoo target to call (default target if
+            omitted), see the odoo://targets resource.
 
     Returns:
         Dictionary containing:
@@ -234,211 +487,401 @@ def execute_method(
         - result: Result of the method (if success)
         - error: Error message (if failure)
     """
-    odoo = ctx.request_context.lifespan_context.odoo
     try:
+        odoo = await ctx.request_context.lifespan_context.async_client(target)
         args = args or []
         kwargs = kwargs or {}
 
-        # Special handling for search methods like search, search_count, search_read
-        search_methods = ["search", "search_count", "search_read"]
-        if method in search_methods and args:
-            # Search methods usually have domain as the first parameter
-            # args: [[domain], limit, offset, ...] or [domain, limit, offset, ...]
-            normalized_args = list(
-                args
-            )  # Create a copy to avoid affecting the original args
-
-            if len(normalized_args) > 0:
-                # Process domain in args[0]
-                domain = normalized_args[0]
-                domain_list = []
-
-                # Check if domain is wrapped unnecessarily ([domain] instead of domain)
-                if (
-                    isinstance(domain, list)
-                    and len(domain) == 1
-                    and isinstance(domain[0], list)
-                ):
-                    # Case [[domain]] - unwrap to [domain]
-                    domain = domain[0]
-
-                # Normalize domain similar to search_records function
-                if domain is None:
-                    domain_list = []
-                elif isinstance(domain, dict):
-                    if "conditions" in domain:
-                        # Object format
-                        conditions = domain.get("conditions", [])
-                        domain_list = []
-                        for cond in conditions:
-                            if isinstance(cond, dict) and all(
-                                k in cond for k in ["field", "operator", "value"]
-                            ):
-                                domain_list.append(
-                                    [cond["field"], cond["operator"], cond["value"]]
-                                )
-                elif isinstance(domain, list):
-                    # List format
-                    if not domain:
-                        domain_list = []
-                    elif all(isinstance(item, list) for item in domain) or any(
-                        item in ["&", "|", "!"] for item in domain
-                    ):
-                        domain_list = domain
-                    elif len(domain) >= 3 and isinstance(domain[0], str):
-                        # Case [field, operator, value] (not [[field, operator, value]])
-                        domain_list = [domain]
-                elif isinstance(domain, str):
-                    # String format (JSON)
-                    try:
-                        parsed_domain = json.loads(domain)
-                        if (
-                            isinstance(parsed_domain, dict)
-                            and "conditions" in parsed_domain
-                        ):
-                            conditions = parsed_domain.get("conditions", [])
-                            domain_list = []
-                            for cond in conditions:
-                                if isinstance(cond, dict) and all(
-                                    k in cond for k in ["field", "operator", "value"]
-                                ):
-                                    domain_list.append(
-                                        [cond["field"], cond["operator"], cond["value"]]
-                                    )
-                        elif isinstance(parsed_domain, list):
-                            domain_list = parsed_domain
-                    except json.JSONDecodeError:
-                        try:
-                            import ast
-
-                            parsed_domain = ast.literal_eval(domain)
-                            if isinstance(parsed_domain, list):
-                                domain_list = parsed_domain
-                        except:
-                            domain_list = []
-
-                # Xác thực domain_list
-                if domain_list:
-                    valid_conditions = []
-                    for cond in domain_list:
-                        if isinstance(cond, str) and cond in ["&", "|", "!"]:
-                            valid_conditions.append(cond)
-                            continue
-
-                        if (
-                            isinstance(cond, list)
-                            and len(cond) == 3
-                            and isinstance(cond[0], str)
-                            and isinstance(cond[1], str)
-                        ):
-                            valid_conditions.append(cond)
-
-                    domain_list = valid_conditions
-
-                # Cập nhật args với domain đã chuẩn hóa
-                normalized_args[0] = domain_list
-                args = normalized_args
-
-                # Log for debugging
-                print(f"Executing {method} with normalized domain: {domain_list}")
-
-        result = odoo.execute_method(model, method, *args, **kwargs)
-        return {"success": True, "result": result}
+        args = normalize_search_args(method, args)
+        await validate_search_args(odoo, model, method, args)
+
+        result = await odoo.execute_method(model, method, *args, **kwargs)
+        return format_response({"success": True, "result": result}, output_format)
     except Exception as e:
-        return {"success": False, "error": str(e)}
+        return format_response({"success": False, "error": str(e)}, output_format)
+
+
+@mcp.tool(
+    description="Execute many methods on Odoo models in one call, "
+    "results are returned in order with per-operation errors"
+)
+@instrument("tool")
+async def execute_batch(
+    ctx: Context,
+    operations: List[BatchOperation],
+    target: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> Union[Dict[str, Any], str]:
+    """
+    Execute a batch of methods on Odoo models
+
+    Operations run concurrently over the connection pool, or in a single
+    system.multicall request when the server supports it. Search domains are
+    normalized like in execute_method.
+
+    Parameters:
+        operations: List of operations with model, method, args and kwargs
+        output_format: 'json' (default), 'compact' or 'columnar' (lists
+            of records as {columns, rows})
+        target: Name of the Odoo target to call (default target if
+            omitted), see the odoo://targets resource.
+
+    Returns:
+        Dictionary containing:
+        - success: Boolean indicating the batch was executed
+        - results: One {success, result | error} entry per operation, in order
+        - error: Error message (if the whole batch failed)
+    """
+    try:
+        odoo = await ctx.request_context.lifespan_context.async_client(target)
+    except Exception as e:
+        return format_response({"success": False, "error": str(e)}, output_format)
+    if len(operations) > MAX_BATCH_SIZE:
+        return format_response(
+            {
+                "success": False,
+                "error": f"Too many operations: {len(operations)} "
+                f"(maximum {MAX_BATCH_SIZE})",
+            },
+            output_format,
+        )
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+    pending = []
+    positions = []
+    for index, operation in enumerate(operations):
+        try:
+            args = normalize_search_args(operation.method, operation.args or [])
+            await validate_search_args(odoo, operation.model, operation.method, args)
+        except Exception as e:
+            results[index] = {"success": False, "error": str(e)}
+            continue
+        pending.append(
+            (operation.model, operation.method, args, operation.kwargs or {})
+        )
+        positions.append(index)
+
+    try:
+        outcomes = await odoo.execute_batch(pending)
+    except Exception as e:
+        return format_response({"success": False, "error": str(e)}, output_format)
+
+    for index, outcome in zip(positions, outcomes):
+        results[index] = outcome
+    return format_response({"success": True, "results": results}, output_format)
 
 
 @mcp.tool(description="Search for employees by name")
-def search_employee(
+@instrument("tool")
+async def search_employee(
     ctx: Context,
     name: str,
     limit: int = 20,
-) -> SearchEmployeeResponse:
+    target: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> Union[SearchEmployeeResponse, str]:
     """
-    Search for employees by name using Odoo's name_search method.
+    Search for employees by name using Odoo's name_search method, or the
+    local employee directory when it is enabled (ODOO_EMPLOYEE_INDEX).
+
+    The directory returns the same employees as name_search: those of the
+    server user's allowed companies whose name contains the query, except
+    that accents are ignored. When nothing matches, close spellings from
+    the directory are returned apart, in suggestions, never in result.
 
     Parameters:
         name: The name (or part of the name) to search for.
         limit: The maximum number of results to return (default 20).
+        output_format: 'json' (default), 'compact' or 'columnar' (lists
+            of records as {columns, rows}).
+        target: Name of the Odoo target to call (default target if
+            omitted), see the odoo://targets resource.
 
     Returns:
         SearchEmployeeResponse containing results or error information.
     """
-    odoo = ctx.request_context.lifespan_context.odoo
-    model = "hr.employee"
-    method = "name_search"
-
-    args = []
-    kwargs = {"name": name, "limit": limit}
-
     try:
-        result = odoo.execute_method(model, method, *args, **kwargs)
+        odoo = await ctx.request_context.lifespan_context.async_client(target)
+        result = await odoo.search_employees(name, limit=limit)
         parsed_result = [
             EmployeeSearchResult(id=item[0], name=item[1]) for item in result
         ]
-        return SearchEmployeeResponse(success=True, result=parsed_result)
+        suggestions = None
+        if not parsed_result:
+            suggestions = [
+                EmployeeSearchResult(id=item[0], name=item[1])
+                for item in odoo.suggest_employees(name, limit=limit)
+            ] or None
+        return format_response(
+            SearchEmployeeResponse(
+                success=True, result=parsed_result, suggestions=suggestions
+            ),
+            output_format,
+        )
     except Exception as e:
-        return SearchEmployeeResponse(success=False, error=str(e))
+        return format_response(
+            SearchEmployeeResponse(success=False, error=str(e)), output_format
+        )
 
 
 @mcp.tool(description="Search for holidays within a date range")
-def search_holidays(
+@instrument("tool")
+async def search_holidays(
     ctx: Context,
     start_date: str,
     end_date: str,
     employee_id: Optional[int] = None,
-) -> SearchHolidaysResponse:
+    employee_ids: Optional[List[int]] = None,
+    target: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> Union[SearchHolidaysResponse, str]:
     """
     Searches for holidays within a specified date range.
 
+    With ODOO_LEAVE_CACHE enabled, leaves are served from a date-range
+    cache and only the parts of the window not fetched recently are read
+    from Odoo; otherwise every call reads the whole window.
+
     Parameters:
         start_date: Start date in YYYY-MM-DD format.
         end_date: End date in YYYY-MM-DD format.
         employee_id: Optional employee ID to filter holidays.
+        employee_ids: Optional employee IDs to filter holidays, for several
+            employees in one call (combined with employee_id).
+        output_format: 'json' (default), 'compact' or 'columnar' (lists
+            of records as {columns, rows}).
+        target: Name of the Odoo target to call (default target if
+            omitted), see the odoo://targets resource.
 
     Returns:
         SearchHolidaysResponse:  Object containing the search results.
     """
-    odoo = ctx.request_context.lifespan_context.odoo
-
     # Validate date format using datetime
     try:
-        datetime.strptime(start_date, "%Y-%m-%d")
+        start_day = datetime.strptime(start_date, "%Y-%m-%d")
     except ValueError:
-        return SearchHolidaysResponse(
-            success=False, error="Invalid start_date format. Use YYYY-MM-DD."
+        return format_response(
+            SearchHolidaysResponse(
+                success=False, error="Invalid start_date format. Use YYYY-MM-DD."
+            ),
+            output_format,
         )
     try:
-        datetime.strptime(end_date, "%Y-%m-%d")
+        end_day = datetime.strptime(end_date, "%Y-%m-%d")
     except ValueError:
-        return SearchHolidaysResponse(
-            success=False, error="Invalid end_date format. Use YYYY-MM-DD."
+        return format_response(
+            SearchHolidaysResponse(
+                success=False, error="Invalid end_date format. Use YYYY-MM-DD."
+            ),
+            output_format,
         )
 
-    # Calculate adjusted start_date (subtract one day)
-    start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    adjusted_start_date_dt = start_date_dt - timedelta(days=1)
-    adjusted_start_date = adjusted_start_date_dt.strftime("%Y-%m-%d")
-
-    # Build the domain
-    domain = [
-        "&",
-        ["start_datetime", "<=", f"{end_date} 22:59:59"],
-        # Use adjusted date
-        ["stop_datetime", ">=", f"{adjusted_start_date} 23:00:00"],
-    ]
-    if employee_id:
-        domain.append(
-            ["employee_id", "=", employee_id],
+    # Leaves overlapping [start_date - 1 day 23:00:00, end_date 22:59:59]
+    window_start = start_day - timedelta(hours=1)
+    window_stop = end_day + timedelta(hours=22, minutes=59, seconds=59)
+
+    employees = None
+    if employee_id or employee_ids:
+        employees = sorted(set(employee_ids or []) | ({employee_id} - {None, 0}))
+
+    try:
+        odoo = await ctx.request_context.lifespan_context.async_client(target)
+        holidays = await odoo.search_leave_calendar(
+            window_start, window_stop, employee_ids=employees
+        )
+        # One validation pass over all rows instead of a model per row
+        response = SearchHolidaysResponse.model_validate(
+            {"success": True, "result": holidays}
+        )
+        return format_response(response, output_format)
+
+    except Exception as e:
+        return format_response(
+            SearchHolidaysResponse(success=False, error=str(e)), output_format
         )
 
+
+@mcp.tool(
+    description="Page through large search results with an opaque cursor "
+    "(keyset pagination, constant cost per page)"
+)
+@instrument("tool")
+async def search_records_page(
+    ctx: Context,
+    model: str,
+    domain: Optional[Union[List, str]] = None,
+    fields: Optional[List[str]] = None,
+    batch_size: int = 500,
+    cursor: Optional[str] = None,
+    include_binary: bool = False,
+    target: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> Union[RecordPageResponse, str]:
+    """
+    Return one page of matching records and a cursor for the next page.
+
+    Pages are fetched with ``id > last_id`` instead of an offset, so walking
+    millions of rows costs the same per page from start to end.
+
+    Parameters:
+        model: The model name (e.g., 'account.move.line').
+        domain: Search domain as a list or JSON string (first call only).
+        fields: Field names to return (first call only, None for stored
+            scalar and many2one fields).
+        batch_size: Records per page (first call only, max 5000).
+        cursor: next_cursor of the previous page; model, domain, fields,
+            batch_size, include_binary and target are taken from it.
+        include_binary: Also return binary fields such as images when no
+            fields are given (first call only).
+        output_format: 'json' (default), 'compact' or 'columnar' (lists
+            of records as {columns, rows}).
+        target: Name of the Odoo target to call (default target if
+            omitted), see the odoo://targets resource.
+
+    Returns:
+        RecordPageResponse with the records and the next cursor (null when
+        there are no more records).
+    """
     try:
-        holidays = odoo.search_read(
-            model_name="hr.leave.report.calendar",
-            domain=domain,
+        if cursor:
+            state = decode_cursor(cursor)
+            if state["model"] != model:
+                raise ValueError(
+                    f"Cursor belongs to model {state['model']}, not {model}"
+                )
+            if target and target != state.get("target"):
+                raise ValueError(
+                    f"Cursor belongs to target {state.get('target')}, not {target}"
+                )
+            odoo = await ctx.request_context.lifespan_context.async_client(
+                state.get("target")
+            )
+        else:
+            odoo = await ctx.request_context.lifespan_context.async_client(target)
+            domain = compile_domain(domain)
+            await validate_search_args(odoo, model, "search_read", [domain])
+            state = {
+                "model": model,
+                "domain": domain,
+                "fields": fields,
+                "batch_size": max(1, min(batch_size, MAX_PAGE_SIZE)),
+                "last_id": 0,
+            }
+            if target:
+                state["target"] = target
+            if include_binary:
+                state["include_binary"] = True
+
+        batches = odoo.iter_search_read(
+            state["model"],
+            state["domain"],
+            fields=state["fields"],
+            batch_size=state["batch_size"],
+            after_id=state["last_id"],
+            include_binary=state.get("include_binary", False),
+        )
+        try:
+            records = await anext(batches, [])
+        finally:
+            await batches.aclose()
+
+        next_cursor = None
+        if len(records) == state["batch_size"]:
+            next_cursor = encode_cursor(dict(state, last_id=records[-1]["id"]))
+        return format_response(
+            RecordPageResponse(success=True, result=records, next_cursor=next_cursor),
+            output_format,
         )
-        parsed_holidays = [Holiday(**holiday) for holiday in holidays]
-        return SearchHolidaysResponse(success=True, result=parsed_holidays)
+    except Exception as e:
+        return format_response(
+            RecordPageResponse(success=False, error=str(e)), output_format
+        )
+
+
+@mcp.tool(
+    description="Aggregate records server-side (totals, averages, counts) "
+    "grouped by fields or date periods, without reading every record"
+)
+@instrument("tool")
+async def aggregate_records(
+    ctx: Context,
+    model: str,
+    groupby: Union[List[str], str],
+    aggregates: Optional[List[str]] = None,
+    domain: Optional[Union[List, str]] = None,
+    lazy: bool = False,
+    orderby: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    include_domains: bool = False,
+    target: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> Union[AggregateResponse, str]:
+    """
+    Group matching records and aggregate their values with read_group.
 
+    Only one row per group travels over the wire, so totals per customer,
+    month or state cost a few rows instead of every record.
+
+    Parameters:
+        model: The model name (e.g., 'sale.order').
+        groupby: Fields to group by, with an optional date granularity
+            (hour, day, week, month, quarter, year), e.g.
+            ['partner_id', 'date_order:month'].
+        aggregates: Fields to aggregate with an optional function (sum,
+            avg, min, max, count, count_distinct, array_agg, bool_and,
+            bool_or), e.g. ['amount_total:sum']. A bare field name uses its
+            default aggregator; every group also has a record count.
+        domain: Search domain as a list or JSON string (None for every
+            record).
+        lazy: Group by the first field only (Odoo's default) instead of
+            returning every combination of the groupby fields.
+        orderby: Sorting of the groups (e.g., 'amount_total desc').
+        limit: Maximum number of groups to return.
+        offset: Number of groups to skip.
+        include_domains: Add the '__domain' of each group, to read its
+            records afterwards.
+        output_format: 'json' (default), 'compact' or 'columnar' (lists
+            of records as {columns, rows}).
+        target: Name of the Odoo target to call (default target if
+            omitted), see the odoo://targets resource.
+
+    Returns:
+        AggregateResponse with one row per group.
+    """
+    try:
+        odoo = await ctx.request_context.lifespan_context.async_client(target)
+        domain = compile_domain(domain)
+        groupby = parse_groupby(groupby)
+        aggregates = parse_aggregates(aggregates)
+        fields_info = await odoo.get_model_fields(model)
+        if not isinstance(fields_info.get("error"), str):
+            validate_domain(domain, fields_info)
+            validate_grouping(groupby, aggregates, fields_info)
+
+        groups = await odoo.read_group(
+            model,
+            domain,
+            groupby,
+            aggregates=aggregates,
+            offset=offset,
+            limit=limit,
+            orderby=orderby,
+            lazy=lazy,
+        )
+        hidden = (
+            GROUP_CONTEXT_KEYS
+            if include_domains
+            else (GROUP_CONTEXT_KEYS + ("__domain",))
+        )
+        result = [
+            {key: value for key, value in group.items() if key not in hidden}
+            for group in groups
+        ]
+        return format_response(
+            AggregateResponse(success=True, result=result), output_format
+        )
     except Exception as e:
-        return SearchHolidaysResponse(success=False, error=str(e))
+        return format_response(
+            AggregateResponse(success=False, error=str(e)), output_format
+        )
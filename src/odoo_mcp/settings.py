@@ -0,0 +1,27 @@
+"""
+Parsing of the settings given as environment variables or configuration
+"""
+
+import os
+
+# Values of a boolean setting meaning "on", compared case-insensitively
+TRUE_VALUES = ("1", "true", "yes")
+
+
+def flag(value):
+    """Read a boolean setting given as a string or a JSON boolean"""
+    return str(value).lower() in TRUE_VALUES
+
+
+def env_flag(variable, default):
+    """
+    Read a boolean environment variable
+
+    Args:
+        variable: Name of the environment variable
+        default: Value used when it is not set ('1' or '0')
+
+    Returns:
+        bool: Whether the setting is on
+    """
+    return flag(os.environ.get(variable, default))
@@ -0,0 +1,31 @@
+"""
+Shared fixtures of the test suite
+"""
+
+import pytest
+from fake_odoo import FakeOdoo
+
+
+@pytest.fixture(scope="module")
+def fake_server():
+    """A fake Odoo server with a few records, shared by a test module"""
+    with FakeOdoo(records=50) as server:
+        yield server
+
+
+@pytest.fixture
+def fake_odoo(fake_server):
+    """The fake Odoo server, with its request counters cleared"""
+    fake_server.stats(reset=True)
+    return fake_server
+
+
+@pytest.fixture
+def odoo_config(fake_odoo):
+    """Configuration of a target pointing at the fake server"""
+    return {
+        "url": fake_odoo.url,
+        "db": fake_odoo.db,
+        "username": "admin",
+        "password": "admin",
+    }
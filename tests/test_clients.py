@@ -0,0 +1,108 @@
+"""
+Round trips of the sync and asyncio clients against the fake Odoo server
+"""
+
+import asyncio
+
+import pytest
+
+from odoo_mcp.async_client import AsyncOdooClient
+from odoo_mcp.coalesce import CallCoalescer
+from odoo_mcp.odoo_client import OdooClient
+from odoo_mcp.result_cache import ResultCache
+
+PROTOCOLS = ["xmlrpc", "jsonrpc"]
+
+
+@pytest.mark.parametrize("protocol", PROTOCOLS)
+def test_sync_client_round_trip(fake_odoo, odoo_config, protocol):
+    client = OdooClient(**odoo_config, protocol=protocol, result_cache=ResultCache())
+    try:
+        assert client.uid == 2
+        fields = client.get_model_fields("res.partner")
+        assert fields["name"]["type"] == "char"
+
+        records = client.search_read(
+            "res.partner", [["id", "<=", 3]], fields=["name"], order="id"
+        )
+        assert [record["id"] for record in records] == [1, 2, 3]
+        # The lean projection leaves binary and non-stored fields out
+        (record,) = client.read_records("res.partner", [1])
+        assert "name" in record and "image_1920" not in record
+
+        count = client.execute_method("res.partner", "search_count", [])
+        assert count == 50
+        assert client.execute_method("res.partner", "search_count", []) == 50
+        assert fake_odoo.stats()["methods"]["res.partner.search_count"] == 1
+
+        # A write invalidates the cached reads of the model
+        client.execute_method("res.partner", "write", [1], {"name": "Renamed"})
+        (record,) = client.execute_method("res.partner", "read", [1], ["name"])
+        assert record["name"] == "Renamed"
+
+        outcomes = client.execute_batch(
+            [
+                ("res.partner", "search_count", [[]], {}),
+                ("res.partner", "no_such_method", [], {}),
+            ]
+        )
+        assert outcomes[0] == {"success": True, "result": 50}
+        assert outcomes[1]["success"] is False
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("protocol", PROTOCOLS)
+def test_async_client_round_trip(fake_odoo, odoo_config, protocol):
+    async def main():
+        client = AsyncOdooClient(
+            **odoo_config, protocol=protocol, coalescer=CallCoalescer()
+        )
+        try:
+            # Nothing is sent before the first call, which authenticates
+            assert client.uid is None
+            records = await client.search_read(
+                "res.partner", [["id", "<=", 3]], fields=["name"], order="id"
+            )
+            assert client.uid == 2
+            assert [record["id"] for record in records] == [1, 2, 3]
+
+            # Concurrent identical reads share one request
+            counts = await asyncio.gather(
+                *(
+                    client.execute_method("res.partner", "search_count", [])
+                    for _ in range(5)
+                )
+            )
+            assert counts == [50] * 5
+            assert fake_odoo.stats()["methods"]["res.partner.search_count"] == 1
+            assert client.coalescer.stats["coalesced"] == 4
+
+            ids = list(range(1, 51))
+            client.read_batch_size = 20
+            records = await client.read_records("res.partner", ids, ["name"])
+            assert [record["id"] for record in records] == ids
+
+            batches = [
+                batch
+                async for batch in client.iter_search_read(
+                    "res.partner", [], ["name"], batch_size=20
+                )
+            ]
+            assert [len(batch) for batch in batches] == [20, 20, 10]
+        finally:
+            await client.aclose()
+
+    asyncio.run(main())
+
+
+def test_async_client_reports_failed_authentication(fake_odoo, odoo_config):
+    async def main():
+        client = AsyncOdooClient(**dict(odoo_config, db="missing"))
+        try:
+            with pytest.raises(ValueError, match="authenticate"):
+                await client.connect()
+        finally:
+            await client.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Tests of the single flight of identical calls
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from odoo_mcp.coalesce import CallCoalescer
+
+KEY = ("db", "res.partner", "search_read", "[]")
+
+
+def test_thread_followers_get_a_copy_of_the_leader_result():
+    coalescer = CallCoalescer()
+    started, finish = threading.Event(), threading.Event()
+    calls = []
+    results = {}
+
+    def call():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+        return [{"id": 1, "tags": ["a"]}]
+
+    def run(name):
+        results[name] = coalescer.run(KEY, call)
+
+    leader = threading.Thread(target=run, args=("leader",))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run, args=("follower",))
+    follower.start()
+    while coalescer.stats["coalesced"] < 1:
+        finish.wait(0.001)
+    finish.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert results["follower"] == results["leader"]
+    results["follower"][0]["tags"].append("b")
+    assert results["leader"] == [{"id": 1, "tags": ["a"]}]
+    assert coalescer.snapshot()["in_flight"] == 0
+
+
+def test_thread_followers_get_the_leader_error():
+    coalescer = CallCoalescer()
+    started, finish = threading.Event(), threading.Event()
+    errors = []
+
+    def call():
+        started.set()
+        finish.wait(5)
+        raise ValueError("boom")
+
+    def run():
+        try:
+            coalescer.run(KEY, call)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    threads[0].start()
+    started.wait(5)
+    threads[1].start()
+    while coalescer.stats["coalesced"] < 1:
+        finish.wait(0.001)
+    finish.set()
+    for thread in threads:
+        thread.join(5)
+    assert [str(e) for e in errors] == ["boom", "boom"]
+
+
+def test_task_followers_get_a_copy_and_survive_a_cancelled_leader():
+    coalescer = CallCoalescer()
+    calls = []
+
+    async def main():
+        release = asyncio.Event()
+
+        async def call():
+            calls.append(1)
+            await release.wait()
+            return {"rows": [1, 2]}
+
+        leader = asyncio.create_task(coalescer.arun(KEY, call))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(coalescer.arun(KEY, call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        # The first follower takes over the call
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*followers)
+
+    first, second = asyncio.run(main())
+    assert first == second == {"rows": [1, 2]}
+    assert first is not second
+    assert len(calls) == 2
+    assert coalescer.snapshot()["in_flight"] == 0
+
+
+def test_forget_stops_new_callers_from_joining():
+    coalescer = CallCoalescer()
+    started, finish = threading.Event(), threading.Event()
+    calls = []
+
+    def call():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+        return len(calls)
+
+    leader = threading.Thread(target=coalescer.run, args=(KEY, call))
+    leader.start()
+    started.wait(5)
+    coalescer.forget("db", "res.partner")
+    finish.set()
+    # Not joined to the flight of the leader, which may predate a write
+    assert coalescer.run(KEY, call) == 2
+    leader.join(5)
+    assert coalescer.stats["coalesced"] == 0
@@ -0,0 +1,99 @@
+"""
+Tests of the domain compiler
+"""
+
+import re
+
+import pytest
+
+from odoo_mcp.domain import DomainError, compile_domain, validate_domain
+
+FIELDS = {
+    "id": {"type": "integer"},
+    "name": {"type": "char"},
+    "is_company": {"type": "boolean"},
+    "parent_id": {"type": "many2one"},
+    "category_id": {"type": "many2many"},
+}
+
+
+@pytest.mark.parametrize(
+    "domain, expected",
+    [
+        (None, []),
+        ([], []),
+        (["name", "=", "Acme"], [["name", "=", "Acme"]]),
+        ([["name", "=", "Acme"]], [["name", "=", "Acme"]]),
+        ([[["name", "=", "Acme"]]], [["name", "=", "Acme"]]),
+        ((("name", "in", ("a", "b")),), [["name", "in", ["a", "b"]]]),
+        ([["name", "ILIKE", "ac"]], [["name", "ilike", "ac"]]),
+        ('[["is_company", "=", true]]', [["is_company", "=", True]]),
+        ("[('is_company', '=', True)]", [["is_company", "=", True]]),
+        (
+            {"conditions": [{"field": "name", "operator": "=", "value": "x"}]},
+            [["name", "=", "x"]],
+        ),
+        (
+            ["|", ["name", "=", "a"], ["name", "=", "b"]],
+            ["|", ["name", "=", "a"], ["name", "=", "b"]],
+        ),
+        ([[1, "=", 1]], [[1, "=", 1]]),
+    ],
+)
+def test_compile_normalizes_accepted_shapes(domain, expected):
+    assert compile_domain(domain) == expected
+
+
+@pytest.mark.parametrize(
+    "domain, message",
+    [
+        ("not a domain (", "neither JSON nor a Python literal"),
+        (42, "must be a list"),
+        ({"field": "name"}, "'conditions' list"),
+        ({"conditions": [{"field": "name"}]}, "Invalid condition"),
+        ([["name", "~", "x"]], "Unknown operator"),
+        ([["", "=", "x"]], "Invalid field name"),
+        ([["name", "="]], "expected [field, operator, value]"),
+        (["&", ["name", "=", "x"]], "missing operands"),
+        (["^", ["name", "=", "x"]], "Unknown domain operator"),
+    ],
+)
+def test_compile_rejects_malformed_domains(domain, message):
+    with pytest.raises(DomainError, match=re.escape(message)):
+        compile_domain(domain)
+
+
+def test_compile_returns_a_private_copy():
+    domain = [["name", "in", ["a"]]]
+    compile_domain(domain)[0][2].append("b")
+    assert compile_domain(domain) == [["name", "in", ["a"]]]
+
+
+def test_validate_accepts_known_fields_and_relational_paths():
+    domain = compile_domain(
+        [
+            "|",
+            ["name", "ilike", "acme"],
+            ["parent_id.name", "=", "Root"],
+            ["category_id", "child_of", 1],
+            ["id", "parent_of", 3],
+            [1, "=", 1],
+        ]
+    )
+    validate_domain(domain, FIELDS)
+
+
+def test_validate_lists_every_invalid_condition():
+    domain = compile_domain(
+        [
+            ["nickname", "=", "x"],
+            ["name.first", "=", "x"],
+            ["is_company", "child_of", 1],
+        ]
+    )
+    with pytest.raises(DomainError) as error:
+        validate_domain(domain, FIELDS)
+    message = str(error.value)
+    assert "unknown field 'nickname'" in message
+    assert "'name' is a char field, it has no 'first'" in message
+    assert "operator 'child_of' needs a relational field" in message
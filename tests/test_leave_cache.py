@@ -0,0 +1,119 @@
+"""
+Tests of the date-range cache of the leave calendar
+"""
+
+from datetime import datetime, timedelta
+
+from odoo_mcp.leave_cache import LeaveCalendarCache, subtract_intervals
+
+SECOND = timedelta(seconds=1)
+
+
+def day(number, hour=0):
+    return datetime(2025, 1, number, hour)
+
+
+def leave(leave_id, employee_id, start, stop):
+    return {
+        "id": leave_id,
+        "employee_id": [employee_id, f"Employee {employee_id}"],
+        "start_datetime": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "stop_datetime": stop.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def test_subtract_without_intervals_returns_the_window():
+    assert subtract_intervals(day(1), day(10), []) == [(day(1), day(10))]
+
+
+def test_subtract_returns_the_gaps_in_order():
+    intervals = [(day(2), day(3)), (day(5), day(6))]
+    assert subtract_intervals(day(1), day(10), intervals) == [
+        (day(1), day(2) - SECOND),
+        (day(3) + SECOND, day(5) - SECOND),
+        (day(6) + SECOND, day(10)),
+    ]
+
+
+def test_subtract_handles_overlapping_and_outside_intervals():
+    intervals = [
+        (datetime(2024, 12, 1), datetime(2024, 12, 2)),
+        (day(1), day(4)),
+        (day(3), day(6)),
+        (day(20), day(25)),
+    ]
+    assert subtract_intervals(day(1), day(10), intervals) == [
+        (day(6) + SECOND, day(10))
+    ]
+
+
+def test_subtract_covered_window_has_no_gap():
+    assert subtract_intervals(day(2), day(3), [(day(1), day(5))]) == []
+
+
+def test_plan_fetches_only_the_missing_ranges():
+    cache = LeaveCalendarCache()
+    ranges, generation = cache.plan(day(1), day(10))
+    assert ranges == [(day(1), day(10), None)]
+    cache.store(day(1), day(10), None, [], generation)
+
+    ranges, _ = cache.plan(day(5), day(15))
+    assert ranges == [(day(10) + SECOND, day(15), None)]
+    ranges, _ = cache.plan(day(2), day(8))
+    assert ranges == []
+    assert cache.stats["misses"] == 1
+    assert cache.stats["partial_hits"] == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_plan_groups_employees_missing_the_same_range():
+    cache = LeaveCalendarCache()
+    _, generation = cache.plan(day(1), day(5), [1])
+    cache.store(day(1), day(5), [1], [], generation)
+
+    ranges, _ = cache.plan(day(1), day(10), [1, 2, 3])
+    assert ranges == [
+        (day(5) + SECOND, day(10), [1]),
+        (day(1), day(10), [2, 3]),
+    ]
+
+
+def test_all_employee_window_covers_single_employees():
+    cache = LeaveCalendarCache()
+    rows = [leave(1, 7, day(2), day(3)), leave(2, 8, day(4), day(5))]
+    _, generation = cache.plan(day(1), day(10))
+    cache.store(day(1), day(10), None, rows, generation)
+
+    assert cache.plan(day(1), day(10), [7])[0] == []
+    assert [row["id"] for row in cache.lookup(day(1), day(10), [7])] == [1]
+
+
+def test_newest_fetch_wins_across_scopes():
+    cache = LeaveCalendarCache()
+    _, generation = cache.plan(day(1), day(10))
+    cache.store(day(1), day(10), None, [leave(1, 7, day(2), day(3))], generation)
+    # The leave was moved, a later fetch for the employee sees it elsewhere
+    _, generation = cache.plan(day(1), day(10), [7])
+    cache.store(day(1), day(10), [7], [leave(1, 7, day(6), day(7))], generation)
+
+    for employee_ids in (None, [7]):
+        rows = cache.lookup(day(1), day(10), employee_ids)
+        assert [row["start_datetime"] for row in rows] == ["2025-01-06 00:00:00"]
+
+
+def test_store_is_dropped_after_an_invalidation():
+    cache = LeaveCalendarCache()
+    _, generation = cache.plan(day(1), day(10))
+    cache.invalidate("hr.leave")
+    cache.store(day(1), day(10), None, [leave(1, 7, day(2), day(3))], generation)
+
+    assert cache.lookup(day(1), day(10)) == []
+    assert cache.plan(day(1), day(10))[0] == [(day(1), day(10), None)]
+
+
+def test_unrelated_models_keep_the_cache():
+    cache = LeaveCalendarCache()
+    _, generation = cache.plan(day(1), day(10))
+    cache.store(day(1), day(10), None, [], generation)
+    cache.invalidate("res.partner")
+    assert cache.plan(day(1), day(10))[0] == []
@@ -0,0 +1,145 @@
+"""
+Tests of the concurrency limiter
+"""
+
+import asyncio
+
+import pytest
+
+from odoo_mcp.limiter import ConcurrencyLimiter, parse_priorities
+
+
+def overloaded(error):
+    return isinstance(error, ConnectionError)
+
+
+def fail(limiter, method="read"):
+    with pytest.raises(ConnectionError):
+        with limiter.slot(method, overloaded):
+            raise ConnectionError("unreachable")
+
+
+def succeed(limiter, times, method="read"):
+    for _ in range(times):
+        with limiter.slot(method, overloaded):
+            pass
+
+
+async def wait_queued(limiter, count):
+    while sum(limiter.snapshot()["waiting"].values()) < count:
+        await asyncio.sleep(0)
+
+
+def test_queued_calls_are_served_by_priority_then_arrival():
+    limiter = ConcurrencyLimiter(max_concurrency=1)
+    served = []
+
+    async def call(name, method):
+        async with limiter.aslot(method):
+            served.append(name)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.aslot("read"):
+                await release.wait()
+
+        tasks = [asyncio.create_task(holder())]
+        await wait_queued(limiter, 0)
+        for count, (name, method) in enumerate(
+            [
+                ("export", "export_data"),
+                ("read 1", "read"),
+                ("count", "search_count"),
+                ("read 2", "read"),
+            ],
+            start=1,
+        ):
+            tasks.append(asyncio.create_task(call(name, method)))
+            await wait_queued(limiter, count)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert served == ["count", "read 1", "read 2", "export"]
+    assert limiter.snapshot()["in_flight"] == 0
+
+
+def test_priorities_can_be_overridden():
+    limiter = ConcurrencyLimiter(priorities=parse_priorities("read_group=low"))
+    assert limiter.priority("read_group") == "low"
+    assert limiter.priority("search_count") == "high"
+    with pytest.raises(ValueError):
+        parse_priorities("read_group=urgent")
+
+
+def test_aimd_halves_on_overload_and_grows_back_by_one():
+    limiter = ConcurrencyLimiter(max_concurrency=8, adaptive=True, latency_target=60)
+
+    fail(limiter)
+    assert limiter.limit == 4
+    # At most one decrease per latency_target
+    fail(limiter)
+    assert limiter.limit == 4
+
+    # One more slot after a full window of fast calls
+    succeed(limiter, 3)
+    assert limiter.limit == 4
+    succeed(limiter, 1)
+    assert limiter.limit == 5
+    succeed(limiter, 5)
+    assert limiter.limit == 6
+    assert limiter.stats["decreases"] == 1
+    assert limiter.stats["increases"] == 2
+
+
+def test_aimd_stays_within_bounds():
+    limiter = ConcurrencyLimiter(
+        max_concurrency=2, min_concurrency=2, adaptive=True, latency_target=0
+    )
+    fail(limiter)
+    assert limiter.limit == 2
+    succeed(limiter, 10)
+    assert limiter.limit == 2
+
+
+def test_errors_that_are_not_overload_keep_the_limit():
+    limiter = ConcurrencyLimiter(max_concurrency=4, adaptive=True, latency_target=60)
+    with pytest.raises(ValueError):
+        with limiter.slot("read", overloaded):
+            raise ValueError("bad domain")
+    assert limiter.limit == 4
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    limiter = ConcurrencyLimiter(max_concurrency=1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.aslot("read"):
+                await release.wait()
+
+        async def waiter():
+            async with limiter.aslot("read"):
+                pass
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(waiter())
+        await wait_queued(limiter, 1)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert limiter.snapshot()["waiting"]["normal"] == 0
+
+        release.set()
+        await held
+        # The abandoned waiter did not keep the slot
+        assert limiter.snapshot()["in_flight"] == 0
+        async with limiter.aslot("read"):
+            assert limiter.snapshot()["in_flight"] == 1
+
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Tests of the keep-alive connection pool
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from odoo_mcp.pool import ConnectionPool, PoolTimeoutError
+
+HOST = "odoo.example.com"
+
+
+class Connection:
+    """Stand-in for http.client.HTTPConnection"""
+
+    def __init__(self, host):
+        self.host = host
+        self.sock = None
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def connected(connection):
+    """Give a connection one end of a socket pair, return the other end"""
+    connection.sock, peer = socket.socketpair()
+    return peer
+
+
+def test_idle_connections_are_reused():
+    pool = ConnectionPool(Connection)
+    connection = pool.acquire(HOST)
+    peer = connected(connection)
+    pool.release(HOST, connection)
+
+    assert pool.acquire(HOST) is connection
+    assert pool.stats["created"] == 1
+    assert pool.stats["reused"] == 1
+    peer.close()
+    connection.sock.close()
+
+
+def test_acquire_times_out_when_the_pool_is_exhausted():
+    pool = ConnectionPool(Connection, max_size=1, acquire_timeout=0.05)
+    pool.acquire(HOST)
+
+    start = time.monotonic()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(HOST)
+    assert time.monotonic() - start >= 0.05
+    assert pool.stats["waits"] >= 1
+    # Other hosts have their own connections
+    assert pool.acquire("other.example.com") is not None
+
+
+def test_waiter_gets_the_released_connection():
+    pool = ConnectionPool(Connection, max_size=1, acquire_timeout=5)
+    connection = pool.acquire(HOST)
+    peer = connected(connection)
+    timer = threading.Timer(0.05, pool.release, (HOST, connection))
+    timer.start()
+
+    assert pool.acquire(HOST) is connection
+    timer.join()
+    peer.close()
+    connection.sock.close()
+
+
+def test_connections_closed_by_the_server_are_evicted():
+    pool = ConnectionPool(Connection)
+    connection = pool.acquire(HOST)
+    peer = connected(connection)
+    pool.release(HOST, connection)
+    # The server closes the idle keep-alive socket
+    peer.close()
+
+    fresh = pool.acquire(HOST)
+    assert fresh is not connection
+    assert connection.closed
+    assert pool.stats["evicted_stale"] == 1
+    connection.sock.close()
+
+
+def test_connections_idle_too_long_are_evicted():
+    pool = ConnectionPool(Connection, idle_timeout=0.01)
+    connection = pool.acquire(HOST)
+    peer = connected(connection)
+    pool.release(HOST, connection)
+    time.sleep(0.02)
+
+    assert pool.acquire(HOST) is not connection
+    assert connection.closed
+    assert pool.stats["evicted_idle"] == 1
+    peer.close()
+    connection.sock.close()
+
+
+def test_unusable_connections_are_not_kept():
+    pool = ConnectionPool(Connection)
+    connection = pool.acquire(HOST)
+    peer = connected(connection)
+    pool.release(HOST, connection, reusable=False)
+
+    assert connection.closed
+    assert pool.snapshot()["idle"] == {}
+    assert pool.snapshot()["in_use"] == {HOST: 0}
+    peer.close()
+    connection.sock.close()
+
+
+def test_clear_keeps_the_pool_usable_and_close_does_not():
+    pool = ConnectionPool(Connection)
+    connection = pool.acquire(HOST)
+    peer = connected(connection)
+    pool.release(HOST, connection)
+
+    pool.clear()
+    assert connection.closed
+    assert pool.acquire(HOST) is not connection
+
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire(HOST)
+    peer.close()
+    connection.sock.close()
@@ -0,0 +1,122 @@
+"""
+Tests of the process-wide client registry
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fake_odoo import FakeOdoo
+
+from odoo_mcp.registry import ClientRegistry
+
+
+def make_registry(config):
+    # No sweeper thread: the tests release idle targets themselves
+    return ClientRegistry(lambda: ({"main": config}, "main"), idle_timeout=0)
+
+
+def expire(registry):
+    """Make every target idle for longer than the idle timeout"""
+    registry.idle_timeout = 0.01
+    time.sleep(0.02)
+
+
+def idle_connections(client):
+    return sum(client._transport.pool_stats()["idle"].values())
+
+
+def test_clients_are_shared_and_authenticate_once(odoo_config):
+    registry = make_registry(odoo_config)
+    client = registry.get_client()
+    assert registry.get_client("main") is client
+    assert registry.auth_count == 1
+    assert registry.stats()["targets"]["main"]["connected"]
+
+    with pytest.raises(ValueError, match="Unknown Odoo target 'other'"):
+        registry.get_client("other")
+    registry.reset()
+
+
+def test_idle_release_closes_the_connections(odoo_config):
+    registry = make_registry(odoo_config)
+    client = registry.get_client()
+    client.execute_method("res.partner", "search_count", [])
+    assert idle_connections(client) == 1
+
+    expire(registry)
+    assert registry.release_idle() == ["main"]
+    assert idle_connections(client) == 0
+    assert not registry.stats()["targets"]["main"]["connected"]
+
+    # The next use connects again
+    assert registry.get_client() is not client
+    assert registry.counters == {"connects": 2, "idle_releases": 1}
+    assert registry.auth_count == 2
+    registry.reset()
+
+
+def test_released_client_closes_after_its_calls_in_flight():
+    with FakeOdoo(records=5, latency=0.2) as server:
+        registry = make_registry(
+            {"url": server.url, "db": server.db, "username": "a", "password": "a"}
+        )
+        client = registry.get_client()
+        results = []
+        call = threading.Thread(
+            target=lambda: results.append(
+                client.execute_method("res.partner", "search_count", [])
+            )
+        )
+        call.start()
+        while not client.in_flight:
+            time.sleep(0.001)
+
+        expire(registry)
+        assert registry.release_idle() == ["main"]
+        # Still running on its connection
+        assert client.in_flight == 1
+        call.join()
+
+        assert results == [5]
+        assert client.in_flight == 0
+        assert idle_connections(client) == 0
+
+
+def test_async_client_is_closed_on_its_event_loop(odoo_config):
+    registry = make_registry(odoo_config)
+
+    async def main():
+        client = await registry.get_async_client()
+        assert await registry.get_async_client() is client
+        await client.execute_method("res.partner", "search_count", [])
+        assert client._http is not None
+
+        expire(registry)
+        # Released from another thread, like the sweeper does
+        assert await asyncio.to_thread(registry.release_idle) == ["main"]
+        for _ in range(100):
+            if client._http is None:
+                break
+            await asyncio.sleep(0.01)
+        assert client._http is None
+
+    asyncio.run(main())
+
+
+def test_clients_are_dropped_after_the_last_session(odoo_config):
+    registry = make_registry(odoo_config)
+
+    async def main():
+        registry.open()
+        registry.open()
+        client = await registry.get_async_client()
+        await registry.aclose()
+        assert registry.stats()["targets"]["main"]["connected"]
+
+        await registry.aclose()
+        assert not registry.stats()["targets"]["main"]["connected"]
+        assert client._http is None
+
+    asyncio.run(main())
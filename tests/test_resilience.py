@@ -0,0 +1,76 @@
+"""
+Tests of the circuit breaker and the retry policy
+"""
+
+import time
+import xmlrpc.client
+
+import pytest
+
+from odoo_mcp.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def test_circuit_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.snapshot()["trips"] == 1
+    assert breaker.snapshot()["rejected"] == 1
+
+
+def test_probe_success_closes_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["consecutive_failures"] == 0
+
+
+def test_probe_failure_opens_the_circuit_again():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    # A failed probe is not a new trip
+    assert breaker.snapshot()["trips"] == 1
+
+
+def test_zero_threshold_disables_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    breaker.before_call()
+    assert breaker.state == "closed"
+
+
+def test_retry_policy_only_retries_transient_errors_of_reads():
+    policy = RetryPolicy(retries=2)
+    error = ConnectionResetError()
+    assert policy.should_retry("search_read", error, 0)
+    assert not policy.should_retry("search_read", error, 2)
+    assert not policy.should_retry("write", error, 0)
+    assert not policy.should_retry("search_read", xmlrpc.client.Fault(1, "x"), 0)
+    unavailable = xmlrpc.client.ProtocolError("url", 503, "Unavailable", {})
+    assert policy.should_retry("read", unavailable, 0)
+
+
+def test_retry_policy_retries_unsent_writes():
+    policy = RetryPolicy(retries=1)
+    assert policy.should_retry("write", ConnectionRefusedError(), 0)